@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Quote Maker - 命令行批量导出
+在无显示环境（offscreen平台）下，将Excel中的文本渲染到背景图片上
+
+示例：
+    python batch_export.py data/texts/quotes.xlsx data/images/background.jpg \\
+        --font-family "PingFang SC" --font-size 32 --color "#333333"
+
+    # 每条文本自动选择字号
+    python batch_export.py data/texts/quotes.xlsx data/images/background.jpg --auto-fit --max-font-size 96
+
+    # 导出前检查排版，超出边距或画面的文本保存到CSV（不导出）
+    python batch_export.py data/texts/quotes.xlsx data/images/background.jpg --check-layout overflow.csv
+
+    # 导出为 1080 像素宽（高度按背景比例），最多使用 2G 内存
+    python batch_export.py data/texts/quotes.xlsx data/images/background.jpg --output-width 1080 --memory-budget 2G
+
+    # 继续中断的导出
+    python batch_export.py --resume outputs/export_20240101_120000
+
+    # 检查字体缺少的字符（不导出）
+    python batch_export.py data/texts/quotes.xlsx data/images/background.jpg \\
+        --font-family "PingFang SC" --fallback-family "Songti SC" --check-coverage
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+from core.memory_budget import BUDGET_ENV, parse_size
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Quote Maker 命令行批量导出")
+    parser.add_argument("excel", nargs="?", help="Excel文件路径（读取第一列）")
+    parser.add_argument("background", nargs="?", help="背景图片路径")
+    parser.add_argument("-o", "--output-dir",
+                        help="输出根目录，每次导出会创建 export_<时间戳> 子文件夹（默认为 outputs）；"
+                             "增量导出时为输出目录本身（默认为 outputs/incremental）")
+    parser.add_argument("--fonts-dir", default=os.path.join(os.getcwd(), "fonts"),
+                        help="自定义字体目录")
+    parser.add_argument("--font-family", default="Arial", help="字体")
+    parser.add_argument("--fallback-family", default="",
+                        help="备用字体：文本中有主字体缺少的字符时，整条文本改用该字体")
+    parser.add_argument("--font-size", type=int, default=24, help="字体大小")
+    parser.add_argument("--auto-fit", action="store_true",
+                        help="自动字号：每条文本使用能放入边距内的最大字号（忽略 --font-size）")
+    parser.add_argument("--min-font-size", type=int, default=12, help="自动字号的最小字号")
+    parser.add_argument("--max-font-size", type=int, default=72, help="自动字号的最大字号")
+    parser.add_argument("--font-scale", type=float, default=1.0,
+                        help="字体缩放比例（界面导出时等于 背景高度/预览高度）")
+    parser.add_argument("--color", default="#000000", help="文字颜色")
+    parser.add_argument("--line-spacing", type=float, default=1.5, help="行间距")
+    parser.add_argument("--margin", type=int, nargs=4, default=[50, 50, 50, 50],
+                        metavar=("TOP", "BOTTOM", "LEFT", "RIGHT"), help="边距")
+    parser.add_argument("--no-center-h", action="store_true", help="不水平居中")
+    parser.add_argument("--no-center-v", action="store_true", help="不垂直居中")
+    parser.add_argument("-j", "--workers", type=int, default=1,
+                        help="并行导出（及排版检查）的进程数，0 表示使用全部CPU核心")
+    parser.add_argument("--format", type=str.upper, default="JPEG", choices=["JPEG", "PNG", "WEBP"],
+                        help="导出格式")
+    parser.add_argument("--quality", type=int, default=85,
+                        help="压缩质量 0-100（PNG 为无损格式，质量只影响压缩级别）")
+    parser.add_argument("--optimize", action="store_true",
+                        help="JPEG 生成优化的编码表，PNG 使用最高压缩级别")
+    parser.add_argument("--output-width", type=int, default=0,
+                        help="输出宽度（像素），只指定宽度时按背景比例计算高度")
+    parser.add_argument("--output-height", type=int, default=0,
+                        help="输出高度（像素），只指定高度时按背景比例计算宽度")
+    parser.add_argument("--dpi", type=int, default=0,
+                        help="输出分辨率：背景每像素按1磅（72 DPI）换算输出尺寸，并写入图片文件；"
+                             "默认输出为背景的2倍（144 DPI）")
+    parser.add_argument("--memory-budget", metavar="SIZE",
+                        help=f"导出占用的图像内存上限，例如 512M、4G（默认读取环境变量 {BUDGET_ENV}，否则为物理内存的四分之一）")
+    parser.add_argument("--incremental", action="store_true",
+                        help="增量导出：直接写入输出目录（不创建时间戳子文件夹），只重新渲染有变化的图片")
+    parser.add_argument("--check-coverage", action="store_true",
+                        help="只检查文本中字体缺少的字符并输出报告，不导出图片")
+    parser.add_argument("--check-layout", nargs="?", const="", metavar="CSV",
+                        help="只排版不导出，列出超出边距或画面的文本；指定CSV路径时同时保存检查结果")
+    parser.add_argument("--resume", metavar="DIR",
+                        help="继续中断的导出：使用该目录中保存的文本和样式，只导出尚未完成的图片")
+    parser.add_argument("-v", "--verbose", action="store_true", help="输出调试日志")
+    args = parser.parse_args(argv)
+    if not args.resume and not (args.excel and args.background):
+        parser.error("需要指定 Excel 文件和背景图片，或使用 --resume 继续导出")
+    if args.output_dir is None:
+        # 增量导出会删除目录中的旧图片，默认使用单独的子目录，与界面相同
+        args.output_dir = os.path.join(os.getcwd(), "outputs")
+        if args.incremental:
+            args.output_dir = os.path.join(args.output_dir, "incremental")
+    if args.memory_budget:
+        try:
+            args.memory_budget = parse_size(args.memory_budget)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def build_style_config(args) -> dict:
+    """根据命令行参数构建样式配置"""
+    margin_top, margin_bottom, margin_left, margin_right = args.margin
+    return {
+        'font_family': args.font_family,
+        'fallback_family': args.fallback_family,
+        'font_size': args.font_size,
+        'text_color': args.color,
+        'line_spacing': args.line_spacing,
+        'margin_top': margin_top,
+        'margin_bottom': margin_bottom,
+        'margin_left': margin_left,
+        'margin_right': margin_right,
+        'center_horizontally': not args.no_center_h,
+        'center_vertically': not args.no_center_v,
+        'auto_fit': args.auto_fit,
+        'min_font_size': args.min_font_size,
+        'max_font_size': args.max_font_size
+    }
+
+
+def main(argv=None):
+    """命令行入口"""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    # 无显示环境下使用offscreen平台，必须在创建QGuiApplication之前设置
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtGui import QGuiApplication
+    from core.data_manager import read_excel_texts
+    from core.export_manifest import export_incremental, load_export_job
+    from core.font_manager import get_font_manager
+    from core.image_encoder import EncodeOptions
+    from core.image_processor import create_export_dir
+    from core.layout_check import background_size, check_layout
+    from core.memory_budget import set_memory_budget
+    from core.parallel_export import default_worker_count
+
+    try:
+        app = QGuiApplication(sys.argv[:1])
+
+        if args.memory_budget:
+            set_memory_budget(args.memory_budget)
+
+        workers = args.workers or default_worker_count()
+
+        if args.resume:
+            # 使用导出目录中保存的文本和设置
+            job, texts = load_export_job(args.resume)
+            export_dir = args.resume
+            background_path, style_config = job.background_path, job.style_config
+            font_scale, fonts_dir, source = job.font_scale, job.fonts_dir, job.source
+            encode_options = EncodeOptions.from_dict(job.encode_options)
+            logging.info(f"继续导出：{export_dir}，共 {len(texts)} 条")
+        else:
+            texts = read_excel_texts(args.excel)
+            logging.info(f"已读取 {len(texts)} 条文本")
+
+            # 增量导出直接写入输出目录，否则每次创建新的时间戳子文件夹（检查之后再创建）
+            export_dir = args.output_dir if args.incremental else None
+            background_path, style_config = args.background, build_style_config(args)
+            font_scale, fonts_dir, source = args.font_scale, args.fonts_dir, os.path.abspath(args.excel)
+            encode_options = EncodeOptions(args.format, args.quality, args.optimize,
+                                           width=args.output_width, height=args.output_height, dpi=args.dpi)
+
+        font_manager = get_font_manager(fonts_dir)
+        fallback_family = style_config.get('fallback_family')
+        if args.check_coverage:
+            report = font_manager.coverage_report(texts, style_config['font_family'], fallback_family)
+            print(report.summary(limit=len(report.missing)))
+            return 1 if report.unresolved or (report.missing and not fallback_family) else 0
+
+        if fonts_dir:
+            font_manager.register_family(style_config['font_family'])
+            if fallback_family:
+                font_manager.register_family(fallback_family)
+        if args.check_layout is not None:
+            report = check_layout(texts, background_size(background_path), style_config,
+                                  font_scale=font_scale, fonts_dir=fonts_dir, workers=workers)
+            print(report.summary(limit=20))
+            if args.check_layout:
+                report.write_csv(args.check_layout)
+                logging.info(f"排版检查结果已保存到：{args.check_layout}")
+            return 1 if report.issues else 0
+
+        if export_dir is None:
+            export_dir = create_export_dir(args.output_dir)
+
+        plan = export_incremental(
+            texts, export_dir, background_path, style_config,
+            font_scale=font_scale, fonts_dir=fonts_dir, workers=workers, source=source,
+            encode_options=encode_options
+        )
+
+        logging.info(
+            f"已导出 {plan.exported}/{len(plan.render)} 张图片，未变化 {plan.unchanged} 张，"
+            f"复用 {plan.reused} 张，删除 {plan.pruned} 张，输出目录：{export_dir}"
+        )
+        if plan.exported:
+            logging.info(f"各阶段耗时（详见 timings.json）：\n{plan.timer.details()}")
+        return 0 if plan.exported == len(plan.render) else 1
+
+    except Exception as e:
+        logging.error(f"批量导出失败: {str(e)}", exc_info=args.verbose)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
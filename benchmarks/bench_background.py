@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+背景生成性能测试
+同一尺寸和形状下每个颜色变体的生成时间（渐变位置和噪点已缓存）
+"""
+
+import random
+
+import pytest
+
+from core.background_generator import GradientSpec, clear_cache, generate_background
+from workloads import BACKGROUND_SIZES
+
+VARIANTS = {
+    'vertical': dict(kind='linear'),
+    'diagonal': dict(kind='linear', angle=45.0),
+    'radial': dict(kind='radial', center=(0.4, 0.3)),
+    'radial_noise': dict(kind='radial', noise=0.03, noise_scale=4),
+}
+
+
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def bench_background_variants(bench, background_name, variant):
+    width, height = BACKGROUND_SIZES[background_name]
+    rng = random.Random(0)
+    params = VARIANTS[variant]
+
+    def spec():
+        return GradientSpec.from_colors([tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(3)], **params)
+
+    # 第一张包括计算渐变位置和噪点，单独记录
+    bench(lambda: generate_background(spec(), width, height), rounds=1, setup=clear_cache, label="cold")
+    bench(lambda: generate_background(spec(), width, height), rounds=10, warmup=1, label="variant")
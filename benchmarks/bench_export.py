@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+导出性能测试
+单进程（渲染 + 后台编码写入）和多进程导出的张/秒，附带各阶段的平均耗时；
+另测不同输出尺寸（缩小时超采样）的单进程导出
+"""
+
+import pytest
+
+from PySide6.QtGui import QImageReader
+
+from core.image_encoder import EncodeOptions
+from core.image_processor import DEFAULT_STYLE_CONFIG, ImageProcessor
+from core.parallel_export import default_worker_count, export_parallel
+from core.stage_timer import StageTimer
+from workloads import make_texts
+
+
+def stage_means(timer: StageTimer) -> dict:
+    """各阶段的平均耗时（毫秒）"""
+    return {name: stats['mean_ms'] for name, stats in timer.to_dict().items()}
+
+
+def bench_export_serial(bench, bench_scale, qt_app, background, export_background, export_format, tmp_path):
+    count = bench_scale['export_count']
+    texts = make_texts(count)
+    timer = StageTimer()
+    processor = ImageProcessor(DEFAULT_STYLE_CONFIG, timer=timer)
+    processor.load_background(background(export_background))
+    # 背景缩放在渲染计划中只做一次，不计入导出速度
+    processor.prepare()
+    options = EncodeOptions(export_format)
+
+    def export():
+        exported = processor.export(texts, str(tmp_path), encode_options=options)
+        assert exported == count
+
+    result = bench(export, rounds=1, items=count)
+    result['extra'] = {'stages_ms': stage_means(timer)}
+
+
+# 输出宽度相对背景宽度的倍数：缩小一半时超采样，原尺寸和默认的2倍不超采样
+OUTPUT_SCALES = {'half': 0.5, 'native': 1.0, 'double': 2.0}
+
+
+@pytest.mark.parametrize("output", sorted(OUTPUT_SCALES))
+def bench_export_output_size(bench, bench_scale, qt_app, background, export_background, tmp_path, output):
+    count = bench_scale['export_count']
+    texts = make_texts(count)
+    timer = StageTimer()
+    path = background(export_background)
+    width = round(QImageReader(path).size().width() * OUTPUT_SCALES[output])
+    options = EncodeOptions(width=width)
+    processor = ImageProcessor(DEFAULT_STYLE_CONFIG, timer=timer)
+    processor.load_background(path)
+    plan = processor.prepare(options.output_size(processor.background.width(), processor.background.height()))
+
+    def export():
+        exported = processor.export(texts, str(tmp_path), encode_options=options)
+        assert exported == count
+
+    result = bench(export, rounds=1, items=count)
+    result['extra'] = {'supersample': plan.supersample,
+                       'stages_ms': stage_means(timer)}
+
+
+def bench_export_parallel(bench, bench_scale, qt_app, background, export_background, tmp_path):
+    workers = default_worker_count()
+    if workers < 2:
+        pytest.skip("只有一个CPU核心，多进程导出与单进程相同")
+
+    count = bench_scale['export_count'] * 2
+    texts = make_texts(count)
+    timer = StageTimer()
+
+    def export():
+        exported = export_parallel(texts, str(tmp_path), background(export_background),
+                                   DEFAULT_STYLE_CONFIG, workers=workers, timer=timer)
+        assert exported == count
+
+    result = bench(export, rounds=1, items=count)
+    result['extra'] = {'workers': workers, 'stages_ms': stage_means(timer)}
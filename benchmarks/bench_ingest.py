@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel读取性能测试
+DataManager.load_excel（同步和流式）以及 TextProcessor.load_excel 的行/秒
+"""
+
+import os
+import time
+
+from PySide6.QtCore import QEventLoop, QObject, QTimer, Signal
+
+from core.data_manager import DataManager
+from core.text_processor import TextProcessor
+
+# 流式加载的最长等待时间（秒）
+ASYNC_TIMEOUT = 600
+
+
+class BenchMonitor(QObject):
+    """DataManager 需要的消息信号（性能测试中不显示）"""
+
+    error_occurred = Signal(str)
+    warning_occurred = Signal(str)
+    info_occurred = Signal(str)
+
+
+def rounds_for(rows: int) -> int:
+    """行数越多轮数越少，100万行只测一轮"""
+    return 3 if rows <= 100_000 else 1
+
+
+def make_data_manager(workbook_path: str) -> DataManager:
+    """创建 DataManager，文本目录指向缓存目录，避免把测试文件复制到项目的 data 目录"""
+    manager = DataManager(BenchMonitor())
+    manager.texts_dir = os.path.dirname(workbook_path)
+    return manager
+
+
+def bench_text_processor_load_excel(bench, workbook, rows):
+    path = workbook(rows)
+    processor = TextProcessor()
+    result = bench(lambda: processor.load_excel(path), rounds=rounds_for(rows), items=rows)
+    assert processor.total_count > 0
+    assert result['throughput'] > 0
+
+
+def bench_data_manager_load_excel(bench, qt_app, workbook, rows):
+    path = workbook(rows)
+    manager = make_data_manager(path)
+    bench(lambda: manager.load_excel(path), rounds=rounds_for(rows), items=rows)
+    assert len(manager.get_texts()) > 0
+
+
+def bench_data_manager_load_excel_async(bench, qt_app, workbook, rows):
+    """流式加载：记录第一块文本可用的延迟和全部加载完成的时间"""
+    path = workbook(rows)
+    first_chunk, total = [], []
+
+    for _ in range(rounds_for(rows)):
+        manager = make_data_manager(path)
+        loop = QEventLoop()
+        marks = {}
+        start = time.perf_counter()
+        manager.texts_changed.connect(lambda _texts: marks.setdefault('first', time.perf_counter()))
+        manager.load_finished.connect(lambda _count, _canceled: loop.quit())
+        QTimer.singleShot(ASYNC_TIMEOUT * 1000, loop.quit)
+        manager.load_excel_async(path)
+        loop.exec()
+        elapsed = time.perf_counter() - start
+
+        assert not manager.is_loading(), "流式加载超时"
+        assert len(manager.get_texts()) > 0
+        first_chunk.append(marks['first'] - start)
+        total.append(elapsed)
+
+    bench.record(first_chunk, label="first_chunk")
+    bench.record(total, items=rows, label="total")
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+排版检查性能测试
+导出前的排版检查（只排版，不绘制、不编码）每条文本的耗时，固定字号和自动字号分别测量；
+有多个CPU核心且行数足够时另测多进程检查
+"""
+
+import pytest
+from PySide6.QtCore import QSize
+
+from core.image_processor import DEFAULT_STYLE_CONFIG
+from core.layout_cache import get_layout_cache
+from core.layout_check import PARALLEL_MIN_ROWS, check_layout
+from core.parallel_export import default_worker_count
+from workloads import BACKGROUND_SIZES, make_texts
+
+# 单进程每秒至少检查的条数（10万条在20秒以内，多进程时按核心数成倍提高）
+MIN_ROWS_PER_SECOND = 5_000
+
+
+@pytest.mark.parametrize("auto_fit", [False, True], ids=["fixed", "auto_fit"])
+def bench_layout_check(bench, qt_app, rows, auto_fit):
+    texts = make_texts(rows)
+    size = QSize(*BACKGROUND_SIZES['1080p'])
+    style = dict(DEFAULT_STYLE_CONFIG, auto_fit=auto_fit)
+
+    # 每轮先清空排版缓存，测量的是未命中缓存时的耗时
+    result = bench(lambda: check_layout(texts, size, style), rounds=3 if rows <= 100_000 else 1,
+                   items=rows, setup=get_layout_cache().clear)
+    assert result['throughput'] >= MIN_ROWS_PER_SECOND
+
+
+def bench_layout_check_parallel(bench, qt_app, rows):
+    workers = default_worker_count()
+    if workers < 2:
+        pytest.skip("只有一个CPU核心，多进程检查与单进程相同")
+    if rows < PARALLEL_MIN_ROWS:
+        pytest.skip(f"少于 {PARALLEL_MIN_ROWS} 条时不使用多进程")
+
+    texts = make_texts(rows)
+    size = QSize(*BACKGROUND_SIZES['1080p'])
+    result = bench(lambda: check_layout(texts, size, DEFAULT_STYLE_CONFIG, workers=workers),
+                   rounds=1, items=rows, workers=workers)
+    assert result['throughput'] >= MIN_ROWS_PER_SECOND
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+预览渲染性能测试
+冷启动（解码、缩放背景后渲染第一帧）和热缓存（背景已缩放，只渲染文本）的延迟
+"""
+
+import pytest
+from PySide6.QtCore import QSize
+
+from core.background_cache import BackgroundCache
+from core.image_processor import DEFAULT_STYLE_CONFIG
+from core.preview_renderer import render_preview_frame
+from workloads import CJK_PHRASES, ENGLISH_PHRASES, make_texts
+
+# 预览视图的典型尺寸
+VIEW_SIZE = QSize(600, 800)
+
+TEXT_KINDS = {
+    'cjk': lambda count: [CJK_PHRASES[i % len(CJK_PHRASES)] + str(i) for i in range(count)],
+    'english': lambda count: [ENGLISH_PHRASES[i % len(ENGLISH_PHRASES)] + str(i) for i in range(count)],
+    'mixed': make_texts,
+}
+
+
+def bench_preview_cold(bench, background, background_name):
+    """切换背景后的第一帧：解码原图、缩放到视图尺寸、渲染文本"""
+    path = background(background_name)
+    text = make_texts(1)[0]
+    state = {}
+
+    def setup():
+        state['cache'] = BackgroundCache()
+
+    def first_frame():
+        scaled = state['cache'].scaled_image(path, VIEW_SIZE)
+        render_preview_frame(scaled, text, DEFAULT_STYLE_CONFIG)
+
+    bench(first_frame, rounds=3, warmup=1, setup=setup)
+
+
+@pytest.mark.parametrize("kind", sorted(TEXT_KINDS))
+def bench_preview_frame(bench, bench_scale, background, kind):
+    """翻页时的一帧：背景已缓存，每帧渲染不同的文本（排版缓存未命中）"""
+    cache = BackgroundCache()
+    scaled = cache.scaled_image(background('1080p'), VIEW_SIZE)
+    texts = iter(TEXT_KINDS[kind](bench_scale['preview_frames'] + 1))
+
+    result = bench(lambda: render_preview_frame(scaled, next(texts), DEFAULT_STYLE_CONFIG),
+                   rounds=bench_scale['preview_frames'], warmup=1)
+    assert result['median_s'] > 0
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文本读取性能测试
+比较逐行 iterrows 与按列向量化处理的速度（条/秒）
+
+用法：
+    python benchmarks/bench_text_processor.py                # 10万行和100万行
+    python benchmarks/bench_text_processor.py --rows 50000   # 指定行数
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.text_processor import TextContent, texts_from_dataframe  # noqa: E402
+
+QUOTES = [
+    ("生活不是等待暴风雨过去，而是学会在雨中翩翩起舞。", "Life is not about waiting for the storm to pass."),
+    ("把每一个平凡的日子，过成诗一般的生活。", "Make every ordinary day a poetic life."),
+    ("  心若向阳，无畏悲伤。\n第二行  ", None),
+    ("", "empty chinese"),
+    (None, None),
+]
+
+
+def make_workbook(rows: int, directory: str) -> str:
+    """生成测试用的双语Excel文件（按行数缓存）"""
+    path = os.path.join(directory, f"bench_texts_{rows}.xlsx")
+    if os.path.exists(path):
+        return path
+
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["中文", "English"])
+    for i in range(rows):
+        chinese, english = QUOTES[i % len(QUOTES)]
+        sheet.append([f"{chinese}{i}" if chinese else chinese, english])
+    workbook.save(path)
+    return path
+
+
+def legacy_iterrows(df: pd.DataFrame) -> list:
+    """原来的逐行处理方式（仅用于对比）"""
+    columns = df.columns.tolist()
+    has_english = len(columns) >= 2
+    texts = []
+    for _, row in df.iterrows():
+        chinese_text = str(row[columns[0]]).strip()
+        if not chinese_text or pd.isna(chinese_text):
+            continue
+        english_text = None
+        if has_english:
+            english_text = str(row[columns[1]]).strip()
+            if pd.isna(english_text):
+                english_text = None
+        texts.append(TextContent(chinese=chinese_text, english=english_text))
+    return texts
+
+
+def timed(func, *args):
+    """执行并返回 (结果, 耗时秒数)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def run(rows: int, directory: str, skip_legacy: bool = False):
+    """对指定行数执行一次测试并打印结果"""
+    path, build_time = timed(make_workbook, rows, directory)
+    df, read_time = timed(pd.read_excel, path)
+    print(f"\n{rows} 行（生成 {build_time:.1f}s，pd.read_excel {read_time:.2f}s，{rows / read_time:,.0f} 行/秒）")
+
+    texts, vector_time = timed(texts_from_dataframe, df)
+    print(f"  向量化处理： {vector_time:8.3f}s  {rows / vector_time:14,.0f} 行/秒  -> {len(texts)} 条")
+    print(f"  读取+处理：   {read_time + vector_time:8.3f}s  {rows / (read_time + vector_time):14,.0f} 行/秒")
+
+    if not skip_legacy:
+        legacy, legacy_time = timed(legacy_iterrows, df)
+        print(f"  iterrows：     {legacy_time:8.3f}s  {rows / legacy_time:14,.0f} 行/秒  -> {len(legacy)} 条"
+              f"（加速 {legacy_time / vector_time:.1f} 倍）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="文本读取性能测试")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000], help="测试的行数")
+    parser.add_argument("--dir", default=os.path.join(tempfile.gettempdir(), "quote_maker_bench"),
+                        help="测试文件缓存目录")
+    parser.add_argument("--skip-legacy", action="store_true", help="不运行 iterrows 对比")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, exist_ok=True)
+    for rows in args.rows:
+        run(rows, args.dir, args.skip_legacy)
+
+
+if __name__ == "__main__":
+    main()
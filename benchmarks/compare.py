@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+对比两次性能测试的结果
+按测试名称匹配，中位数耗时（有条数的项按每条耗时）变慢超过阈值的项视为性能退化
+
+用法：
+    python benchmarks/compare.py base.json new.json               # 阈值默认10%
+    python benchmarks/compare.py base.json new.json --threshold 0.2
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List, Tuple
+
+
+def load_results(path: str) -> Tuple[Dict, Dict[str, Dict]]:
+    """
+    读取结果文件
+
+    Returns:
+        Tuple[Dict, Dict[str, Dict]]: (文件信息, 测试名称 → 结果)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data, {result['name']: result for result in data['results']}
+
+
+def cost(result: Dict) -> float:
+    """比较用的耗时（毫秒）：有条数时为每条的中位数耗时，与每轮条数无关"""
+    return result['median_s'] * 1000 / result.get('items', 1)
+
+
+def compare(base: Dict[str, Dict], new: Dict[str, Dict], threshold: float) -> Tuple[List[str], List[str]]:
+    """
+    对比两组结果
+
+    Args:
+        base: 基准结果
+        new: 新结果
+        threshold: 变慢的比例阈值（0.1 表示10%）
+
+    Returns:
+        Tuple[List[str], List[str]]: (输出行, 退化的测试名称)
+    """
+    lines = [f"{'测试（有条数的项为每条耗时）':<60} {'基准':>12} {'当前':>12} {'变化':>8}"]
+    regressions = []
+    for name in sorted(set(base) | set(new)):
+        if name not in new:
+            lines.append(f"{name:<60} {cost(base[name]):10.2f}ms {'（缺失）':>12}")
+            continue
+        if name not in base:
+            lines.append(f"{name:<60} {'（新增）':>12} {cost(new[name]):10.2f}ms")
+            continue
+
+        before = cost(base[name])
+        after = cost(new[name])
+        change = (after - before) / before if before > 0 else 0.0
+        mark = ""
+        if change > threshold:
+            mark = "  退化"
+            regressions.append(name)
+        elif change < -threshold:
+            mark = "  提升"
+        lines.append(f"{name:<60} {before:10.2f}ms {after:10.2f}ms {change:+8.1%}{mark}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="对比两次性能测试的结果")
+    parser.add_argument("base", help="基准结果JSON")
+    parser.add_argument("new", help="当前结果JSON")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定为退化的变慢比例（默认0.1）")
+    args = parser.parse_args(argv)
+
+    base_info, base = load_results(args.base)
+    new_info, new = load_results(args.new)
+
+    for label, info in (("基准", base_info), ("当前", new_info)):
+        revision = info.get('revision', {})
+        dirty = "（有未提交的修改）" if revision.get('dirty') else ""
+        print(f"{label}：{revision.get('commit') or '未知提交'}{dirty}，规模 {info.get('scale')}，{info.get('created')}")
+    if base_info.get('environment') != new_info.get('environment'):
+        print("注意：两次测试的运行环境不同，结果可能不可比")
+    if base_info.get('scale') != new_info.get('scale'):
+        print("注意：两次测试的规模不同，只对比两边都有的测试项")
+
+    lines, regressions = compare(base, new, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} 项变慢超过 {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+性能测试公共设施
+命令行选项、测试规模、合成数据的夹具、计时记录以及结果JSON的写入
+
+用法（在项目根目录）：
+    python -m pytest benchmarks                          # 标准规模
+    python -m pytest benchmarks --bench-scale quick      # 快速检查
+    python -m pytest benchmarks --bench-scale full       # 包括100万行和6000px导出
+    python -m pytest benchmarks --bench-json base.json   # 指定结果文件
+    python benchmarks/compare.py base.json new.json      # 对比两次结果
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import pytest
+
+# 必须在导入Qt之前设置，无显示环境下也能运行
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from workloads import make_background, make_workbook  # noqa: E402
+
+# 测试规模：Excel行数、预览背景尺寸、导出背景尺寸、导出格式、导出张数、预览帧数
+# （PNG 在高压缩级别下编码很慢，只在完整规模中测试）
+SCALES = {
+    'quick': {
+        'rows': [1_000],
+        'backgrounds': ['1080p'],
+        'export_backgrounds': ['1080p'],
+        'export_formats': ['JPEG'],
+        'export_count': 10,
+        'preview_frames': 20,
+    },
+    'standard': {
+        'rows': [1_000, 100_000],
+        'backgrounds': ['1080p', '4k', '6000px'],
+        'export_backgrounds': ['1080p', '4k'],
+        'export_formats': ['JPEG'],
+        'export_count': 30,
+        'preview_frames': 50,
+    },
+    'full': {
+        'rows': [1_000, 100_000, 1_000_000],
+        'backgrounds': ['1080p', '4k', '6000px'],
+        'export_backgrounds': ['1080p', '4k', '6000px'],
+        'export_formats': ['JPEG', 'PNG'],
+        'export_count': 100,
+        'preview_frames': 100,
+    },
+}
+
+RESULTS_VERSION = 1
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks", "性能测试")
+    group.addoption("--bench-scale", choices=sorted(SCALES), default="standard", help="测试规模")
+    group.addoption("--bench-json", default=None,
+                    help="结果文件路径，默认为 benchmarks/results/<时间>_<提交>.json")
+    group.addoption("--bench-data-dir", default=os.path.join(tempfile.gettempdir(), "quote_maker_bench"),
+                    help="合成数据的缓存目录")
+
+
+def pytest_configure(config):
+    config._bench_results = []
+
+
+def pytest_generate_tests(metafunc):
+    """按测试规模参数化 rows、background_name、export_background 和 export_format"""
+    scale = SCALES[metafunc.config.getoption("--bench-scale")]
+    if 'rows' in metafunc.fixturenames:
+        metafunc.parametrize('rows', scale['rows'], ids=[f"{rows}rows" for rows in scale['rows']])
+    if 'background_name' in metafunc.fixturenames:
+        metafunc.parametrize('background_name', scale['backgrounds'])
+    if 'export_background' in metafunc.fixturenames:
+        metafunc.parametrize('export_background', scale['export_backgrounds'])
+    if 'export_format' in metafunc.fixturenames:
+        metafunc.parametrize('export_format', scale['export_formats'])
+
+
+def summarize(times: List[float], items: Optional[int] = None) -> Dict:
+    """
+    汇总各轮耗时
+
+    Args:
+        times: 每轮耗时（秒）
+        items: 每轮处理的条数，给出时计算吞吐量
+
+    Returns:
+        Dict: 轮数、最小值、中位数、平均值、P95、最大值（秒）及吞吐量（条/秒）
+    """
+    ordered = sorted(times)
+    median = statistics.median(ordered)
+    stats = {
+        'rounds': len(ordered),
+        'min_s': ordered[0],
+        'median_s': median,
+        'mean_s': statistics.fmean(ordered),
+        'p95_s': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'max_s': ordered[-1],
+        'stdev_s': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+    if items:
+        stats['items'] = items
+        stats['throughput'] = items / median if median > 0 else 0.0
+    return stats
+
+
+class BenchRecorder:
+    """单个测试的计时记录器（由 bench 夹具提供）"""
+
+    def __init__(self, name: str, results: List[Dict]):
+        self.name = name
+        self.results = results
+
+    def record(self, times: List[float], items: Optional[int] = None,
+               label: Optional[str] = None, **extra) -> Dict:
+        """
+        记录已测得的各轮耗时
+
+        Args:
+            times: 每轮耗时（秒）
+            items: 每轮处理的条数
+            label: 同一测试中多项结果的区分名称
+            **extra: 附加信息（例如阶段耗时），原样写入结果
+
+        Returns:
+            Dict: 汇总结果
+        """
+        result = {'name': f"{self.name}/{label}" if label else self.name}
+        result.update(summarize(times, items))
+        if extra:
+            result['extra'] = extra
+        self.results.append(result)
+        return result
+
+    def __call__(self, func: Callable, rounds: int = 3, warmup: int = 0,
+                 items: Optional[int] = None, setup: Optional[Callable] = None,
+                 label: Optional[str] = None, **extra) -> Dict:
+        """
+        多轮执行 func 并记录耗时
+
+        Args:
+            func: 被测函数（无参数）
+            rounds: 计时轮数
+            warmup: 不计时的预热轮数
+            items: 每轮处理的条数
+            setup: 每轮之前调用（不计时），例如清空缓存
+            label: 同一测试中多项结果的区分名称
+            **extra: 附加信息
+
+        Returns:
+            Dict: 汇总结果
+        """
+        times = []
+        for i in range(warmup + rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            if i >= warmup:
+                times.append(elapsed)
+        return self.record(times, items, label, **extra)
+
+
+@pytest.fixture
+def bench(request):
+    """计时记录器，结果以测试名称为键写入结果JSON"""
+    return BenchRecorder(request.node.name, request.config._bench_results)
+
+
+@pytest.fixture(scope="session")
+def bench_scale(request) -> Dict:
+    """当前测试规模的配置"""
+    return SCALES[request.config.getoption("--bench-scale")]
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """offscreen 平台的 QGuiApplication（整个测试会话共用一个）"""
+    from PySide6.QtGui import QGuiApplication
+
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+@pytest.fixture(scope="session")
+def data_dir(request) -> str:
+    """合成数据的缓存目录"""
+    directory = request.config.getoption("--bench-data-dir")
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def workbook(data_dir):
+    """按行数生成（或复用缓存的）Excel文件：workbook(rows) → 路径"""
+    return lambda rows: make_workbook(rows, data_dir)
+
+
+@pytest.fixture(scope="session")
+def background(qt_app, data_dir):
+    """按尺寸名称生成（或复用缓存的）背景图片：background(name) → 路径"""
+    return lambda name: make_background(name, data_dir)
+
+
+def _git_revision() -> Dict:
+    """当前提交和工作区是否有未提交的修改"""
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True,
+                              text=True, timeout=30).stdout.strip()
+    try:
+        return {
+            'commit': git("rev-parse", "--short", "HEAD"),
+            'dirty': bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.SubprocessError):
+        return {'commit': "", 'dirty': False}
+
+
+def _environment() -> Dict:
+    """运行环境信息（比较结果时确认机器和依赖版本相同）"""
+    env = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'qt_platform': os.environ.get("QT_QPA_PLATFORM", ""),
+    }
+    try:
+        import PySide6
+        from PySide6.QtCore import qVersion
+        env['pyside6'] = PySide6.__version__
+        env['qt'] = qVersion()
+    except ImportError:
+        pass
+    try:
+        import pandas
+        env['pandas'] = pandas.__version__
+    except ImportError:
+        pass
+    return env
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """写入结果JSON"""
+    config = session.config
+    results = getattr(config, '_bench_results', None)
+    if not results:
+        return
+
+    revision = _git_revision()
+    now = datetime.now()
+    path = config.getoption("--bench-json")
+    if not path:
+        name = f"{now.strftime('%Y%m%d_%H%M%S')}_{revision['commit'] or 'unknown'}.json"
+        path = os.path.join(BENCH_DIR, "results", name)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    data = {
+        'version': RESULTS_VERSION,
+        'created': now.isoformat(timespec='seconds'),
+        'scale': config.getoption("--bench-scale"),
+        'revision': revision,
+        'environment': _environment(),
+        'results': sorted(results, key=lambda result: result['name']),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    config._bench_json_path = path
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """在测试结束时打印结果表"""
+    results = getattr(config, '_bench_results', None)
+    if not results:
+        return
+    terminalreporter.section("性能测试结果")
+    for result in sorted(results, key=lambda result: result['name']):
+        line = f"{result['name']:<60} 中位数 {result['median_s'] * 1000:10.2f}ms"
+        if 'throughput' in result:
+            line += f"  {result['throughput']:12,.1f} 条/秒"
+        terminalreporter.write_line(line)
+    path = getattr(config, '_bench_json_path', None)
+    if path:
+        terminalreporter.write_line(f"结果已保存到：{path}")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+性能测试的合成数据
+生成固定随机种子的中英文混合语录、指定行数的Excel文件和指定尺寸的背景图片，
+生成结果按参数缓存在磁盘上，重复运行时直接复用
+"""
+
+import os
+import random
+from typing import Dict, List, Tuple
+
+SEED = 20240101
+
+# 背景图片尺寸：名称 → (宽, 高)
+BACKGROUND_SIZES: Dict[str, Tuple[int, int]] = {
+    '1080p': (1080, 1920),
+    '4k': (2160, 3840),
+    '6000px': (4500, 6000),
+}
+
+CJK_PHRASES = [
+    "生活不是等待暴风雨过去，而是学会在雨中翩翩起舞。",
+    "把每一个平凡的日子，过成诗一般的生活。",
+    "愿你出走半生，归来仍是少年。",
+    "不要等待机会，而要创造机会。",
+    "心之所向，素履以往。生如逆旅，一苇以航。",
+    "山高自有客行路，水深自有渡船人。",
+    "星光不问赶路人，时光不负有心人。",
+    "做一个温暖的人，浅浅笑，轻轻爱。",
+]
+
+ENGLISH_PHRASES = [
+    "Life is not about waiting for the storm to pass, but learning to dance in the rain.",
+    "Make every ordinary day a poetic life.",
+    "May you travel half your life and return still young at heart.",
+    "Don't wait for opportunity, create it.",
+    "Follow your heart, step forward.",
+    "Stars never ask who is on the road; time never fails those who try.",
+]
+
+
+def make_texts(count: int, seed: int = SEED) -> List[str]:
+    """
+    生成中英文混合的语录
+
+    约一半为纯中文，其余为纯英文、中英混排或多段文本，长度为一到三句
+
+    Args:
+        count: 条数
+        seed: 随机种子
+
+    Returns:
+        List[str]: 文本列表
+    """
+    rng = random.Random(seed)
+    texts = []
+    for i in range(count):
+        kind = rng.random()
+        sentences = rng.randint(1, 3)
+        if kind < 0.5:
+            text = "".join(rng.choice(CJK_PHRASES) for _ in range(sentences))
+        elif kind < 0.7:
+            text = " ".join(rng.choice(ENGLISH_PHRASES) for _ in range(sentences))
+        elif kind < 0.9:
+            text = f"{rng.choice(CJK_PHRASES)} {rng.choice(ENGLISH_PHRASES)}"
+        else:
+            text = "\n".join(rng.choice(CJK_PHRASES + ENGLISH_PHRASES) for _ in range(sentences + 1))
+        texts.append(f"{text}{i}")
+    return texts
+
+
+def make_workbook(rows: int, directory: str) -> str:
+    """
+    生成双语Excel文件（第一列中文或混排文本，第二列英文，约2%为空行）
+
+    Args:
+        rows: 行数
+        directory: 缓存目录
+
+    Returns:
+        str: 文件路径
+    """
+    path = os.path.join(directory, f"workload_{rows}.xlsx")
+    if os.path.exists(path):
+        return path
+
+    from openpyxl import Workbook
+
+    rng = random.Random(SEED + rows)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(["中文", "English"])
+    # 文本按块生成后循环使用，避免为一百万行逐条随机生成
+    texts = make_texts(min(rows, 10_000))
+    for i in range(rows):
+        if rng.random() < 0.02:
+            sheet.append([None, None])
+        else:
+            sheet.append([texts[i % len(texts)], rng.choice(ENGLISH_PHRASES)])
+
+    # 先写临时文件，生成中途被中断不会留下不完整的缓存
+    temp_path = path + ".part"
+    workbook.save(temp_path)
+    os.replace(temp_path, path)
+    return path
+
+
+def make_background(name: str, directory: str) -> str:
+    """
+    生成背景图片（渐变加随机色块，使JPEG解码的开销接近真实照片；需要已创建QGuiApplication）
+
+    Args:
+        name: BACKGROUND_SIZES 中的尺寸名称
+        directory: 缓存目录
+
+    Returns:
+        str: 文件路径
+    """
+    path = os.path.join(directory, f"background_{name}.jpg")
+    if os.path.exists(path):
+        return path
+
+    from PySide6.QtCore import QPointF
+    from PySide6.QtGui import QColor, QImage, QLinearGradient, QPainter
+
+    width, height = BACKGROUND_SIZES[name]
+    rng = random.Random(SEED + width)
+    image = QImage(width, height, QImage.Format_RGB32)
+
+    painter = QPainter(image)
+    try:
+        gradient = QLinearGradient(QPointF(0, 0), QPointF(0, height))
+        gradient.setColorAt(0, QColor(135, 206, 235))
+        gradient.setColorAt(1, QColor(70, 130, 180))
+        painter.fillRect(image.rect(), gradient)
+        painter.setPen(QColor(0, 0, 0, 0))
+        for _ in range(400):
+            painter.setBrush(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256), 60))
+            radius = rng.uniform(0.01, 0.1) * width
+            painter.drawEllipse(QPointF(rng.uniform(0, width), rng.uniform(0, height)), radius, radius)
+    finally:
+        painter.end()
+
+    temp_path = path + ".part"
+    if not image.save(temp_path, "JPEG", 90):
+        raise RuntimeError(f"无法保存背景图片：{path}")
+    os.replace(temp_path, path)
+    return path
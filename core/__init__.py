@@ -1,10 +1,24 @@
 """
 核心功能模块
 包含文本处理、图片处理、字体管理等核心功能
+
+子模块在第一次访问时才导入（TextProcessor 依赖的 pandas 导入较慢，不应拖慢程序启动）
 """
 
-from .text_processor import TextProcessor
-from .image_processor import ImageProcessor
-from .font_manager import FontManager
+import importlib
+
+_EXPORTS = {
+    'TextProcessor': '.text_processor',
+    'ImageProcessor': '.image_processor',
+    'FontManager': '.font_manager',
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ['TextProcessor', 'ImageProcessor', 'FontManager'] 
\ No newline at end of file
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+背景图片缓存模块
+缓存解码后的背景图片和按显示尺寸缩放后的版本，避免重复解码和缩放
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage, QPixmap
+
+from .stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundCache:
+    """
+    背景图片缓存（LRU淘汰）
+
+    原图以 (路径, 修改时间, 文件大小) 为键，缩放结果再加上目标尺寸为键，
+    文件被修改后自动失效
+    """
+
+    def __init__(self, max_images: int = 4, max_scaled: int = 16,
+                 timer: Optional[StageTimer] = None):
+        """
+        初始化背景图片缓存
+
+        Args:
+            max_images: 最多缓存的原图数量
+            max_scaled: 最多缓存的缩放结果数量
+            timer: 记录解码和缩放耗时的阶段计时器（只记录未命中缓存的情况）
+        """
+        self.max_images = max_images
+        self.max_scaled = max_scaled
+        self.timer = timer
+        self._images: "OrderedDict[tuple, QImage]" = OrderedDict()
+        self._scaled: "OrderedDict[tuple, QImage]" = OrderedDict()
+        self._pixmaps: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_key(image_path: str) -> Optional[tuple]:
+        """获取文件的缓存键，文件不存在时返回None"""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        return (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _put(cache: OrderedDict, key: tuple, value, limit: int):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def image(self, image_path: str) -> Optional[QImage]:
+        """
+        获取解码后的原图（可在任意线程调用）
+
+        Args:
+            image_path: 图片路径
+
+        Returns:
+            Optional[QImage]: 原图，无法加载时返回None
+        """
+        file_key = self._file_key(image_path)
+        if file_key is None:
+            return None
+
+        with self._lock:
+            image = self._images.get(file_key)
+            if image is not None:
+                self._images.move_to_end(file_key)
+                return image
+
+        start = time.perf_counter()
+        image = QImage(image_path)
+        if image.isNull():
+            logger.error(f"无法加载图片：{image_path}")
+            return None
+        if self.timer:
+            self.timer.add('decode', time.perf_counter() - start)
+
+        logger.debug(f"解码背景图片：{image_path} ({image.width()}x{image.height()})")
+        with self._lock:
+            self._put(self._images, file_key, image, self.max_images)
+        return image
+
+    def scaled_image(self, image_path: str, size: QSize) -> Optional[QImage]:
+        """
+        获取按目标尺寸等比缩放后的图片（可在任意线程调用）
+
+        Args:
+            image_path: 图片路径
+            size: 目标尺寸
+
+        Returns:
+            Optional[QImage]: 缩放后的图片，无法加载时返回None
+        """
+        file_key = self._file_key(image_path)
+        if file_key is None or size.isEmpty():
+            return None
+
+        key = file_key + (size.width(), size.height())
+        with self._lock:
+            scaled = self._scaled.get(key)
+            if scaled is not None:
+                self._scaled.move_to_end(key)
+                return scaled
+
+        image = self.image(image_path)
+        if image is None:
+            return None
+
+        start = time.perf_counter()
+        scaled = image.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if self.timer:
+            self.timer.add('scale', time.perf_counter() - start)
+        with self._lock:
+            self._put(self._scaled, key, scaled, self.max_scaled)
+        return scaled
+
+    def scaled_pixmap(self, image_path: str, size: QSize) -> Optional[QPixmap]:
+        """
+        获取按目标尺寸等比缩放后的图片（只能在GUI线程调用）
+
+        Args:
+            image_path: 图片路径
+            size: 目标尺寸
+
+        Returns:
+            Optional[QPixmap]: 缩放后的图片，无法加载时返回None
+        """
+        file_key = self._file_key(image_path)
+        if file_key is None or size.isEmpty():
+            return None
+
+        key = file_key + (size.width(), size.height())
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        scaled = self.scaled_image(image_path, size)
+        if scaled is None:
+            return None
+
+        pixmap = QPixmap.fromImage(scaled)
+        self._put(self._pixmaps, key, pixmap, self.max_scaled)
+        return pixmap
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._images.clear()
+            self._scaled.clear()
+        self._pixmaps.clear()
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+背景生成模块
+用NumPy一次性计算整幅渐变（线性、径向、多色）和噪点纹理，直接写入QImage，
+可以交给渲染引擎使用而不必先保存为文件
+
+同一尺寸和几何形状的渐变只计算一次每个像素在渐变上的位置，
+之后每个颜色变体只是一次查表，批量生成大量配色时每张只需几毫秒
+"""
+
+import logging
+import math
+import random
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+logger = logging.getLogger(__name__)
+
+Color = Tuple[int, int, int]
+ColorLike = Union[str, Sequence[int]]
+
+# 渐变颜色表的长度（渐变上的位置被量化为这么多级，远多于8位颜色能区分的级数）
+LUT_SIZE = 1024
+
+# 默认的渐变颜色（与原来生成的背景图片相同）
+DEFAULT_STOPS = ((0.0, (135, 206, 235)), (1.0, (70, 130, 180)))
+
+
+def parse_color(value: ColorLike) -> Color:
+    """
+    解析颜色
+
+    Args:
+        value: "#rrggbb" 字符串或 (r, g, b) 序列
+
+    Returns:
+        Color: (r, g, b)
+
+    Raises:
+        ValueError: 颜色格式无效
+    """
+    if isinstance(value, str):
+        text = value.strip().lstrip('#')
+        if len(text) != 6:
+            raise ValueError(f"无效的颜色：{value}")
+        try:
+            return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+        except ValueError:
+            raise ValueError(f"无效的颜色：{value}") from None
+
+    color = tuple(int(c) for c in value)
+    if len(color) != 3 or not all(0 <= c <= 255 for c in color):
+        raise ValueError(f"无效的颜色：{value}")
+    return color
+
+
+@dataclass(frozen=True)
+class GradientSpec:
+    """
+    渐变背景的参数
+
+    kind 为 'linear' 时按 angle 方向渐变（0度从上到下，90度从左到右）；
+    为 'radial' 时从 center（相对坐标）向外渐变，radius 为 1 时恰好到达最远的角。
+    noise 为噪点强度（标准差占255的比例），noise_scale 为噪点颗粒的像素大小，
+    大于1时噪点经过平滑，形成纸张一类的纹理
+    """
+
+    kind: str = 'linear'
+    stops: Tuple[Tuple[float, Color], ...] = DEFAULT_STOPS
+    angle: float = 0.0
+    center: Tuple[float, float] = (0.5, 0.5)
+    radius: float = 1.0
+    noise: float = 0.0
+    noise_scale: int = 1
+    seed: int = 0
+
+    def __post_init__(self):
+        if self.kind not in ('linear', 'radial'):
+            raise ValueError(f"不支持的渐变类型：{self.kind}")
+        if len(self.stops) < 1:
+            raise ValueError("渐变至少需要一个颜色")
+        stops = tuple(sorted((float(pos), parse_color(color)) for pos, color in self.stops))
+        if not all(0.0 <= pos <= 1.0 for pos, _ in stops):
+            raise ValueError("渐变颜色的位置必须在0到1之间")
+        if self.radius <= 0:
+            raise ValueError(f"渐变半径必须大于0：{self.radius}")
+        if self.noise < 0 or self.noise_scale < 1:
+            raise ValueError("噪点强度不能为负数，噪点大小至少为1")
+        # 冻结的数据类只能通过 object.__setattr__ 规范化字段
+        object.__setattr__(self, 'stops', stops)
+        object.__setattr__(self, 'center', tuple(float(c) for c in self.center))
+
+    @classmethod
+    def from_colors(cls, colors: Sequence[ColorLike], **kwargs) -> 'GradientSpec':
+        """
+        用等间距的颜色创建渐变
+
+        Args:
+            colors: 颜色列表（至少一个）
+            **kwargs: 其他参数（kind、angle、noise等）
+
+        Returns:
+            GradientSpec: 渐变参数
+        """
+        if not colors:
+            raise ValueError("渐变至少需要一个颜色")
+        count = len(colors)
+        stops = tuple((i / (count - 1) if count > 1 else 0.0, parse_color(c)) for i, c in enumerate(colors))
+        return cls(stops=stops, **kwargs)
+
+    def to_dict(self) -> Dict:
+        """转换为可序列化的字典（颜色为 "#rrggbb"）"""
+        return {
+            'kind': self.kind,
+            'stops': [[pos, '#%02x%02x%02x' % color] for pos, color in self.stops],
+            'angle': self.angle,
+            'center': list(self.center),
+            'radius': self.radius,
+            'noise': self.noise,
+            'noise_scale': self.noise_scale,
+            'seed': self.seed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'GradientSpec':
+        """从字典创建，缺省项使用默认值"""
+        if not data:
+            return cls()
+        data = dict(data)
+        if 'stops' in data:
+            data['stops'] = tuple((pos, color) for pos, color in data['stops'])
+        if 'center' in data:
+            data['center'] = tuple(data['center'])
+        return cls(**data)
+
+
+def random_colors(spec: GradientSpec, rng: Optional[random.Random] = None) -> GradientSpec:
+    """
+    只随机更换颜色，渐变形状、噪点和种子保持不变
+
+    批量生成配色变体时应使用这种方式：每个变体都命中渐变位置和噪点缓存，只需查表
+
+    Args:
+        spec: 提供形状、噪点和颜色位置的渐变参数
+        rng: 随机数生成器，为None时使用全局随机数
+
+    Returns:
+        GradientSpec: 渐变参数
+    """
+    rng = rng or random.Random()
+    return replace(spec, stops=tuple(
+        (pos, tuple(rng.randint(0, 255) for _ in range(3))) for pos, _ in spec.stops
+    ))
+
+
+def random_gradient(rng: Optional[random.Random] = None, kind: Optional[str] = None,
+                    colors: int = 2, noise: float = 0.0) -> GradientSpec:
+    """
+    生成随机配色和随机形状的渐变参数
+
+    每次的径向中心和噪点种子都不同，无法命中缓存；只需要不同配色时使用 random_colors
+
+    Args:
+        rng: 随机数生成器，为None时使用全局随机数
+        kind: 渐变类型，为None时随机选择
+        colors: 颜色数量
+        noise: 噪点强度
+
+    Returns:
+        GradientSpec: 渐变参数
+    """
+    rng = rng or random.Random()
+    return GradientSpec.from_colors(
+        [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(colors)],
+        kind=kind or rng.choice(('linear', 'radial')),
+        angle=rng.choice((0.0, 45.0, 90.0, 135.0)),
+        center=(rng.uniform(0.2, 0.8), rng.uniform(0.2, 0.8)),
+        noise=noise,
+        seed=rng.randrange(2 ** 31)
+    )
+
+
+def gradient_lut(stops: Sequence[Tuple[float, Color]], size: int = LUT_SIZE) -> np.ndarray:
+    """
+    计算渐变颜色表
+
+    Args:
+        stops: (位置, 颜色) 列表，按位置排序
+        size: 颜色表长度
+
+    Returns:
+        np.ndarray: uint32 数组，每项为 0xffRRGGBB（QImage.Format_RGB32 的像素格式）
+    """
+    positions = np.array([pos for pos, _ in stops], dtype=np.float64)
+    colors = np.array([color for _, color in stops], dtype=np.float64)
+    t = np.linspace(0.0, 1.0, size)
+    r, g, b = (np.rint(np.interp(t, positions, colors[:, i])).astype(np.uint32) for i in range(3))
+    return np.uint32(0xFF000000) | (r << 16) | (g << 8) | b
+
+
+class _FieldCache:
+    """缓存与颜色无关的计算结果（渐变位置、噪点），LRU淘汰，按总字节数限制"""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, compute) -> np.ndarray:
+        """获取缓存的数组，没有时调用 compute() 计算（计算在锁外进行）"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+
+        value = compute()
+        value.setflags(write=False)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = value
+                self._bytes += value.nbytes
+            self._entries.move_to_end(key)
+            # 至少保留刚计算的一项
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return value
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_field_cache = _FieldCache()
+
+
+def _linear_axes(width: int, height: int, angle: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    线性渐变的颜色表索引按列和按行的分量（两者相加即为每个像素的索引）
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (每列的分量, 每行的分量)，float32
+    """
+    radians = math.radians(angle)
+    dx, dy = math.sin(radians), math.cos(radians)
+    # 像素中心在渐变方向上的投影，按四个角的投影范围归一化
+    corners = [x * dx + y * dy for x in (0, width) for y in (0, height)]
+    low, span = min(corners), (max(corners) - min(corners)) or 1.0
+    scale = (LUT_SIZE - 1) / span
+
+    xs = ((np.arange(width, dtype=np.float32) + 0.5) * dx - low) * scale
+    ys = (np.arange(height, dtype=np.float32) + 0.5) * dy * scale
+    return xs, ys
+
+
+def _to_index(field: np.ndarray) -> np.ndarray:
+    """将渐变位置限制在颜色表范围内并转换为索引"""
+    np.clip(field, 0, LUT_SIZE - 1, out=field)
+    return field.astype(np.uint16)
+
+
+def _linear_index(width: int, height: int, angle: float) -> np.ndarray:
+    """线性渐变每个像素的颜色表索引"""
+    xs, ys = _linear_axes(width, height, angle)
+    return _to_index(ys[:, None] + xs[None, :])
+
+
+def _radial_index(width: int, height: int, center: Tuple[float, float], radius: float) -> np.ndarray:
+    """径向渐变每个像素的颜色表索引"""
+    cx, cy = center[0] * width, center[1] * height
+    farthest = max(math.hypot(x - cx, y - cy) for x in (0, width) for y in (0, height)) or 1.0
+    scale = (LUT_SIZE - 1) / (farthest * radius)
+
+    xs = (np.arange(width, dtype=np.float32) + 0.5 - cx) * scale
+    ys = (np.arange(height, dtype=np.float32) + 0.5 - cy) * scale
+    return _to_index(np.hypot(ys[:, None], xs[None, :]))
+
+
+def _gradient_index(spec: GradientSpec, width: int, height: int) -> np.ndarray:
+    """获取（缓存的）渐变颜色表索引"""
+    if spec.kind == 'linear':
+        key = ('linear', width, height, spec.angle)
+        return _field_cache.get(key, lambda: _linear_index(width, height, spec.angle))
+    key = ('radial', width, height, spec.center, spec.radius)
+    return _field_cache.get(key, lambda: _radial_index(width, height, spec.center, spec.radius))
+
+
+def _upsample(cells: np.ndarray, width: int, height: int) -> np.ndarray:
+    """双线性插值放大（行、列分别插值）"""
+    def weights(size: int, cell_count: int):
+        pos = (np.arange(size, dtype=np.float32) + 0.5) * (cell_count - 1) / size
+        low = np.minimum(pos.astype(np.intp), cell_count - 2)
+        return low, (pos - low)
+
+    rows, row_frac = weights(height, cells.shape[0])
+    cells = cells[rows] * (1 - row_frac[:, None]) + cells[rows + 1] * row_frac[:, None]
+    cols, col_frac = weights(width, cells.shape[1])
+    return cells[:, cols] * (1 - col_frac[None, :]) + cells[:, cols + 1] * col_frac[None, :]
+
+
+def _noise_range(noise: float) -> int:
+    """噪点亮度偏移的上限（3倍标准差，最多255）"""
+    return min(255, max(1, math.ceil(3 * noise * 255)))
+
+
+def _noise_index(spec: GradientSpec, width: int, height: int) -> np.ndarray:
+    """
+    渐变加噪点的组合索引：颜色表索引 × 偏移级数 + 偏移级别
+
+    噪点只改变亮度且与颜色无关，因此可以和渐变位置一起缓存，
+    每个颜色变体只需查一次 _noise_table 生成的二维颜色表
+    """
+    rng = np.random.default_rng(spec.seed)
+    if spec.noise_scale > 1:
+        cells = rng.standard_normal((height // spec.noise_scale + 2, width // spec.noise_scale + 2),
+                                    dtype=np.float32)
+        grain = _upsample(cells, width, height)
+        # 插值会减小方差，按平滑程度补偿，使不同颗粒大小的强度一致
+        grain /= grain.std() or 1.0
+    else:
+        grain = rng.standard_normal((height, width), dtype=np.float32)
+
+    limit = _noise_range(spec.noise)
+    grain *= spec.noise * 255
+    np.rint(grain, out=grain)
+    np.clip(grain, -limit, limit, out=grain)
+    levels = grain.astype(np.int32)
+    levels += limit
+
+    index = _gradient_index(spec, width, height).astype(np.int32)
+    index *= 2 * limit + 1
+    index += levels
+    return index
+
+
+def _noise_table(lut: np.ndarray, limit: int) -> np.ndarray:
+    """二维颜色表：每个渐变颜色加上每一级亮度偏移（按通道限制在0到255）"""
+    offsets = np.arange(-limit, limit + 1, dtype=np.int16)
+    r, g, b = (
+        np.clip(((lut >> shift) & 0xFF).astype(np.int16)[:, None] + offsets[None, :], 0, 255).astype(np.uint32)
+        for shift in (16, 8, 0)
+    )
+    return (np.uint32(0xFF000000) | (r << 16) | (g << 8) | b).ravel()
+
+
+def render_gradient(spec: GradientSpec, width: int, height: int,
+                    out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    计算渐变背景的像素
+
+    Args:
+        spec: 渐变参数
+        width: 宽度
+        height: 高度
+        out: 写入结果的 uint32 数组（height × width），为None时新建
+
+    Returns:
+        np.ndarray: uint32 数组（height × width），每项为 0xffRRGGBB
+
+    Raises:
+        ValueError: 尺寸无效
+    """
+    if width <= 0 or height <= 0:
+        raise ValueError(f"无效的图片尺寸：{width}x{height}")
+    if out is None:
+        out = np.empty((height, width), dtype=np.uint32)
+
+    lut = gradient_lut(spec.stops)
+
+    if spec.noise > 0:
+        key = ('noise', width, height, spec.kind, spec.angle, spec.center, spec.radius,
+               spec.noise, spec.noise_scale, spec.seed)
+        index = _field_cache.get(key, lambda: _noise_index(spec, width, height))
+        return np.take(_noise_table(lut, _noise_range(spec.noise)), index, out=out, mode='clip')
+
+    if spec.kind == 'linear' and spec.angle % 90 == 0:
+        # 水平或竖直的渐变：只计算一行或一列的颜色，再按行或列复制
+        xs, ys = _linear_axes(width, height, spec.angle)
+        if abs(math.sin(math.radians(spec.angle))) < 0.5:
+            out[...] = lut[_to_index(ys + xs[0])][:, None]
+        else:
+            out[...] = lut[_to_index(xs + ys[0])][None, :]
+        return out
+
+    return np.take(lut, _gradient_index(spec, width, height), out=out, mode='clip')
+
+
+def generate_background(spec: GradientSpec, width: int, height: int) -> QImage:
+    """
+    生成渐变背景图片（可在任意线程调用）
+
+    像素直接写入QImage的缓冲区，不经过额外的复制
+
+    Args:
+        spec: 渐变参数
+        width: 宽度
+        height: 高度
+
+    Returns:
+        QImage: RGB32 格式的图片，可直接交给 ImageProcessor.set_background
+    """
+    image = QImage(width, height, QImage.Format_RGB32)
+    if image.isNull():
+        raise ValueError(f"无法创建 {width}x{height} 的图片")
+    # RGB32 每行字节数总是 width * 4，缓冲区可以直接看作 height × width 的 uint32 数组
+    pixels = np.frombuffer(image.bits(), dtype=np.uint32, count=width * height).reshape(height, width)
+    render_gradient(spec, width, height, out=pixels)
+    return image
+
+
+def save_background(spec: GradientSpec, width: int, height: int, path: str, quality: int = 95) -> str:
+    """
+    生成渐变背景并保存为文件（格式由扩展名决定）
+
+    Args:
+        spec: 渐变参数
+        width: 宽度
+        height: 高度
+        path: 文件路径
+        quality: JPEG 压缩质量
+
+    Returns:
+        str: 文件路径
+
+    Raises:
+        RuntimeError: 保存失败
+    """
+    if not generate_background(spec, width, height).save(path, quality=quality):
+        raise RuntimeError(f"无法保存背景图片：{path}")
+    logger.debug(f"生成背景图片：{path} ({width}x{height})")
+    return path
+
+
+def clear_cache():
+    """清空渐变位置和噪点的缓存"""
+    _field_cache.clear()
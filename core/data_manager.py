@@ -7,51 +7,70 @@
 
 import logging
 import os
-import pandas as pd
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QThreadPool, Signal
 from PySide6.QtGui import QImage, QPixmap
 
+from .background_cache import BackgroundCache
+from .excel_stream import ExcelLoadWorker
+from .stage_timer import get_preview_timer
+from .text_store import TextItem, TextStore
+
 logger = logging.getLogger(__name__)
 
-class TextItem:
-    """文本项类"""
-    def __init__(self, text, font_family=None, font_size=None, color=None):
-        self.text = text
-        self.font_family = font_family
-        self.font_size = font_size
-        self.color = color
-        
-    def __str__(self):
-        return self.text
+def read_excel_texts(file_path: str) -> list:
+    """读取Excel文件第一列的文本（不依赖界面，可供命令行使用）"""
+    # pandas 导入较慢，第一次读取Excel时才导入
+    import pandas as pd
+
+    df = pd.read_excel(file_path)
+    
+    if df.empty:
+        raise ValueError("Excel文件为空")
+    
+    # 获取第一列作为文本内容，保留换行符
+    texts = df.iloc[:, 0].tolist()
+    
+    # 过滤掉空值和非字符串值，但保留换行符
+    texts = [str(text).strip('\t ') for text in texts if pd.notna(text)]  # 只去除首尾的制表符和空格，保留换行符
+    
+    if not texts:
+        raise ValueError("没有找到有效的文本内容")
+    
+    return texts
 
 class DataManager(QObject):
     """数据管理类，处理标签页间的数据共享"""
     
     # 定义信号
     image_changed = Signal(str)  # 图片改变信号（传递图片路径）
-    texts_changed = Signal(list)  # 文本改变信号
+    texts_changed = Signal(object)  # 文本改变信号（传递 TextStore，避免复制整个列表）
     current_index_changed = Signal(int, int)  # 当前索引改变信号（当前索引，总数）
+    texts_appended = Signal(int, int)  # 文本追加信号（起始索引，条数）
+    load_progress = Signal(int, int)  # Excel加载进度信号（已加载条数，预计总数）
+    load_finished = Signal(int, bool)  # Excel加载结束信号（条数，是否取消或失败）
     
     def __init__(self, monitor):
         super().__init__()
         self.monitor = monitor
         self._image_path = None
-        self._texts = []  # 文本项列表
+        self._texts = TextStore()  # 紧凑文本存储
         self._current_index = -1
         
-        # 创建数据目录
+        # 正在进行的Excel流式加载任务（已取消但尚未结束的任务也要保持引用）
+        self._load_worker = None
+        self._running_loads = set()
+        self._load_file_path = None
+        self._loaded_count = 0
+        
+        # 背景图片缓存（内容页和样式页共享）
+        self.background_cache = BackgroundCache(timer=get_preview_timer())
+        
+        # 数据目录（第一次复制文件时才创建，不拖慢启动）
         self.data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
         self.texts_dir = os.path.join(self.data_dir, 'texts')
         self.images_dir = os.path.join(self.data_dir, 'images')
         self.outputs_dir = os.path.join(self.data_dir, 'outputs')
         
-        try:
-            for dir_path in [self.texts_dir, self.images_dir, self.outputs_dir]:
-                os.makedirs(dir_path, exist_ok=True)
-            self.monitor.info_occurred.emit("数据目录初始化完成")
-        except Exception as e:
-            self.monitor.error_occurred.emit(f"创建数据目录失败: {str(e)}")
-        
     def set_image(self, image_path: str):
         """设置当前图片"""
         try:
@@ -66,6 +85,7 @@ class DataManager(QObject):
             # 如果图片不在images目录中，复制到images目录
             if not image_path.startswith(self.images_dir):
                 new_path = os.path.join(self.images_dir, os.path.basename(image_path))
+                os.makedirs(self.images_dir, exist_ok=True)
                 import shutil
                 shutil.copy2(image_path, new_path)
                 image_path = new_path
@@ -91,26 +111,26 @@ class DataManager(QObject):
             if not texts:
                 self.monitor.warning_occurred.emit("文本列表为空")
                 
-            # 将普通文本转换为TextItem对象
-            text_items = []
-            for text in texts:
-                if isinstance(text, str):
-                    text_items.append(TextItem(text))
-                elif isinstance(text, TextItem):
-                    text_items.append(text)
-                else:
-                    raise ValueError(f"不支持的文本类型：{type(text)}")
-            
-            self._texts = text_items
-            self.texts_changed.emit(text_items)
-            
-            if text_items:
+            # 文本（及 TextItem 的样式）编码进紧凑存储，不再为每条文本创建对象
+            if isinstance(texts, TextStore):
+                store = texts.copy()
+            else:
+                store = TextStore()
+                for text in texts:
+                    if text is None:
+                        raise ValueError(f"不支持的文本类型：{type(text)}")
+                    store.append(text)
+            
+            self._texts = store
+            self.texts_changed.emit(store)
+            
+            if store:
                 self.set_current_index(0)  # 设置为第一条
-                self.monitor.info_occurred.emit(f"已加载 {len(text_items)} 条文本")
+                self.monitor.info_occurred.emit(f"已加载 {len(store)} 条文本")
             else:
                 self.set_current_index(-1)
                 
-            logger.debug(f"设置文本列表，共 {len(text_items)} 条")
+            logger.debug(f"设置文本列表，共 {len(store)} 条")
             
         except Exception as e:
             error_msg = f"设置文本列表失败：{str(e)}"
@@ -118,14 +138,18 @@ class DataManager(QObject):
             self.monitor.error_occurred.emit(error_msg)
             raise
             
-    def get_texts(self) -> list:
-        """获取文本列表"""
+    def get_texts(self) -> TextStore:
+        """获取文本列表（按索引访问得到字符串，带样式的文本项用 get_text_item 获取）"""
         return self._texts
         
+    def get_text_item(self, index: int) -> TextItem:
+        """获取指定索引的文本及其样式"""
+        return self._texts.get_item(index)
+        
     def get_current_text(self) -> str:
         """获取当前文本"""
         if 0 <= self._current_index < len(self._texts):
-            return str(self._texts[self._current_index])
+            return self._texts[self._current_index]
         return None
         
     def set_current_index(self, index: int):
@@ -145,39 +169,130 @@ class DataManager(QObject):
         if self._current_index > 0:
             self.set_current_index(self._current_index - 1)
             
-    def load_excel(self, file_path: str):
-        """加载Excel文件"""
+    def _prepare_excel_file(self, file_path: str) -> str:
+        """检查Excel文件，并在需要时复制到texts目录，返回实际读取的路径"""
+        # 检查文件是否存在
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"找不到Excel文件: {file_path}")
+        
+        # 检查文件类型
+        if not file_path.lower().endswith(('.xlsx', '.xls')):
+            raise ValueError("不支持的文件格式，请使用Excel文件(.xlsx或.xls)")
+        
+        # 如果文件不在texts目录中，复制到texts目录
+        if not file_path.startswith(self.texts_dir):
+            new_path = os.path.join(self.texts_dir, os.path.basename(file_path))
+            os.makedirs(self.texts_dir, exist_ok=True)
+            import shutil
+            shutil.copy2(file_path, new_path)
+            file_path = new_path
+            self.monitor.info_occurred.emit(f"Excel文件已复制到texts目录: {os.path.basename(new_path)}")
+        
+        return file_path
+        
+    def append_texts(self, texts: list):
+        """在文本列表末尾追加文本（流式加载时使用）"""
+        if not texts:
+            return
+        if not self._texts:
+            self.set_texts(texts)
+            return
+        
+        start = len(self._texts)
+        self._texts.extend(texts)
+        self.texts_appended.emit(start, len(texts))
+        logger.debug(f"追加 {len(texts)} 条文本，共 {len(self._texts)} 条")
+        
+    def load_excel_async(self, file_path: str):
+        """
+        在后台线程中流式加载Excel文件
+        
+        第一块读取完成后立即设置文本列表（可以开始预览），之后的块依次追加
+        """
         try:
-            # 检查文件是否存在
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"找不到Excel文件: {file_path}")
+            file_path = self._prepare_excel_file(file_path)
             
-            # 检查文件类型
-            if not file_path.lower().endswith(('.xlsx', '.xls')):
-                raise ValueError("不支持的文件格式，请使用Excel文件(.xlsx或.xls)")
+            # 取消正在进行的加载
+            self.cancel_load()
             
-            # 如果文件不在texts目录中，复制到texts目录
-            if not file_path.startswith(self.texts_dir):
-                new_path = os.path.join(self.texts_dir, os.path.basename(file_path))
-                import shutil
-                shutil.copy2(file_path, new_path)
-                file_path = new_path
-                self.monitor.info_occurred.emit(f"Excel文件已复制到texts目录: {os.path.basename(new_path)}")
+            worker = ExcelLoadWorker(file_path)
+            worker.signals.chunk_loaded.connect(self._on_chunk_loaded)
+            worker.signals.finished.connect(self._on_load_finished)
+            worker.signals.failed.connect(self._on_load_failed)
+            self._load_worker = worker
+            self._running_loads.add(worker)
+            self._load_file_path = file_path
+            self._loaded_count = 0
             
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
+            logger.info(f"开始流式加载Excel文件：{file_path}")
+            QThreadPool.globalInstance().start(worker)
             
-            if df.empty:
-                raise ValueError("Excel文件为空")
+        except Exception as e:
+            error_msg = f"加载Excel文件失败：{str(e)}"
+            logger.error(error_msg)
+            self.monitor.error_occurred.emit(error_msg)
+            raise
             
-            # 获取第一列作为文本内容，保留换行符
-            texts = df.iloc[:, 0].tolist()
+    def cancel_load(self):
+        """取消正在进行的Excel加载（已读取的文本会保留）"""
+        if self._load_worker is not None:
+            self._load_worker.cancel()
+            self._load_worker = None
+            self.load_finished.emit(self._loaded_count, True)
+            logger.info(f"已取消Excel加载，保留 {self._loaded_count} 条")
             
-            # 过滤掉空值和非字符串值，但保留换行符
-            texts = [str(text).strip('\t ') for text in texts if pd.notna(text)]  # 只去除首尾的制表符和空格，保留换行符
+    def _is_current_load(self) -> bool:
+        """信号是否来自当前的加载任务（已取消的任务发出的信号会被忽略）"""
+        return self._load_worker is not None and self.sender() is self._load_worker.signals
+        
+    def _release_load(self):
+        """加载任务结束后释放引用"""
+        sender = self.sender()
+        self._running_loads = {w for w in self._running_loads if w.signals is not sender}
             
-            if not texts:
-                raise ValueError("没有找到有效的文本内容")
+    def is_loading(self) -> bool:
+        """是否正在加载Excel文件"""
+        return self._load_worker is not None
+            
+    def _on_chunk_loaded(self, texts, total):
+        """处理后台读取到的一块文本"""
+        if not self._is_current_load():
+            return
+        if self._loaded_count == 0:
+            self.set_texts(texts)
+        else:
+            self.append_texts(texts)
+        self._loaded_count += len(texts)
+        self.load_progress.emit(self._loaded_count, max(total, self._loaded_count))
+        
+    def _on_load_finished(self, count, canceled):
+        """处理Excel加载完成"""
+        is_current = self._is_current_load()
+        self._release_load()
+        if not is_current:
+            return
+        self._load_worker = None
+        self.load_finished.emit(self._loaded_count, canceled)
+        self.monitor.info_occurred.emit(f"成功加载Excel文件：{os.path.basename(self._load_file_path)}，共 {self._loaded_count} 条")
+        logger.info(f"成功加载Excel文件：{self._load_file_path}")
+        
+    def _on_load_failed(self, message):
+        """处理Excel加载失败"""
+        is_current = self._is_current_load()
+        self._release_load()
+        if not is_current:
+            return
+        self._load_worker = None
+        self.load_finished.emit(self._loaded_count, True)
+        self.monitor.error_occurred.emit(f"加载Excel文件失败：{message}")
+            
+    def load_excel(self, file_path: str):
+        """加载Excel文件"""
+        try:
+            file_path = self._prepare_excel_file(file_path)
+            
+            # 读取Excel文件
+            texts = read_excel_texts(file_path)
             
             # 设置文本列表
             self.set_texts(texts)
@@ -194,9 +309,10 @@ class DataManager(QObject):
     def clear(self):
         """清除所有数据"""
         logger.debug("清除所有数据")
+        self.cancel_load()
         self._image_path = None
-        self._texts = []
+        self._texts = TextStore()
         self._current_index = -1
         self.image_changed.emit(None)
-        self.texts_changed.emit([])
+        self.texts_changed.emit(self._texts)
         self.current_index_changed.emit(-1, 0) 
\ No newline at end of file
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel流式读取模块
+按块读取Excel第一列的文本，并在后台线程中增量加载
+"""
+
+import logging
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _clean_text(value) -> Optional[str]:
+    """与 read_excel_texts 相同的清理规则：跳过空单元格，只去除首尾的制表符和空格"""
+    if value is None:
+        return None
+    if isinstance(value, float) and value != value:  # NaN
+        return None
+    return str(value).strip('\t ')
+
+
+def iter_excel_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[List[str], int]]:
+    """
+    按块读取Excel第一个工作表第一列的文本（第一行为表头）
+
+    .xlsx 使用 openpyxl 只读模式逐行解析，内存占用与块大小成正比；
+    .xls 不支持流式读取，整表读取后再分块返回
+
+    Args:
+        file_path: Excel文件路径
+        chunk_size: 每块的行数
+
+    Yields:
+        Tuple[List[str], int]: (本块文本, 预计总行数，未知时为0)
+    """
+    if file_path.lower().endswith('.xls'):
+        import pandas as pd
+        df = pd.read_excel(file_path)
+        column = df.iloc[:, 0] if len(df.columns) else []
+        total = len(column)
+        chunk = []
+        for value in column:
+            text = _clean_text(value)
+            if text is not None:
+                chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield chunk, total
+                chunk = []
+        if chunk:
+            yield chunk, total
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        # 只读模式下 max_row 来自文件中记录的表格范围，可能不准确
+        total = max((sheet.max_row or 1) - 1, 0)
+        chunk = []
+        for (value,) in sheet.iter_rows(min_row=2, max_col=1, values_only=True):
+            text = _clean_text(value)
+            if text is not None:
+                chunk.append(text)
+            if len(chunk) >= chunk_size:
+                yield chunk, total
+                chunk = []
+        if chunk:
+            yield chunk, total
+    finally:
+        workbook.close()
+
+
+class ExcelLoadSignals(QObject):
+    """Excel加载任务信号"""
+
+    chunk_loaded = Signal(list, int)  # 本块文本，预计总行数
+    finished = Signal(int, bool)  # 已加载条数，是否被取消
+    failed = Signal(str)  # 错误信息
+
+
+class ExcelLoadWorker(QRunnable):
+    """后台Excel加载任务"""
+
+    def __init__(self, file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        初始化加载任务
+
+        Args:
+            file_path: Excel文件路径
+            chunk_size: 每块的行数
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ExcelLoadSignals()
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消加载（可在任意线程调用）"""
+        self._cancel_event.set()
+
+    def is_canceled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def run(self):
+        """执行加载（在线程池线程中运行）"""
+        loaded = 0
+        try:
+            for chunk, total in iter_excel_chunks(self.file_path, self.chunk_size):
+                if self.is_canceled():
+                    break
+                loaded += len(chunk)
+                self.signals.chunk_loaded.emit(chunk, total)
+
+            if loaded == 0 and not self.is_canceled():
+                raise ValueError("没有找到有效的文本内容")
+
+            logger.info(f"Excel加载结束：{loaded} 条，取消：{self.is_canceled()}")
+            self.signals.finished.emit(loaded, self.is_canceled())
+
+        except Exception as e:
+            logger.error(f"加载Excel文件失败：{str(e)}")
+            self.signals.failed.emit(str(e))
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量导出模块
+为每张导出图片计算内容哈希（文本、样式、背景、字体文件、引擎版本），
+在输出目录中保存清单，再次导出时只重新渲染内容发生变化的图片；
+导出过程中逐条记录进度，中断后可以从输出目录继续导出
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .image_encoder import MIN_IMAGE_BYTES, PARTIAL_SUFFIX, EncodeOptions
+from .image_processor import (
+    AUTO_FIT_KEYS, AUTO_FIT_VERSION, ENGINE_VERSION, ImageProcessor, export_file_name, serialize_style_config
+)
+from .parallel_export import export_parallel
+from .stage_timer import StageTimer
+from .text_store import TextStore
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+JOURNAL_NAME = "manifest.journal"  # 进度日志：每导出一张追加一行，保存清单时合并
+TEXTS_NAME = "texts.bin"  # 导出任务的文本快照，用于继续导出
+TIMINGS_NAME = "timings.json"  # 本次导出各阶段的耗时统计
+REUSE_PREFIX = ".quote_maker_reuse_"  # 复用图片时的临时目录前缀（输出目录可能是用户的任意目录）
+
+# 进度日志写入磁盘（fsync）的最小间隔，单位秒
+CHECKPOINT_INTERVAL = 2.0
+
+# 文件摘要缓存：(绝对路径, 修改时间, 文件大小) → sha256
+_digest_cache: Dict[tuple, str] = {}
+_cache_lock = threading.Lock()
+
+
+def _stat_key(path: str) -> tuple:
+    """文件的缓存键，文件被修改后自动失效"""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def file_digest(path: str) -> str:
+    """
+    计算文件内容的 sha256（按文件修改时间和大小缓存）
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        str: 十六进制摘要
+
+    Raises:
+        FileNotFoundError: 文件不存在
+    """
+    key = _stat_key(path)
+    with _cache_lock:
+        digest = _digest_cache.get(key)
+    if digest is not None:
+        return digest
+
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    digest = sha.hexdigest()
+    with _cache_lock:
+        _digest_cache[key] = digest
+    return digest
+
+
+def font_digest(font_family: str, fonts_dir: Optional[str] = None) -> str:
+    """
+    计算字体的摘要：自定义字体使用字体文件内容，系统字体只能使用字体族名
+
+    Args:
+        font_family: 字体族名
+        fonts_dir: 自定义字体目录
+
+    Returns:
+        str: 字体摘要
+    """
+    from .font_manager import get_font_manager
+
+    font_files = []
+    if fonts_dir:
+        font_manager = get_font_manager(fonts_dir)
+        font_manager.scan()
+        font_files = font_manager.font_files(font_family)
+    if font_files:
+        return "file:" + ",".join(file_digest(path) for path in font_files)
+    return f"system:{font_family}"
+
+
+def render_fingerprint(background_path: str, style_config: Dict, font_scale: float = 1.0,
+                       scale_factor: int = 2, fonts_dir: Optional[str] = None,
+                       encode_options: Optional[EncodeOptions] = None) -> str:
+    """
+    计算一批导出中所有图片共享的摘要（样式、背景、字体、编码设置、引擎版本）
+
+    Args:
+        background_path: 背景图片路径
+        style_config: 样式配置
+        font_scale: 字体缩放比例
+        scale_factor: 输出分辨率倍数
+        fonts_dir: 自定义字体目录
+        encode_options: 编码设置
+
+    Returns:
+        str: 十六进制摘要
+    """
+    style = serialize_style_config(style_config)
+    if not style.get('auto_fit'):
+        # 未开启自动字号时这些项不影响渲染结果，不计入摘要，以免旧的导出全部失效
+        for key in AUTO_FIT_KEYS:
+            style.pop(key, None)
+    encode = (encode_options or EncodeOptions()).to_dict()
+    for key in ('width', 'height', 'dpi'):
+        # 未指定输出尺寸和DPI时与加入这些设置之前的输出相同，不计入摘要
+        if not encode.get(key):
+            encode.pop(key, None)
+    payload = {
+        'engine_version': ENGINE_VERSION,
+        'style': style,
+        'font_scale': font_scale,
+        'scale_factor': scale_factor,
+        'background': file_digest(background_path),
+        'font': font_digest(style['font_family'], fonts_dir),
+        'fallback_font': font_digest(style['fallback_family'], fonts_dir) if style.get('fallback_family') else None,
+        'encode': encode,
+    }
+    if style.get('auto_fit'):
+        payload['auto_fit_version'] = AUTO_FIT_VERSION
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def item_digest(fingerprint: str, text: str) -> str:
+    """
+    计算单张图片的内容摘要
+
+    Args:
+        fingerprint: render_fingerprint 的结果
+        text: 文本内容
+
+    Returns:
+        str: 十六进制摘要
+    """
+    sha = hashlib.sha256(fingerprint.encode('ascii'))
+    sha.update(text.encode('utf-8'))
+    return sha.hexdigest()
+
+
+@dataclass
+class ExportJob:
+    """导出任务元数据（继续导出时使用相同的设置）"""
+
+    background_path: str
+    style_config: Dict
+    font_scale: float = 1.0
+    fonts_dir: Optional[str] = None
+    encode_options: Optional[Dict] = None
+    text_count: int = 0
+    source: str = ""  # 文本来源（Excel文件路径），仅供查看
+    created: str = field(default_factory=lambda: datetime.now().isoformat(timespec='seconds'))
+    completed: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ExportJob':
+        """从清单中的字典创建，忽略未知字段"""
+        names = cls.__dataclass_fields__.keys()
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+class ExportManifest:
+    """
+    导出清单：记录输出目录中每个文件对应的内容摘要和导出任务信息
+
+    导出过程中每完成一张就在进度日志末尾追加一行（文件已改名到位后才记录），
+    保存清单时再合并为 manifest.json；崩溃后读取清单会重放进度日志
+    """
+
+    def __init__(self, export_dir: str):
+        """
+        初始化导出清单
+
+        Args:
+            export_dir: 输出目录
+        """
+        self.export_dir = export_dir
+        self.path = os.path.join(export_dir, MANIFEST_NAME)
+        self.journal_path = os.path.join(export_dir, JOURNAL_NAME)
+        self.items: Dict[str, str] = {}  # 文件名 → 内容摘要
+        self.job: Optional[ExportJob] = None
+        self._journal = None
+        self._last_sync = 0.0
+
+    @classmethod
+    def load(cls, export_dir: str) -> 'ExportManifest':
+        """
+        读取输出目录中的清单和进度日志，不存在或已损坏时返回空清单
+
+        Args:
+            export_dir: 输出目录
+
+        Returns:
+            ExportManifest: 导出清单
+        """
+        manifest = cls(export_dir)
+        if os.path.exists(manifest.path):
+            try:
+                with open(manifest.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                manifest.items = dict(data.get('items', {}))
+                if data.get('job'):
+                    manifest.job = ExportJob.from_dict(data['job'])
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"导出清单无法读取，将全部重新导出：{str(e)}")
+
+        if os.path.exists(manifest.journal_path):
+            replayed = 0
+            with open(manifest.journal_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    # 崩溃时最后一行可能不完整，直接忽略
+                    name, _, digest = line.rstrip('\n').partition('\t')
+                    if line.endswith('\n') and len(digest) == 64:
+                        manifest.items[name] = digest
+                        replayed += 1
+            logger.info(f"从进度日志恢复 {replayed} 条导出记录")
+        return manifest
+
+    def record(self, name: str, digest: str):
+        """
+        记录一个已完成的文件（追加到进度日志）
+
+        Args:
+            name: 文件名
+            digest: 内容摘要
+        """
+        self.items[name] = digest
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(f"{name}\t{digest}\n")
+        self._journal.flush()
+
+        now = time.monotonic()
+        if now - self._last_sync >= CHECKPOINT_INTERVAL:
+            os.fsync(self._journal.fileno())
+            self._last_sync = now
+
+    def save(self):
+        """写入清单并清空进度日志（先写临时文件再替换，中途崩溃不会留下损坏的清单）"""
+        os.makedirs(self.export_dir, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'engine_version': ENGINE_VERSION,
+                'job': asdict(self.job) if self.job else None,
+                'items': self.items
+            }, f, ensure_ascii=False, indent=0)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        # 清单已包含进度日志中的全部记录
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+
+
+class IncrementalPlan:
+    """增量导出计划"""
+
+    def __init__(self, manifest: ExportManifest, digests: List[str], extension: str = "jpg"):
+        self.manifest = manifest
+        self.digests = digests
+        self.extension = extension  # 导出文件扩展名
+        self.render: List[int] = []  # 需要重新渲染的文本索引
+        self.unchanged = 0  # 内容未变化的图片数
+        self.reused = 0  # 从其他文件名复用的图片数（例如插入行后编号后移）
+        self.pruned = 0  # 删除的多余图片数
+        self.exported = 0  # 本次渲染成功的图片数
+        self.timer: Optional[StageTimer] = None  # 本次导出各阶段的耗时统计
+
+    def mark_exported(self, index: int):
+        """记录一张图片已导出"""
+        self.manifest.record(self.file_name(index), self.digests[index])
+
+    def file_name(self, index: int) -> str:
+        """第 index 条文本的导出文件名"""
+        return export_file_name(index, self.extension)
+
+
+def _link_or_copy(source: str, target: str):
+    """创建硬链接，文件系统不支持时复制"""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def plan_incremental_export(texts: Sequence, export_dir: str, fingerprint: str,
+                            job: Optional[ExportJob] = None, extension: str = "jpg") -> IncrementalPlan:
+    """
+    对比清单，确定需要重新渲染的图片
+
+    内容未变化的图片保持不动；内容已存在于其他文件名的图片通过硬链接复用；
+    清单中记录但不再对应任何文本的旧图片被删除，目录中的其他文件不受影响
+
+    Args:
+        texts: 文本列表
+        export_dir: 输出目录
+        fingerprint: render_fingerprint 的结果
+        job: 本次导出任务的元数据，会写入清单
+        extension: 导出文件扩展名
+
+    Returns:
+        IncrementalPlan: 导出计划（清单已按复用和删除结果更新并保存）
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    manifest = ExportManifest.load(export_dir)
+    plan = IncrementalPlan(manifest, [item_digest(fingerprint, str(text)) for text in texts], extension)
+
+    # 清理上次中断时留下的临时文件：输出目录可能是用户的任意目录，
+    # 只删除本工具的导出文件名（本次导出或清单中记录的）对应的临时文件
+    own_names = {plan.file_name(i) for i in range(len(plan.digests))}
+    own_names.update(manifest.items)
+    for name in os.listdir(export_dir):
+        if name.endswith(PARTIAL_SUFFIX) and name[:-len(PARTIAL_SUFFIX)] in own_names:
+            try:
+                os.remove(os.path.join(export_dir, name))
+            except OSError as e:
+                logger.warning(f"删除临时文件失败：{name}，{str(e)}")
+
+    # 只信任仍然存在且不是空文件的文件（一次列出目录，不逐个检查）
+    present = set()
+    with os.scandir(export_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_size >= MIN_IMAGE_BYTES:
+                    present.add(entry.name)
+            except OSError:
+                continue
+    existing = {name: digest for name, digest in manifest.items.items() if name in present}
+    by_digest = {}
+    for name, digest in existing.items():
+        by_digest.setdefault(digest, name)
+
+    reuse: List[Tuple[int, str]] = []
+    for i, digest in enumerate(plan.digests):
+        name = plan.file_name(i)
+        if existing.get(name) == digest:
+            plan.unchanged += 1
+        elif digest in by_digest:
+            reuse.append((i, by_digest[digest]))
+        else:
+            plan.render.append(i)
+
+    # 先为要复用的文件建立链接，再覆盖目标，避免源文件先被覆盖
+    if reuse:
+        # 每次新建唯一的临时目录，只删除自己创建的目录
+        staging_dir = tempfile.mkdtemp(prefix=REUSE_PREFIX, dir=export_dir)
+        try:
+            staged = {}
+            for _, source in reuse:
+                if source not in staged:
+                    staged[source] = os.path.join(staging_dir, f"{len(staged)}.tmp")
+                    _link_or_copy(os.path.join(export_dir, source), staged[source])
+            for i, source in reuse:
+                target = os.path.join(export_dir, plan.file_name(i))
+                _link_or_copy(staged[source], target + PARTIAL_SUFFIX)
+                os.replace(target + PARTIAL_SUFFIX, target)
+                plan.mark_exported(i)
+                plan.reused += 1
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # 删除不再对应任何文本的旧图片
+    current = {plan.file_name(i) for i in range(len(plan.digests))}
+    for name in list(manifest.items):
+        if name in current:
+            continue
+        try:
+            os.remove(os.path.join(export_dir, name))
+            plan.pruned += 1
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"删除旧图片失败：{name}，{str(e)}")
+            continue
+        del manifest.items[name]
+
+    # 需要重新渲染的图片在完成前不计入清单；旧文件先删除，
+    # 因为它可能与复用的图片是同一个硬链接，直接覆盖写入会同时改掉对方
+    for i in plan.render:
+        name = plan.file_name(i)
+        manifest.items.pop(name, None)
+        if name in present:
+            try:
+                os.remove(os.path.join(export_dir, name))
+            except FileNotFoundError:
+                pass
+    if job is not None:
+        if manifest.job is not None:
+            job.created = manifest.job.created
+        manifest.job = job
+    manifest.save()
+
+    logger.info(
+        f"增量导出计划：{len(plan.digests)} 条，未变化 {plan.unchanged}，"
+        f"复用 {plan.reused}，需渲染 {len(plan.render)}，删除 {plan.pruned}"
+    )
+    return plan
+
+
+def export_incremental(texts: Sequence, export_dir: str, background_path: str,
+                       style_config: Dict, font_scale: float = 1.0,
+                       fonts_dir: Optional[str] = None, workers: int = 1,
+                       progress_callback: Optional[Callable[[int], None]] = None,
+                       cancel_callback: Optional[Callable[[], bool]] = None,
+                       source: str = "",
+                       encode_options: Optional[EncodeOptions] = None,
+                       timer: Optional[StageTimer] = None) -> IncrementalPlan:
+    """
+    增量导出：只渲染内容发生变化的图片，逐条记录进度，完成后更新清单
+
+    导出到新的空目录时所有图片都需要渲染，等同于完整导出；
+    任务设置和文本快照保存在输出目录中，中断后可用 load_export_job 读取并继续
+
+    Args:
+        texts: 文本列表
+        export_dir: 输出目录（清单保存在其中）
+        background_path: 背景图片路径
+        style_config: 样式配置
+        font_scale: 字体缩放比例
+        fonts_dir: 自定义字体目录
+        workers: 工作进程数，大于1时使用多进程导出
+        progress_callback: 进度回调，参数为已处理条数（包含跳过的条数）
+        cancel_callback: 返回True时中止导出
+        source: 文本来源（Excel文件路径），记录在任务信息中
+        encode_options: 编码设置（格式、质量），为None时使用 JPEG 质量85
+        timer: 阶段计时器，为None时新建；结束后统计保存到输出目录的 timings.json
+
+    Returns:
+        IncrementalPlan: 导出计划（包含本次渲染、未变化、复用和删除的条数及阶段耗时）
+    """
+    encode_options = encode_options or EncodeOptions()
+    timer = timer or StageTimer()
+    processor = ImageProcessor(style_config, font_scale=font_scale, fonts_dir=fonts_dir, timer=timer)
+    fingerprint = render_fingerprint(background_path, style_config, font_scale,
+                                     processor.scale_factor, fonts_dir, encode_options)
+
+    # 保存文本快照和任务设置，继续导出时不依赖界面中当前加载的数据
+    os.makedirs(export_dir, exist_ok=True)
+    store = texts if isinstance(texts, TextStore) else TextStore([str(text) for text in texts])
+    store.save(os.path.join(export_dir, TEXTS_NAME))
+    job = ExportJob(
+        background_path=os.path.abspath(background_path),
+        style_config=serialize_style_config(style_config),
+        font_scale=font_scale,
+        fonts_dir=os.path.abspath(fonts_dir) if fonts_dir else None,
+        encode_options=encode_options.to_dict(),
+        text_count=len(store),
+        source=source
+    )
+    plan = plan_incremental_export(store, export_dir, fingerprint, job, encode_options.extension)
+    plan.timer = timer
+
+    # 进度包含跳过的条数，与文本总数对应
+    skipped = plan.unchanged + plan.reused
+    report = None
+    if progress_callback:
+        progress_callback(skipped)
+
+        def report(done: int):
+            progress_callback(skipped + done)
+
+    try:
+        if plan.render and workers > 1:
+            plan.exported = export_parallel(
+                store, export_dir, background_path, style_config,
+                font_scale=font_scale, fonts_dir=fonts_dir, workers=workers,
+                progress_callback=report, cancel_callback=cancel_callback,
+                indices=plan.render, on_exported=plan.mark_exported,
+                encode_options=encode_options, timer=timer
+            )
+        elif plan.render:
+            processor.load_background(background_path)
+            plan.exported = processor.export(
+                (store[i] for i in plan.render), export_dir,
+                progress_callback=report, cancel_callback=cancel_callback,
+                indices=plan.render, on_exported=plan.mark_exported,
+                encode_options=encode_options
+            )
+    finally:
+        job.completed = plan.exported == len(plan.render)
+        plan.manifest.save()
+        if plan.render:
+            try:
+                timer.save(os.path.join(export_dir, TIMINGS_NAME))
+            except OSError as e:
+                logger.warning(f"保存耗时统计失败：{str(e)}")
+
+    return plan
+
+
+def load_export_job(export_dir: str) -> Tuple[ExportJob, TextStore]:
+    """
+    读取输出目录中保存的导出任务
+
+    Args:
+        export_dir: 输出目录
+
+    Returns:
+        Tuple[ExportJob, TextStore]: (任务设置, 文本快照)
+
+    Raises:
+        FileNotFoundError: 目录中没有可继续的导出任务
+        ValueError: 任务信息或文本快照已损坏
+    """
+    manifest = ExportManifest.load(export_dir)
+    texts_path = os.path.join(export_dir, TEXTS_NAME)
+    if manifest.job is None or not os.path.exists(texts_path):
+        raise FileNotFoundError(f"目录中没有可继续的导出任务：{export_dir}")
+
+    texts = TextStore.load(texts_path)
+    if len(texts) != manifest.job.text_count:
+        raise ValueError("导出任务的文本快照不完整")
+    return manifest.job, texts
+
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+后台导出模块
+在线程池中执行批量导出，通过信号汇报进度、速度和剩余时间；
+导出进度逐条记录在输出目录中，中断后可以继续导出
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+from PySide6.QtGui import QColor
+
+from .export_manifest import export_incremental
+from .image_encoder import EncodeOptions
+from .stage_timer import StageTimer
+from .text_store import TextStore
+
+logger = logging.getLogger(__name__)
+
+
+class ExportSignals(QObject):
+    """导出任务信号（在GUI线程创建，信号以队列方式送达界面）"""
+
+    progress = Signal(int, int, float, float)  # 已完成条数，总数，每秒条数，预计剩余秒数
+    timings = Signal(str)  # 各阶段平均耗时摘要，与进度一起发出
+    finished = Signal(str, int, bool)  # 导出目录，成功条数，是否被取消
+    failed = Signal(str)  # 错误信息
+
+
+class ExportWorker(QRunnable):
+    """批量导出任务"""
+
+    # 进度信号的最小间隔（秒），避免大量信号阻塞界面
+    PROGRESS_INTERVAL = 0.1
+
+    def __init__(self, texts: Sequence, export_dir: str, background_path: str,
+                 style_config: Dict, font_scale: float = 1.0,
+                 fonts_dir: Optional[str] = None, workers: int = 1,
+                 encode_options: Optional[EncodeOptions] = None):
+        """
+        初始化导出任务
+
+        文本列表和样式配置在创建时复制一份，导出过程中界面可以继续修改样式；
+        输出目录中已有相同内容的图片（增量导出或继续导出）会被跳过
+
+        Args:
+            texts: 文本列表
+            export_dir: 导出目录
+            background_path: 背景图片路径
+            style_config: 样式配置
+            font_scale: 字体缩放比例
+            fonts_dir: 自定义字体目录（多进程导出时由工作进程加载）
+            workers: 工作进程数，大于1时使用多进程导出
+            encode_options: 编码设置（格式、质量）
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = ExportSignals()
+        # 文本快照：复制紧凑存储的缓冲区，而不是为每条文本创建字符串
+        self.texts = texts.copy() if isinstance(texts, TextStore) else TextStore(str(text) for text in texts)
+        self.export_dir = export_dir
+        self.background_path = background_path
+        self.style_config = dict(style_config)
+        self.style_config['text_color'] = QColor(style_config['text_color'])
+        self.font_scale = font_scale
+        self.fonts_dir = fonts_dir
+        self.workers = workers
+        self.encode_options = encode_options
+        self.skipped = 0  # 内容未变化（或复用已有文件）而跳过的条数
+        self.timer = StageTimer()  # 各阶段耗时统计，导出结束后保存到输出目录
+        self._cancel_event = threading.Event()
+        self._start_time = 0.0
+        self._last_emit = 0.0
+        self._base_done = None  # 第一次汇报时已完成的条数（跳过的图片不计入速度）
+        self._rate_start = 0.0
+
+    def cancel(self):
+        """请求取消导出（可在任意线程调用）"""
+        self._cancel_event.set()
+
+    def is_canceled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+
+    def _report_progress(self, done: int):
+        """计算速度和剩余时间并发出进度信号"""
+        now = time.monotonic()
+        total = len(self.texts)
+        if self._base_done is None:
+            self._base_done = done
+            self._rate_start = now
+        if done < total and now - self._last_emit < self.PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+
+        elapsed = now - self._rate_start
+        rate = (done - self._base_done) / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else -1.0
+        self.signals.progress.emit(done, total, rate, eta)
+        summary = self.timer.summary()
+        if summary:
+            self.signals.timings.emit(summary)
+
+    def run(self):
+        """执行导出（在线程池线程中运行）"""
+        self._start_time = time.monotonic()
+        try:
+            plan = export_incremental(
+                self.texts,
+                self.export_dir,
+                self.background_path,
+                self.style_config,
+                font_scale=self.font_scale,
+                fonts_dir=self.fonts_dir,
+                workers=self.workers,
+                progress_callback=self._report_progress,
+                cancel_callback=self.is_canceled,
+                encode_options=self.encode_options,
+                timer=self.timer
+            )
+            exported = plan.exported
+            self.skipped = plan.unchanged + plan.reused
+
+            if not self.is_canceled():
+                self._report_progress(len(self.texts))
+            elapsed = time.monotonic() - self._start_time
+            logger.info(f"导出完成：{exported}/{len(self.texts)} 张，跳过 {self.skipped} 张，用时 {elapsed:.1f} 秒")
+            if exported:
+                logger.info(f"各阶段耗时：\n{self.timer.details()}")
+            self.signals.finished.emit(self.export_dir, exported, self.is_canceled())
+
+        except Exception as e:
+            logger.error(f"导出失败: {str(e)}")
+            self.signals.failed.emit(str(e))
@@ -3,12 +3,782 @@
 
 """
 字体管理模块
-负责系统字体的加载和管理
+负责自定义字体的索引、按需注册和系统字体的管理
+
+字体目录中的每个字体文件解析一次后记录在索引文件中（按文件大小和修改时间判断是否变化），
+之后启动时直接从索引读取字体族名和字符覆盖范围，只有实际使用的字体才注册到Qt字体数据库；
+渲染前可以检查文本中是否有字体缺少的字符，并改用备用字体
 """
 
+import base64
+import json
+import logging
+import os
+import struct
+import threading
+import unicodedata
+import zlib
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+from PySide6.QtGui import QFont, QFontDatabase, QRawFont
+
+logger = logging.getLogger(__name__)
+
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# 字体索引文件（保存在字体目录中）
+INDEX_NAME = ".font_index.json"
+# 索引格式版本，解析内容变化时递增，旧索引会被重建
+INDEX_VERSION = 2
+
+# 已注册到Qt字体数据库的字体文件：路径 → (文件签名, 字体ID)；字体ID在进程内有效
+_registered_fonts: Dict[str, Tuple[Tuple[int, int], int]] = {}
+_registered_lock = threading.Lock()
+
+# 进程内共享的字体管理器：字体目录 → 字体管理器
+_shared_managers: Dict[str, 'FontManager'] = {}
+_shared_lock = threading.Lock()
+
+# name 表中的名称编号
+_NAME_FAMILY = 1
+_NAME_SUBFAMILY = 2
+_NAME_TYPOGRAPHIC_FAMILY = 16
+_NAME_TYPOGRAPHIC_SUBFAMILY = 17
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """文件签名：(大小, 修改时间)，用于判断字体文件是否变化"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def read_font_tables(f) -> Dict[bytes, Tuple[int, int]]:
+    """
+    读取字体文件的表目录
+
+    Args:
+        f: 以二进制方式打开的字体文件
+
+    Returns:
+        Dict[bytes, Tuple[int, int]]: 表标签 → (偏移, 长度)
+
+    Raises:
+        ValueError: 不是有效的 TrueType/OpenType 字体文件
+    """
+    header = f.read(12)
+    if len(header) < 12:
+        raise ValueError("字体文件过短")
+    version, num_tables = struct.unpack('>4sH', header[:6])
+    if version not in (b'\x00\x01\x00\x00', b'OTTO', b'true'):
+        raise ValueError("不是 TrueType/OpenType 字体文件")
+
+    directory = f.read(16 * num_tables)
+    if len(directory) < 16 * num_tables:
+        raise ValueError("字体表目录不完整")
+    tables = {}
+    for i in range(num_tables):
+        tag, _, offset, length = struct.unpack_from('>4sLLL', directory, 16 * i)
+        tables[tag] = (offset, length)
+    return tables
+
+
+def _read_names(f, tables: Dict[bytes, Tuple[int, int]]) -> Dict[int, str]:
+    """
+    读取 name 表中的英文名称（优先 Windows 平台的美国英语名称）
+
+    Returns:
+        Dict[int, str]: 名称编号 → 名称
+    """
+    if b'name' not in tables:
+        raise ValueError("字体文件缺少 name 表")
+    offset, length = tables[b'name']
+    f.seek(offset)
+    data = f.read(length)
+    _, count, string_offset = struct.unpack_from('>HHH', data, 0)
+
+    names: Dict[int, Tuple[int, str]] = {}  # 名称编号 → (优先级, 名称)
+    for i in range(count):
+        platform_id, encoding_id, language_id, name_id, size, name_offset = struct.unpack_from(
+            '>HHHHHH', data, 6 + 12 * i
+        )
+        if platform_id == 3 and language_id == 0x0409:
+            priority, encoding = 0, 'utf-16-be'
+        elif platform_id == 0:
+            priority, encoding = 1, 'utf-16-be'
+        elif platform_id == 1 and encoding_id == 0 and language_id == 0:
+            priority, encoding = 2, 'mac_roman'
+        else:
+            continue
+        if name_id in names and names[name_id][0] <= priority:
+            continue
+        start = string_offset + name_offset
+        try:
+            name = data[start:start + size].decode(encoding).strip()
+        except UnicodeDecodeError:
+            continue
+        if name:
+            names[name_id] = (priority, name)
+    return {name_id: name for name_id, (_, name) in names.items()}
+
+
+def _cmap_ranges(f, tables: Dict[bytes, Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    读取 cmap 表中有字形的码位范围（支持 Unicode 子表的格式4和格式12）
+
+    Returns:
+        List[Tuple[int, int]]: 码位范围列表（包含两端）
+    """
+    if b'cmap' not in tables:
+        raise ValueError("字体文件缺少 cmap 表")
+    offset, length = tables[b'cmap']
+    f.seek(offset)
+    data = f.read(length)
+    _, num_tables = struct.unpack_from('>HH', data, 0)
+
+    # 选择最完整的子表：格式12（完整Unicode）优先于格式4（仅BMP）
+    best = None
+    for i in range(num_tables):
+        platform_id, encoding_id, sub_offset = struct.unpack_from('>HHL', data, 4 + 8 * i)
+        fmt = struct.unpack_from('>H', data, sub_offset)[0]
+        unicode_table = platform_id == 0 or (platform_id == 3 and encoding_id in (1, 10))
+        if fmt == 12 and unicode_table:
+            rank = 0
+        elif fmt == 4 and unicode_table:
+            rank = 1
+        elif fmt == 4:
+            rank = 2
+        else:
+            continue
+        if best is None or rank < best[0]:
+            best = (rank, fmt, sub_offset)
+    if best is None:
+        raise ValueError("字体文件中没有可识别的字符映射表")
+
+    _, fmt, sub_offset = best
+    if fmt == 12:
+        return _cmap_format12(data, sub_offset)
+    return _cmap_format4(data, sub_offset)
+
+
+def _cmap_format4(data: bytes, offset: int) -> List[Tuple[int, int]]:
+    """解析格式4子表（分段映射）"""
+    seg_count = struct.unpack_from('>H', data, offset + 6)[0] // 2
+    ends_pos = offset + 14
+    starts_pos = ends_pos + 2 * seg_count + 2
+    deltas_pos = starts_pos + 2 * seg_count
+    range_offsets_pos = deltas_pos + 2 * seg_count
+    ends = struct.unpack_from(f'>{seg_count}H', data, ends_pos)
+    starts = struct.unpack_from(f'>{seg_count}H', data, starts_pos)
+    deltas = struct.unpack_from(f'>{seg_count}H', data, deltas_pos)
+    range_offsets = struct.unpack_from(f'>{seg_count}H', data, range_offsets_pos)
+
+    ranges = []
+    for i in range(seg_count):
+        start, end, delta, range_offset = starts[i], ends[i], deltas[i], range_offsets[i]
+        if start == 0xFFFF or start > end:
+            continue
+        if range_offset == 0:
+            # 字形编号为 (码位 + delta) mod 65536，只有结果为0的码位没有字形
+            missing = (0x10000 - delta) & 0xFFFF
+            if start <= missing <= end:
+                if missing > start:
+                    ranges.append((start, missing - 1))
+                if missing < end:
+                    ranges.append((missing + 1, end))
+            else:
+                ranges.append((start, end))
+            continue
+
+        glyphs_pos = range_offsets_pos + 2 * i + range_offset
+        run_start = None
+        for code in range(start, end + 1):
+            pos = glyphs_pos + 2 * (code - start)
+            glyph = struct.unpack_from('>H', data, pos)[0] if pos + 2 <= len(data) else 0
+            if glyph and (glyph + delta) & 0xFFFF:
+                if run_start is None:
+                    run_start = code
+            elif run_start is not None:
+                ranges.append((run_start, code - 1))
+                run_start = None
+        if run_start is not None:
+            ranges.append((run_start, end))
+    return ranges
+
+
+def _cmap_format12(data: bytes, offset: int) -> List[Tuple[int, int]]:
+    """解析格式12子表（分组映射）"""
+    num_groups = struct.unpack_from('>L', data, offset + 12)[0]
+    ranges = []
+    for i in range(num_groups):
+        start, end, start_glyph = struct.unpack_from('>LLL', data, offset + 16 + 12 * i)
+        if start_glyph == 0:
+            start += 1
+        if start <= end:
+            ranges.append((start, min(end, 0x10FFFF)))
+    return ranges
+
+
+def ranges_to_bitmap(ranges: Iterable[Tuple[int, int]]) -> bytearray:
+    """
+    将码位范围转换为位图（第 cp 位表示码位 cp 是否有字形）
+
+    Args:
+        ranges: 码位范围列表（包含两端）
+
+    Returns:
+        bytearray: 位图
+    """
+    ranges = list(ranges)
+    bitmap = bytearray((max((end for _, end in ranges), default=-1) >> 3) + 1)
+    for start, end in ranges:
+        # 两端不足一个字节的部分逐位设置，中间整字节填充
+        while start <= end and start & 7:
+            bitmap[start >> 3] |= 1 << (start & 7)
+            start += 1
+        while end >= start and (end & 7) != 7:
+            bitmap[end >> 3] |= 1 << (end & 7)
+            end -= 1
+        if start <= end:
+            bitmap[start >> 3:(end >> 3) + 1] = b'\xff' * ((end >> 3) - (start >> 3) + 1)
+    return bitmap
+
+
+def _encode_bitmap(bitmap: bytes) -> str:
+    """位图压缩后编码为字符串，用于保存在索引中"""
+    return base64.b64encode(zlib.compress(bytes(bitmap), 9)).decode('ascii')
+
+
+def _decode_bitmap(data: str) -> bytes:
+    """解码索引中保存的位图"""
+    return zlib.decompress(base64.b64decode(data))
+
+
+def _is_ignorable(char: str) -> bool:
+    """不需要字形的字符：空白、控制字符和格式字符（如零宽连接符）"""
+    return char.isspace() or unicodedata.category(char) in ('Cc', 'Cf')
+
+
+class FontCoverage:
+    """
+    字体的字符覆盖范围
+
+    检查过的字符分别记录在“有字形”和“缺字”两个集合中，
+    之后的检查只需对新出现的字符查询位图，其余都是集合运算
+    """
+
+    def __init__(self, family: str, bitmap: bytes):
+        """
+        Args:
+            family: 字体族名
+            bitmap: 码位位图
+        """
+        self.family = family
+        self._bitmap = bitmap
+        self._checked: Set[str] = set()
+        self._missing: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _has_glyph(self, char: str) -> bool:
+        """查询单个字符是否有字形"""
+        code = ord(char)
+        index = code >> 3
+        return index < len(self._bitmap) and bool(self._bitmap[index] & (1 << (code & 7)))
+
+    def _check_new(self, chars: Set[str]):
+        """检查尚未查询过的字符"""
+        with self._lock:
+            for char in chars - self._checked:
+                if not _is_ignorable(char) and not self._has_glyph(char):
+                    self._missing.add(char)
+                self._checked.add(char)
+
+    def missing(self, text: str) -> str:
+        """
+        获取文本中字体缺少的字符
+
+        Args:
+            text: 文本
+
+        Returns:
+            str: 缺少的字符（按首次出现的顺序，不重复），全部支持时为空字符串
+        """
+        chars = set(text)
+        if not chars <= self._checked:
+            self._check_new(chars)
+        if self._missing.isdisjoint(chars):
+            return ""
+        return "".join(char for char in dict.fromkeys(text) if char in self._missing)
+
+    def supports(self, text: str) -> bool:
+        """字体是否包含文本中所有字符的字形"""
+        return not self.missing(text)
+
+
+class SystemFontCoverage(FontCoverage):
+    """系统字体的字符覆盖范围（没有字体文件，逐个字符向Qt查询并记住结果）"""
+
+    def __init__(self, family: str):
+        super().__init__(family, b'')
+        self._raw_font = QRawFont.fromFont(QFont(family))
+
+    def _has_glyph(self, char: str) -> bool:
+        return self._raw_font.isValid() and self._raw_font.supportsCharacter(ord(char))
+
+
+@dataclass
+class CoverageReport:
+    """一批文本的字符覆盖检查结果"""
+
+    font_family: str
+    fallback_family: str = ""
+    total: int = 0
+    missing: List[Tuple[int, str]] = field(default_factory=list)  # (文本索引, 主字体缺少的字符)
+    unresolved: List[Tuple[int, str]] = field(default_factory=list)  # (文本索引, 备用字体也缺少的字符)
+    canceled: bool = False
+
+    @property
+    def fallback_count(self) -> int:
+        """改用备用字体的文本条数"""
+        return len(self.missing) - len(self.unresolved) if self.fallback_family else 0
+
+    def missing_chars(self) -> str:
+        """主字体缺少的所有字符（不重复）"""
+        return "".join(dict.fromkeys(char for _, chars in self.missing for char in chars))
+
+    def summary(self, limit: int = 10) -> str:
+        """
+        生成可读的检查结果
+
+        Args:
+            limit: 最多列出的文本条数
+
+        Returns:
+            str: 检查结果
+        """
+        checked = f"已检查 {self.total} 条文本（已取消）" if self.canceled else f"共 {self.total} 条文本"
+        if not self.missing:
+            if self.canceled:
+                return f"{checked}，未发现字体 {self.font_family} 缺少的字符"
+            return f"{checked}，字体 {self.font_family} 包含所有字符"
+
+        lines = [
+            f"{checked}，其中 {len(self.missing)} 条包含字体 {self.font_family} 缺少的字符：",
+            f"缺少的字符：{self.missing_chars()}",
+        ]
+        if self.fallback_family:
+            lines.append(f"{self.fallback_count} 条将使用备用字体 {self.fallback_family}")
+        problems = self.unresolved if self.fallback_family else self.missing
+        if problems:
+            lines.append(f"{len(problems)} 条仍会显示为方框：")
+            for index, chars in problems[:limit]:
+                lines.append(f"  第 {index + 1} 条：{chars}")
+            if len(problems) > limit:
+                lines.append(f"  ……等 {len(problems)} 条")
+        return "\n".join(lines)
+
+
+@dataclass
+class FontRecord:
+    """字体索引中的一条记录（对应一个字体文件）"""
+
+    size: int
+    mtime_ns: int
+    families: List[str] = field(default_factory=list)  # 字体族名（含旧式族名，如 "Lato Light"）
+    style: str = ""
+    writing_systems: List[str] = field(default_factory=list)  # 支持的书写系统
+    coverage: str = ""  # 码位位图（zlib压缩后base64编码）
+
+    @property
+    def signature(self) -> Tuple[int, int]:
+        """文件签名"""
+        return self.size, self.mtime_ns
+
+
+def parse_font_file(path: str) -> FontRecord:
+    """
+    解析字体文件（不注册到字体数据库，可在任意线程调用）
+
+    Args:
+        path: 字体文件路径
+
+    Returns:
+        FontRecord: 字体记录
+
+    Raises:
+        ValueError: 字体文件无效
+    """
+    size, mtime_ns = _file_signature(path)
+    with open(path, 'rb') as f:
+        tables = read_font_tables(f)
+        names = _read_names(f, tables)
+        coverage = _encode_bitmap(ranges_to_bitmap(_cmap_ranges(f, tables)))
+
+    families = []
+    for name_id in (_NAME_TYPOGRAPHIC_FAMILY, _NAME_FAMILY):
+        family = names.get(name_id)
+        if family and family not in families:
+            families.append(family)
+    if not families:
+        raise ValueError("字体文件中没有字体族名")
+    style = names.get(_NAME_TYPOGRAPHIC_SUBFAMILY) or names.get(_NAME_SUBFAMILY, "")
+
+    raw_font = QRawFont(path, 12)
+    writing_systems = [ws.name for ws in raw_font.supportedWritingSystems()] if raw_font.isValid() else []
+    return FontRecord(size, mtime_ns, families, style, writing_systems, coverage)
+
+
 class FontManager:
     """字体管理器"""
-    
-    def __init__(self):
-        """初始化字体管理器"""
-        pass 
\ No newline at end of file
+
+    def __init__(self, fonts_dir: Optional[str] = None):
+        """
+        初始化字体管理器（读取字体索引，不解析字体文件）
+
+        Args:
+            fonts_dir: 自定义字体目录，默认为当前目录下的 fonts
+        """
+        self.fonts_dir: str = fonts_dir or os.path.join(os.getcwd(), "fonts")
+        self.index_path: str = os.path.join(self.fonts_dir, INDEX_NAME)
+        self.records: Dict[str, FontRecord] = {}  # 字体文件名 → 字体记录
+        self._scanned = False
+        self._coverage: Dict[str, FontCoverage] = {}  # 字体族名 → 字符覆盖范围
+        self._lock = threading.RLock()
+        self._load_index()
+
+    def _load_index(self):
+        """读取索引文件，格式不符时忽略（之后重建）"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return
+            self.records = {name: FontRecord(**record) for name, record in data['fonts'].items()}
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"字体索引无效，将重建: {str(e)}")
+
+    def _save_index(self):
+        """写入索引文件（先写临时文件再改名）"""
+        data = {
+            'version': INDEX_VERSION,
+            'fonts': {name: asdict(record) for name, record in sorted(self.records.items())},
+        }
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            logger.warning(f"无法保存字体索引: {str(e)}")
+
+    def scan(self) -> bool:
+        """
+        扫描字体目录，只解析新增或变化的字体文件，并删除已不存在的文件的记录
+
+        Returns:
+            bool: 索引是否有变化
+        """
+        with self._lock:
+            changed = self._scan()
+            if changed:
+                self._coverage.clear()
+            return changed
+
+    def _scan(self) -> bool:
+        """扫描字体目录（调用方持有锁）"""
+        self._scanned = True
+        if not os.path.isdir(self.fonts_dir):
+            changed = bool(self.records)
+            self.records = {}
+            return changed
+
+        changed = False
+        present = set()
+        for file in sorted(os.listdir(self.fonts_dir)):
+            if not file.lower().endswith(FONT_EXTENSIONS):
+                continue
+            present.add(file)
+            font_path = os.path.join(self.fonts_dir, file)
+            try:
+                record = self.records.get(file)
+                if record is not None and record.signature == _file_signature(font_path):
+                    continue
+                self.records[file] = parse_font_file(font_path)
+                logger.debug(f"已索引字体文件: {file} {self.records[file].families}")
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"无法读取字体文件 {file}: {str(e)}")
+                self.records.pop(file, None)
+            changed = True
+
+        for file in set(self.records) - present:
+            del self.records[file]
+            changed = True
+
+        if changed:
+            self._save_index()
+        return changed
+
+    def _ensure_scanned(self):
+        """第一次查询时扫描字体目录"""
+        with self._lock:
+            if not self._scanned:
+                self.scan()
+
+    def families(self) -> List[str]:
+        """
+        获取所有自定义字体族名（来自索引，不注册字体）
+
+        Returns:
+            List[str]: 排序后的字体族名
+        """
+        self._ensure_scanned()
+        return sorted({family for record in self.records.values() for family in record.families})
+
+    def styles(self, family: str) -> List[str]:
+        """获取自定义字体族的所有样式名"""
+        self._ensure_scanned()
+        return sorted({record.style for record in self.records.values() if family in record.families})
+
+    def font_files(self, family: str) -> List[str]:
+        """
+        获取字体族对应的字体文件
+
+        Args:
+            family: 字体族名
+
+        Returns:
+            List[str]: 字体文件路径（不是自定义字体时为空）
+        """
+        self._ensure_scanned()
+        return [
+            os.path.join(self.fonts_dir, file)
+            for file, record in sorted(self.records.items()) if family in record.families
+        ]
+
+    def _register_file(self, font_path: str, record: FontRecord) -> bool:
+        """注册一个字体文件（已注册且文件未变化时跳过，文件变化时先移除旧的注册）"""
+        with _registered_lock:
+            registered = _registered_fonts.get(font_path)
+            if registered is not None:
+                if registered[0] == record.signature:
+                    return True
+                QFontDatabase.removeApplicationFont(registered[1])
+                del _registered_fonts[font_path]
+
+            font_id = QFontDatabase.addApplicationFont(font_path)
+            if font_id == -1:
+                logger.warning(f"无法加载字体文件: {os.path.basename(font_path)}")
+                return False
+            _registered_fonts[font_path] = (record.signature, font_id)
+            return True
+
+    def register_family(self, family: str) -> bool:
+        """
+        将字体族注册到Qt字体数据库（需要已创建QGuiApplication，应在GUI线程调用）
+
+        Args:
+            family: 字体族名
+
+        Returns:
+            bool: 是自定义字体且注册成功
+        """
+        self._ensure_scanned()
+        registered = False
+        for file, record in sorted(self.records.items()):
+            if family in record.families:
+                registered = self._register_file(os.path.join(self.fonts_dir, file), record) or registered
+        if registered:
+            logger.debug(f"已注册自定义字体: {family}")
+        return registered
+
+    def unregister_stale(self):
+        """移除已删除或已变化的字体文件的注册"""
+        with _registered_lock:
+            for font_path, (signature, font_id) in list(_registered_fonts.items()):
+                if os.path.dirname(font_path) != self.fonts_dir:
+                    continue
+                record = self.records.get(os.path.basename(font_path))
+                if record is None or record.signature != signature:
+                    QFontDatabase.removeApplicationFont(font_id)
+                    del _registered_fonts[font_path]
+
+    def coverage(self, family: str) -> FontCoverage:
+        """
+        获取字体族的字符覆盖范围（自定义字体来自索引，系统字体向Qt查询）
+
+        Args:
+            family: 字体族名
+
+        Returns:
+            FontCoverage: 字符覆盖范围
+        """
+        self._ensure_scanned()
+        with self._lock:
+            coverage = self._coverage.get(family)
+            if coverage is None:
+                records = [record for _, record in sorted(self.records.items())
+                           if family in record.families and record.coverage]
+                if records:
+                    # 同一字体族的多个文件（粗体、斜体等）取并集
+                    bitmaps = [_decode_bitmap(record.coverage) for record in records]
+                    merged = 0
+                    for bitmap in bitmaps:
+                        merged |= int.from_bytes(bitmap, 'little')
+                    size = max(len(bitmap) for bitmap in bitmaps)
+                    coverage = FontCoverage(family, merged.to_bytes(size, 'little'))
+                else:
+                    coverage = SystemFontCoverage(family)
+                self._coverage[family] = coverage
+            return coverage
+
+    def select_family(self, text: str, family: str, fallback_family: Optional[str] = None) -> str:
+        """
+        为文本选择字体：主字体缺少文本中的字符时改用备用字体
+
+        Args:
+            text: 文本
+            family: 主字体族名
+            fallback_family: 备用字体族名，为空时总是使用主字体
+
+        Returns:
+            str: 应使用的字体族名
+        """
+        if not fallback_family or fallback_family == family:
+            return family
+        if self.coverage(family).supports(text):
+            return family
+        return fallback_family
+
+    def coverage_report(self, texts: Iterable, family: str,
+                        fallback_family: Optional[str] = None,
+                        progress_callback: Optional[Callable[[int], None]] = None,
+                        cancel_callback: Optional[Callable[[], bool]] = None) -> CoverageReport:
+        """
+        检查一批文本中字体缺少的字符（不渲染，可在任意线程调用）
+
+        Args:
+            texts: 文本列表
+            family: 主字体族名
+            fallback_family: 备用字体族名
+            progress_callback: 进度回调，参数为已检查条数
+            cancel_callback: 返回True时中止检查
+
+        Returns:
+            CoverageReport: 检查结果
+        """
+        if fallback_family == family:
+            fallback_family = None
+        primary = self.coverage(family)
+        fallback = self.coverage(fallback_family) if fallback_family else None
+        report = CoverageReport(family, fallback_family or "")
+
+        for index, text in enumerate(texts):
+            # 每1000条汇报一次进度、检查一次是否取消
+            if index % 1000 == 0:
+                if cancel_callback and cancel_callback():
+                    report.canceled = True
+                    break
+                if progress_callback:
+                    progress_callback(index)
+
+            text = str(text)
+            report.total += 1
+            missing = primary.missing(text)
+            if not missing:
+                continue
+            report.missing.append((index, missing))
+            if fallback is not None:
+                still_missing = fallback.missing(text)
+                if still_missing:
+                    report.unresolved.append((index, still_missing))
+
+        if progress_callback and not report.canceled:
+            progress_callback(report.total)
+        return report
+
+    def load_custom_fonts(self) -> List[str]:
+        """
+        注册字体目录中的所有自定义字体（需要已创建QGuiApplication）
+
+        Returns:
+            List[str]: 已注册的字体族名
+        """
+        families = [family for family in self.families() if self.register_family(family)]
+        logger.info(f"已加载 {len(families)} 个自定义字体族")
+        return families
+
+
+def get_font_manager(fonts_dir: Optional[str] = None) -> FontManager:
+    """
+    获取进程内共享的字体管理器（同一字体目录只读取一次索引）
+
+    Args:
+        fonts_dir: 自定义字体目录，默认为当前目录下的 fonts
+
+    Returns:
+        FontManager: 字体管理器
+    """
+    key = os.path.abspath(fonts_dir or os.path.join(os.getcwd(), "fonts"))
+    with _shared_lock:
+        manager = _shared_managers.get(key)
+        if manager is None:
+            manager = FontManager(key)
+            _shared_managers[key] = manager
+        return manager
+
+
+class CoverageCheckSignals(QObject):
+    """缺字检查信号（在GUI线程创建）"""
+
+    progress = Signal(int, int)  # 已检查条数，总数
+    finished = Signal(object)  # CoverageReport
+    failed = Signal(str)  # 错误信息
+
+
+class CoverageCheckWorker(QRunnable):
+    """后台缺字检查任务"""
+
+    def __init__(self, texts, family: str, fallback_family: Optional[str] = None,
+                 fonts_dir: Optional[str] = None):
+        """
+        初始化缺字检查任务
+
+        Args:
+            texts: 文本列表（在创建时复制）
+            family: 主字体族名
+            fallback_family: 备用字体族名
+            fonts_dir: 自定义字体目录
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = CoverageCheckSignals()
+        self.texts = texts.copy() if hasattr(texts, 'copy') else list(texts)
+        self.family = family
+        self.fallback_family = fallback_family
+        self.fonts_dir = fonts_dir
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消检查（可在任意线程调用）"""
+        self._cancel_event.set()
+
+    def run(self):
+        """执行缺字检查（在线程池线程中运行）"""
+        total = len(self.texts)
+        try:
+            report = get_font_manager(self.fonts_dir).coverage_report(
+                self.texts,
+                self.family,
+                self.fallback_family,
+                progress_callback=lambda done: self.signals.progress.emit(done, total),
+                cancel_callback=self._cancel_event.is_set
+            )
+            logger.info(f"缺字检查：{len(report.missing)}/{report.total} 条缺字，"
+                        f"{len(report.unresolved)} 条备用字体也无法显示")
+            self.signals.finished.emit(report)
+        except Exception as e:
+            logger.error(f"缺字检查失败: {str(e)}")
+            self.signals.failed.emit(str(e))
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+图片编码模块
+导出时按 渲染 → 编码 → 写入 三个阶段流水线执行：
+渲染在调用线程中进行，编码在线程池中进行，写入由单独的线程完成，
+各阶段之间用有界队列连接，内存占用不会随导出数量增长
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage, QImageWriter
+
+from .stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# 正在写入的导出文件的后缀（写完后改名为正式文件名）
+PARTIAL_SUFFIX = ".part"
+
+# 导出文件的最小大小（字节）：最小的合法 JPEG/PNG/WebP 图片也大于该值，
+# 更小的文件（例如断电后留下的空文件）视为没有导出
+MIN_IMAGE_BYTES = 64
+
+# 支持的导出格式及文件扩展名
+FORMAT_EXTENSIONS = {
+    'JPEG': 'jpg',
+    'PNG': 'png',
+    'WEBP': 'webp',
+}
+
+
+def available_formats() -> List[str]:
+    """
+    获取当前Qt环境中可用的导出格式（WebP 需要 Qt 图片格式插件）
+
+    Returns:
+        List[str]: 格式名称列表
+    """
+    supported = {bytes(fmt).decode().upper() for fmt in QImageWriter.supportedImageFormats()}
+    return [fmt for fmt in FORMAT_EXTENSIONS if fmt in supported]
+
+
+# 排版使用背景像素作为坐标（1像素对应1磅，即72 DPI）
+LAYOUT_DPI = 72
+
+# 没有指定输出尺寸时的输出分辨率倍数（背景的2倍，即144 DPI）
+DEFAULT_SCALE = 2
+
+# 每英寸对应的米数（QImage 以每米点数记录分辨率）
+METERS_PER_INCH = 0.0254
+
+
+def default_encoder_threads() -> int:
+    """默认编码线程数：CPU核心数，最多4个"""
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+@dataclass(frozen=True)
+class EncodeOptions:
+    """
+    导出图片的编码和分辨率设置
+
+    quality 对 JPEG/WebP 为压缩质量（WebP 为100时无损）；PNG 始终无损，
+    quality 只影响压缩级别。optimize 对 JPEG 生成优化的哈夫曼表，对 PNG 使用最高压缩级别
+
+    输出尺寸：指定 width/height 时使用该像素尺寸（只指定一个时按背景比例计算另一个）；
+    否则指定 dpi 时按背景每像素1磅（72 DPI）换算；都不指定时为背景的2倍。
+    dpi 同时写入图片文件
+    """
+
+    format: str = 'JPEG'
+    quality: int = 85
+    optimize: bool = False
+    width: int = 0  # 输出宽度（像素），0 表示不指定
+    height: int = 0  # 输出高度（像素），0 表示不指定
+    dpi: int = 0  # 输出分辨率（DPI），0 表示不指定
+
+    def __post_init__(self):
+        if self.format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"不支持的导出格式：{self.format}")
+        if not 0 <= self.quality <= 100:
+            raise ValueError(f"压缩质量必须在0到100之间：{self.quality}")
+        if self.width < 0 or self.height < 0 or self.dpi < 0:
+            raise ValueError(f"输出尺寸和DPI不能为负数：{self.width}x{self.height}，{self.dpi} DPI")
+
+    def output_size(self, bg_width: int, bg_height: int) -> Tuple[int, int]:
+        """
+        计算输出图片的像素尺寸
+
+        Args:
+            bg_width: 背景宽度
+            bg_height: 背景高度
+
+        Returns:
+            Tuple[int, int]: (宽度, 高度)
+        """
+        if self.width and self.height:
+            return self.width, self.height
+        if self.width:
+            return self.width, max(1, round(bg_height * self.width / bg_width))
+        if self.height:
+            return max(1, round(bg_width * self.height / bg_height)), self.height
+        scale = self.dpi / LAYOUT_DPI if self.dpi else DEFAULT_SCALE
+        return max(1, round(bg_width * scale)), max(1, round(bg_height * scale))
+
+    @property
+    def dots_per_meter(self) -> int:
+        """写入图片的每米点数，未指定 DPI 时为0"""
+        return round(self.dpi / METERS_PER_INCH) if self.dpi else 0
+
+    @property
+    def extension(self) -> str:
+        """文件扩展名"""
+        return FORMAT_EXTENSIONS[self.format]
+
+    def to_dict(self) -> Dict:
+        """转换为可序列化的字典"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'EncodeOptions':
+        """从字典创建，缺省项使用默认值"""
+        return cls(**data) if data else cls()
+
+
+def encode_image(image: QImage, options: EncodeOptions) -> bytes:
+    """
+    将图片编码为字节（可在任意线程调用）
+
+    Args:
+        image: 图片
+        options: 编码设置
+
+    Returns:
+        bytes: 编码后的数据
+
+    Raises:
+        RuntimeError: 编码失败
+    """
+    dots = options.dots_per_meter
+    if dots and (image.dotsPerMeterX() != dots or image.dotsPerMeterY() != dots):
+        # 复制后再修改，不改变调用方的图片（流水线的缓冲区创建时已设置好，不会复制）
+        image = QImage(image)
+        image.setDotsPerMeterX(dots)
+        image.setDotsPerMeterY(dots)
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+
+    writer = QImageWriter(buffer, options.format.encode('ascii'))
+    if options.format == 'PNG':
+        # Qt 的 PNG 编码器中质量越低压缩级别越高
+        writer.setQuality(0 if options.optimize else 100 - options.quality)
+    else:
+        writer.setQuality(options.quality)
+        writer.setOptimizedWrite(options.optimize)
+
+    if not writer.write(image):
+        raise RuntimeError(f"图片编码失败：{writer.errorString()}")
+    buffer.close()
+    return bytes(data)
+
+
+def write_file_atomic(path: str, data: bytes):
+    """
+    写入文件：先写临时文件、同步到磁盘后再改名，中途崩溃或断电都不会留下不完整的文件
+
+    文件改名后才会记入进度日志，因此进度日志中的文件内容一定已经写入磁盘
+
+    Args:
+        path: 文件路径
+        data: 文件内容
+    """
+    temp_path = path + PARTIAL_SUFFIX
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class EncodePipeline:
+    """
+    编码写入流水线
+
+    渲染线程从缓冲池取出图像缓冲区，渲染后交给编码线程池；编码完成后缓冲区
+    立即归还，编码结果放入有界的写入队列，由写入线程保存。缓冲池大小
+    限制了同时处于编码中的图片数量，渲染比编码快时渲染线程会在 acquire 处等待
+    """
+
+    def __init__(self, width: int, height: int, options: EncodeOptions,
+                 encoder_threads: Optional[int] = None, buffer_count: Optional[int] = None,
+                 on_written: Optional[Callable[[int], None]] = None,
+                 timer: Optional[StageTimer] = None):
+        """
+        初始化流水线
+
+        Args:
+            width: 图像宽度
+            height: 图像高度
+            options: 编码设置
+            encoder_threads: 编码线程数，为None时使用 default_encoder_threads
+            buffer_count: 图像缓冲区数量，为None时为编码线程数+1
+            on_written: 每写入一个文件后调用（在写入线程中），参数为文本索引
+            timer: 记录编码和写入耗时的阶段计时器
+        """
+        self.options = options
+        self.encoder_threads = encoder_threads or default_encoder_threads()
+        self.buffer_count = buffer_count or self.encoder_threads + 1
+        self.on_written = on_written
+        self.timer = timer
+        self.written = 0
+
+        # 导出图片始终不透明（透明背景先填充白色），使用不带透明通道的格式，
+        # PNG 编码更快、文件更小
+        self._free: "queue.Queue[QImage]" = queue.Queue()
+        for _ in range(self.buffer_count):
+            image = QImage(width, height, QImage.Format_RGB32)
+            if options.dots_per_meter:
+                image.setDotsPerMeterX(options.dots_per_meter)
+                image.setDotsPerMeterY(options.dots_per_meter)
+            self._free.put(image)
+
+        self._encoder = ThreadPoolExecutor(self.encoder_threads, thread_name_prefix="encoder")
+        self._write_queue: queue.Queue = queue.Queue(maxsize=self.buffer_count)
+        self._writer = threading.Thread(target=self._write_loop, name="writer", daemon=True)
+        self._writer.start()
+
+    def acquire(self) -> QImage:
+        """取出一个空闲的图像缓冲区（没有空闲缓冲区时等待编码完成）"""
+        return self._free.get()
+
+    def release(self, image: QImage):
+        """归还未提交的图像缓冲区（例如渲染失败时）"""
+        self._free.put(image)
+
+    def submit(self, index: int, image: QImage, path: str):
+        """
+        提交渲染好的图片进行编码和写入
+
+        Args:
+            index: 文本索引
+            image: 由 acquire 取得的图像缓冲区
+            path: 输出文件路径
+        """
+        self._encoder.submit(self._encode, index, image, path)
+
+    def _encode(self, index: int, image: QImage, path: str):
+        """编码一张图片（在编码线程中运行）"""
+        start = time.perf_counter()
+        try:
+            data = encode_image(image, self.options)
+        except Exception as e:
+            logger.error(f"导出图片 {index + 1} 失败: {str(e)}")
+            return
+        finally:
+            self._free.put(image)
+        if self.timer:
+            self.timer.add('encode', time.perf_counter() - start)
+        self._write_queue.put((index, path, data))
+
+    def _write_loop(self):
+        """依次写入编码结果（在写入线程中运行）"""
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            index, path, data = item
+            start = time.perf_counter()
+            try:
+                write_file_atomic(path, data)
+                if self.timer:
+                    self.timer.add('write', time.perf_counter() - start)
+                self.written += 1
+                if self.on_written:
+                    self.on_written(index)
+            except Exception as e:
+                logger.error(f"导出图片 {index + 1} 失败: {str(e)}")
+
+    def close(self):
+        """等待所有已提交的图片编码和写入完成"""
+        self._encoder.shutdown(wait=True)
+        self._write_queue.put(None)
+        self._writer.join()
+
+    def __enter__(self) -> 'EncodePipeline':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -6,9 +6,761 @@
 负责图片的加载、处理和渲染
 """
 
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Sequence, Tuple, Union
+
+from PySide6.QtCore import QRect, QSize, Qt
+from PySide6.QtGui import (
+    QColor, QFont, QImage, QPainter, QTextBlockFormat,
+    QTextCharFormat, QTextCursor, QTextDocument
+)
+
+from .image_encoder import (
+    DEFAULT_SCALE, EncodeOptions, EncodePipeline, default_encoder_threads, encode_image
+)
+from .font_manager import get_font_manager
+from .layout_cache import get_layout_cache
+from .memory_budget import format_size, get_memory_budget, image_bytes
+from .stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# 渲染引擎版本：渲染结果会因代码改动而变化时加1，使增量导出的旧结果失效
+ENGINE_VERSION = 1
+
+# 自动字号排版版本：只有自动字号的渲染结果变化时加1，不影响固定字号的导出
+AUTO_FIT_VERSION = 2
+
+# 默认样式配置，与样式设计页面保持一致
+DEFAULT_STYLE_CONFIG = {
+    'font_family': 'Arial',
+    'fallback_family': '',  # 主字体缺少文本中的字符时使用的备用字体
+    'font_size': 24,
+    'text_color': '#000000',
+    'line_spacing': 1.5,
+    'margin_top': 50,
+    'margin_bottom': 50,
+    'margin_left': 50,
+    'margin_right': 50,
+    'center_horizontally': True,
+    'center_vertically': True,
+    'auto_fit': False,  # 为True时每条文本使用能放入边距内的最大字号（忽略 font_size）
+    'min_font_size': 12,  # 自动字号的范围
+    'max_font_size': 72
+}
+
+# 只在开启自动字号时影响渲染结果的样式项
+AUTO_FIT_KEYS = ('auto_fit', 'min_font_size', 'max_font_size')
+
+
+def create_export_dir(output_root: str) -> str:
+    """
+    在输出目录下创建本次导出的时间戳子文件夹
+
+    Args:
+        output_root: 输出根目录
+
+    Returns:
+        str: 新建的导出目录路径
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    export_dir = os.path.join(output_root, f"export_{timestamp}")
+    os.makedirs(export_dir, exist_ok=True)
+    return export_dir
+
+
+def serialize_style_config(style_config: Dict) -> Dict:
+    """
+    将样式配置转换为可序列化（可跨进程传递）的形式
+
+    Args:
+        style_config: 样式配置，text_color 可以是 QColor 或颜色字符串
+
+    Returns:
+        Dict: text_color 转换为 #AARRGGBB 字符串后的样式配置
+    """
+    config = dict(style_config)
+    config['text_color'] = QColor(config['text_color']).name(QColor.HexArgb)
+    return config
+
+
+def export_file_name(index: int, extension: str = "jpg") -> str:
+    """
+    获取第 index 条文本（从0开始）对应的导出文件名
+
+    Args:
+        index: 文本索引
+        extension: 文件扩展名（由导出格式决定）
+
+    Returns:
+        str: 文件名
+    """
+    return f"导出图片_{index + 1}.{extension}"
+
+
+# 超采样倍数上限
+MAX_SUPERSAMPLE = 2
+
+
+def render_memory(width: int, height: int, supersample: int = 1, buffers: int = 1) -> int:
+    """
+    估计一次导出占用的图像内存
+
+    Args:
+        width: 输出宽度
+        height: 输出高度
+        supersample: 超采样倍数
+        buffers: 输出尺寸的缓冲区数量
+
+    Returns:
+        int: 字节数（缩放后的背景、超采样渲染缓冲区和输出缓冲区）
+    """
+    render = image_bytes(width * supersample, height * supersample)
+    return render * (2 if supersample > 1 else 1) + buffers * image_bytes(width, height)
+
+
+def choose_supersample(bg_width: int, bg_height: int, width: int, height: int,
+                       memory_limit: Optional[int] = None) -> int:
+    """
+    选择超采样倍数
+
+    排版以背景像素为坐标，输出不小于背景时直接按输出尺寸绘制矢量文字已经足够清晰，
+    超采样只会增加内存和耗时；输出小于背景时文字以很小的像素尺寸绘制，
+    先按2倍尺寸渲染再平滑缩小，字形更接近预览。内存预算放不下时不超采样
+
+    Args:
+        bg_width: 背景宽度
+        bg_height: 背景高度
+        width: 输出宽度
+        height: 输出高度
+        memory_limit: 内存上限（字节），为None时不限制
+
+    Returns:
+        int: 超采样倍数（1 表示不超采样）
+    """
+    scale = min(width / bg_width, height / bg_height)
+    factor = 1
+    while factor < MAX_SUPERSAMPLE and scale * factor < 1:
+        factor += 1
+    while factor > 1 and memory_limit is not None and render_memory(width, height, factor) > memory_limit:
+        factor -= 1
+    return factor
+
+
+class TextBox(NamedTuple):
+    """文本块在背景坐标系中的排版结果"""
+
+    font_size: int  # 实际使用的字号（磅）
+    x: float
+    y: float
+    width: float  # 换行后的最大行宽
+    height: float  # 文档高度
+
+
+class RenderPlan:
+    """
+    渲染计划：一批导出中不随文本变化的准备工作
+
+    背景图片只解码、缩放一次，字体和文本格式只创建一次，
+    目标图像缓冲区在各条文本之间复用
+    """
+
+    def __init__(self, background: Union[QImage, QSize], style_config: Dict,
+                 font_scale: float = 1.0, scale_factor: int = DEFAULT_SCALE,
+                 fonts_dir: Optional[str] = None, timer: Optional[StageTimer] = None,
+                 output_size: Optional[Tuple[int, int]] = None, memory_limit: Optional[int] = None):
+        """
+        准备渲染计划
+
+        Args:
+            background: 背景图片；只排版不绘制时（排版检查）可以只传入背景尺寸
+            style_config: 样式配置
+            font_scale: 字体缩放比例
+            scale_factor: 输出分辨率倍数（没有指定 output_size 时使用）
+            fonts_dir: 自定义字体目录（用于检查字符覆盖范围）
+            timer: 记录缩放、排版和绘制耗时的阶段计时器
+            output_size: 输出图片的像素尺寸 (宽, 高)，为None时为背景尺寸 × scale_factor
+            memory_limit: 内存上限（字节），超采样放不下时不超采样
+        """
+        self.timer = timer
+        self.style_config = dict(style_config)
+        self.scale_factor = scale_factor
+        self.bg_width = background.width()
+        self.bg_height = background.height()
+        if output_size:
+            self.width, self.height = output_size
+        else:
+            self.width = self.bg_width * scale_factor
+            self.height = self.bg_height * scale_factor
+
+        # 超采样：按 supersample 倍的输出尺寸渲染，再平滑缩小到输出尺寸
+        self.supersample = 1
+        if isinstance(background, QImage):
+            self.supersample = choose_supersample(self.bg_width, self.bg_height,
+                                                  self.width, self.height, memory_limit)
+        self.render_width = self.width * self.supersample
+        self.render_height = self.height * self.supersample
+        self.scale_x = self.render_width / self.bg_width
+        self.scale_y = self.render_height / self.bg_height
+        self.memory_bytes = render_memory(self.width, self.height, self.supersample, buffers=0)
+
+        # 背景预先缩放到渲染尺寸，之后每条文本只需直接复制；
+        # 不透明背景使用不带透明通道的格式，复制时不需要混合
+        self.background: Optional[QImage] = None
+        self.opaque = True
+        if isinstance(background, QImage):
+            start = time.perf_counter()
+            self.opaque = not background.hasAlphaChannel()
+            self.background = background.scaled(
+                self.render_width,
+                self.render_height,
+                Qt.IgnoreAspectRatio,
+                Qt.SmoothTransformation
+            ).convertToFormat(QImage.Format_RGB32 if self.opaque else QImage.Format_ARGB32_Premultiplied)
+            if timer:
+                timer.add('scale', time.perf_counter() - start)
+
+        # 根据预览比例调整字体大小
+        self.font = QFont(self.style_config['font_family'])
+        self.font.setPointSize(int(self.style_config['font_size'] * font_scale))
+
+        # 备用字体：主字体缺少文本中的字符时整条文本改用备用字体
+        self.font_manager = get_font_manager(fonts_dir)
+        self.fallback_family = self.style_config.get('fallback_family') or ''
+        self.fallback_font = QFont(self.fallback_family) if self.fallback_family else None
+        if self.fallback_font is not None:
+            self.fallback_font.setPointSize(self.font.pointSize())
+
+        # 设置文本宽度（使用原始图片尺寸计算）
+        self.available_width = self.bg_width - 2 * self.style_config['margin_left']
+
+        # 文本颜色
+        self.char_format = QTextCharFormat()
+        self.char_format.setForeground(QColor(self.style_config['text_color']))
+
+        # 行间距（百分比行高）
+        self.spacing = float(self.style_config['line_spacing'])
+        self.block_format = QTextBlockFormat()
+        self.block_format.setLineHeight(int(self.spacing * 100), 1)
+
+        # 行宽测量结果在预览和各次导出之间共享
+        self.layout_cache = get_layout_cache()
+
+        # 自动字号：在边距内的文本区域中查找每条文本能使用的最大字号
+        self.auto_fit = bool(self.style_config.get('auto_fit'))
+        self.min_font_size = max(1, int(self.style_config.get('min_font_size', 12) * font_scale))
+        self.max_font_size = max(self.min_font_size, int(self.style_config.get('max_font_size', 72) * font_scale))
+        self.available_height = (self.bg_height - self.style_config['margin_top']
+                                 - self.style_config['margin_bottom'])
+        self.fit_width = (self.bg_width - self.style_config['margin_left']
+                          - self.style_config['margin_right'])
+
+        # 换行宽度：自动字号在左右边距之间的文本区域内换行（与预览一致），
+        # 固定字号保持原有的换行宽度，以免已导出的图片发生变化
+        self.layout_width = self.fit_width if self.auto_fit else self.available_width
+        self._sized_fonts: Dict[Tuple[str, int], QFont] = {}
+
+        # 复用的目标缓冲区和超采样渲染缓冲区（输出始终不透明）
+        self._buffer: Optional[QImage] = None
+        self._canvas: Optional[QImage] = None
+
+    def acquire_buffer(self) -> QImage:
+        """获取复用的目标图像缓冲区"""
+        if self._buffer is None:
+            self._buffer = QImage(self.width, self.height, QImage.Format_RGB32)
+        return self._buffer
+
+    def _render_canvas(self, image: QImage) -> QImage:
+        """获取绘制用的画布：不超采样时直接绘制到目标缓冲区"""
+        if self.supersample == 1:
+            return image
+        if self._canvas is None:
+            self._canvas = QImage(self.render_width, self.render_height, QImage.Format_RGB32)
+        return self._canvas
+
+    def font_for(self, text: str) -> QFont:
+        """选择文本使用的字体（主字体缺字时使用备用字体，开启自动字号时使用查找到的字号）"""
+        font = self.font
+        if self.fallback_font is not None:
+            family = self.font_manager.select_family(text, self.style_config['font_family'], self.fallback_family)
+            if family == self.fallback_family:
+                font = self.fallback_font
+        return self.fit_font(text, font) if self.auto_fit else font
+
+    def fit_font(self, text: str, font: QFont) -> QFont:
+        """
+        获取文本能放入边距内的最大字号的字体
+
+        Args:
+            text: 文本内容
+            font: 基础字体（字号会被替换）
+
+        Returns:
+            QFont: 指定字号的字体（同一字体族和字号的字体对象会复用）
+        """
+        size = self.layout_cache.fit_font_size(
+            text, font, self.fit_width, self.available_height,
+            self.min_font_size, self.max_font_size, int(self.spacing * 100)
+        )
+        key = (font.family(), size)
+        sized = self._sized_fonts.get(key)
+        if sized is None:
+            sized = QFont(font)
+            sized.setPointSize(size)
+            self._sized_fonts[key] = sized
+        return sized
+
+    def create_document(self, text: str, font: Optional[QFont] = None) -> QTextDocument:
+        """创建已设置字体、宽度、颜色和行间距的文本文档"""
+        doc = QTextDocument()
+        doc.setDefaultFont(font or self.font)
+        doc.setTextWidth(self.layout_width)
+        doc.setPlainText(text)
+
+        cursor = QTextCursor(doc)
+        cursor.select(QTextCursor.Document)
+        cursor.mergeCharFormat(self.char_format)
+        cursor.mergeBlockFormat(self.block_format)
+        return doc
+
+    def measure_lines(self, text: str, font: Optional[QFont] = None) -> Tuple[float, int]:
+        """
+        测量每个段落不换行时的宽度
+
+        Returns:
+            Tuple[float, int]: (最大行宽, 行数)
+        """
+        widths = self.layout_cache.line_widths(text, font or self.font)
+        return max(widths, default=0.0), len(widths)
+
+    def text_position(self, text: str, doc: QTextDocument,
+                      font: Optional[QFont] = None) -> Tuple[float, float]:
+        """计算文本在背景坐标系中的绘制位置"""
+        return self.block_position(text, font or self.font, doc.idealWidth(), doc.size().height())
+
+    def block_position(self, text: str, font: QFont, block_width: float,
+                       text_height: float, line_widths: Optional[Tuple[float, ...]] = None) -> Tuple[float, float]:
+        """
+        根据换行后的文本块尺寸计算绘制位置
+
+        Args:
+            text: 文本内容
+            font: 文本使用的字体
+            block_width: 换行后的最大行宽
+            text_height: 文档高度
+            line_widths: 已测量的每个段落不换行时的宽度，为None时从排版缓存获取
+
+        Returns:
+            Tuple[float, float]: 文本块左上角在背景坐标系中的位置
+        """
+        if self.auto_fit:
+            return self.fitted_position(font, block_width, text_height)
+
+        style = self.style_config
+        if line_widths is None:
+            max_line_width, line_count = self.measure_lines(text, font)
+        else:
+            max_line_width, line_count = max(line_widths, default=0.0), len(line_widths)
+
+        # 使用最大行宽来计算居中位置，添加较小的左侧偏移以补偿标点符号
+        if style['center_horizontally']:
+            punctuation_compensation = font.pointSize() * 0.1
+            x = (self.bg_width - max_line_width) / 2 + punctuation_compensation
+        else:
+            x = style['margin_left']
+
+        # 优化垂直居中计算
+        line_height = text_height / line_count if line_count > 0 else text_height
+
+        if style['center_vertically']:
+            # 考虑行数和行高来计算垂直居中位置
+            total_spacing = (line_count - 1) * line_height * (self.spacing - 1)
+            y = (self.bg_height - text_height - total_spacing) / 2
+        else:
+            y = style['margin_top']
+
+        return x, y
+
+    def fitted_position(self, font: QFont, block_width: float, text_height: float) -> Tuple[float, float]:
+        """
+        计算自动字号时的绘制位置：在边距内的文本区域中居中换行后的文本块
+
+        自动字号按换行后的尺寸查找字号，位置也必须按同样的尺寸计算，
+        否则按段落原始宽度居中时长段落会移出画面
+        """
+        style = self.style_config
+        if style['center_horizontally']:
+            x = style['margin_left'] + (self.fit_width - block_width) / 2 + font.pointSize() * 0.1
+            # 标点补偿不能把文本块推出文本区域
+            x = max(style['margin_left'], min(x, style['margin_left'] + self.fit_width - block_width))
+        else:
+            x = style['margin_left']
+        if style['center_vertically']:
+            y = style['margin_top'] + max(0.0, (self.available_height - text_height) / 2)
+        else:
+            y = style['margin_top']
+        return x, y
+
+    def text_box(self, text: str) -> TextBox:
+        """
+        只排版不绘制：计算文本块的字号、位置和尺寸
+
+        尺寸来自共享的排版缓存，与 render 中实际绘制的文档一致
+
+        Args:
+            text: 文本内容
+
+        Returns:
+            TextBox: 排版结果
+        """
+        font = self.font_for(text)
+        line_height = int(self.spacing * 100)
+        if self.auto_fit:
+            width, height = self.layout_cache.document_size(text, font, self.layout_width, line_height)
+            x, y = self.fitted_position(font, width, height)
+        else:
+            # 固定字号的位置还需要段落不换行时的宽度，一次排版同时测量
+            layout = self.layout_cache.measure(text, font, self.layout_width, line_height)
+            width, height = layout.width, layout.height
+            x, y = self.block_position(text, font, width, height, layout.line_widths)
+        return TextBox(font.pointSize(), x, y, width, height)
+
+    def render(self, text: str, image: Optional[QImage] = None) -> QImage:
+        """
+        将文本渲染到复用缓冲区
+
+        Args:
+            text: 文本内容
+            image: 目标缓冲区（尺寸与输出相同），为None时使用渲染计划自己的缓冲区
+
+        Returns:
+            QImage: 目标缓冲区（下一次渲染时会被覆盖）
+
+        Raises:
+            RuntimeError: 无法创建画笔，或渲染计划只用于排版（没有背景图片）
+        """
+        if self.background is None:
+            raise RuntimeError("只用于排版的渲染计划不能绘制")
+
+        # 排版（不依赖画笔，先完成以便分别计时）
+        start = time.perf_counter()
+        font = self.font_for(text)
+        doc = self.create_document(text, font)
+        x, y = self.text_position(text, doc, font)
+        laid_out = time.perf_counter()
+
+        if image is None:
+            image = self.acquire_buffer()
+        canvas = self._render_canvas(image)
+        if not self.opaque:
+            canvas.fill(Qt.white)
+
+        painter = QPainter()
+        if not painter.begin(canvas):
+            raise RuntimeError("无法创建画笔")
+
+        try:
+            # 绘制背景：不透明背景直接覆盖上一条的内容
+            if self.opaque:
+                painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.drawImage(0, 0, self.background)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+
+            painter.setRenderHints(
+                QPainter.Antialiasing |
+                QPainter.TextAntialiasing |
+                QPainter.SmoothPixmapTransform
+            )
+
+            # 排版坐标（背景像素）缩放到渲染尺寸
+            painter.scale(self.scale_x, self.scale_y)
+
+            # 绘制文本
+            painter.translate(x, y)
+            doc.drawContents(painter)
+        finally:
+            # 确保正确结束绘制
+            painter.end()
+        painted = time.perf_counter()
+
+        if canvas is not image:
+            self.downsample(canvas, image)
+
+        if self.timer:
+            self.timer.add('layout', laid_out - start)
+            self.timer.add('paint', painted - laid_out)
+            if canvas is not image:
+                self.timer.add('scale', time.perf_counter() - painted)
+        return image
+
+    def downsample(self, canvas: QImage, image: QImage):
+        """
+        将超采样的画布平滑缩小到输出缓冲区
+
+        Raises:
+            RuntimeError: 无法创建画笔
+        """
+        painter = QPainter()
+        if not painter.begin(image):
+            raise RuntimeError("无法创建画笔")
+        try:
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            painter.drawImage(QRect(0, 0, self.width, self.height), canvas)
+        finally:
+            painter.end()
+
+
 class ImageProcessor:
-    """图片处理器"""
-    
-    def __init__(self):
-        """初始化图片处理器"""
-        pass 
\ No newline at end of file
+    """图片处理器：与界面无关的渲染引擎（背景 + 样式 + 文本 → 图片）"""
+
+    def __init__(self, style_config: Optional[Dict] = None, font_scale: float = 1.0,
+                 fonts_dir: Optional[str] = None, timer: Optional[StageTimer] = None):
+        """
+        初始化图片处理器
+
+        Args:
+            style_config: 样式配置，缺省项使用 DEFAULT_STYLE_CONFIG
+            font_scale: 字体缩放比例（界面导出时为 背景高度 / 预览高度）
+            fonts_dir: 自定义字体目录，默认为当前目录下的 fonts
+            timer: 阶段计时器，为None时不计时
+        """
+        self.style_config: Dict = dict(DEFAULT_STYLE_CONFIG)
+        self.font_scale: float = font_scale
+        self.fonts_dir: Optional[str] = fonts_dir
+        self.timer: Optional[StageTimer] = timer
+        self.scale_factor: int = 2  # 2倍分辨率，确保清晰度
+        self.background: Optional[QImage] = None
+        self.background_path: str = ""
+        self._plan: Optional[RenderPlan] = None
+        self._plan_key = None
+        if style_config:
+            self.set_style(style_config)
+
+    def set_style(self, style_config: Dict, font_scale: Optional[float] = None):
+        """
+        更新样式配置
+
+        Args:
+            style_config: 样式配置（可以只包含需要修改的项）
+            font_scale: 字体缩放比例，为None时保持不变
+        """
+        self.style_config.update(style_config)
+        if font_scale is not None:
+            self.font_scale = font_scale
+
+    def load_background(self, image_path: str) -> QImage:
+        """
+        加载背景图片
+
+        Args:
+            image_path: 图片路径
+
+        Returns:
+            QImage: 背景图片
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            ValueError: 图片无法解码
+        """
+        if not os.path.exists(image_path):
+            raise FileNotFoundError(f"找不到图片文件: {image_path}")
+
+        # 使用QImage而不是QPixmap，以便在无显示环境和非GUI线程中使用
+        start = time.perf_counter()
+        image = QImage(image_path)
+        if image.isNull():
+            raise ValueError("无法加载背景图片")
+        if self.timer:
+            self.timer.add('decode', time.perf_counter() - start)
+
+        logger.debug(f"加载背景图片：{image_path} ({image.width()}x{image.height()})")
+        return self.set_background(image, image_path)
+
+    def set_background(self, image: QImage, source: str = "") -> QImage:
+        """
+        直接使用内存中的背景图片（例如 background_generator 生成的渐变），不经过文件
+
+        Args:
+            image: 背景图片
+            source: 背景来源的描述（文件路径等），只用于记录
+
+        Returns:
+            QImage: 背景图片
+
+        Raises:
+            ValueError: 图片为空
+        """
+        if image.isNull():
+            raise ValueError("背景图片为空")
+        self.background = image
+        self.background_path = source
+        return image
+
+    def prepare(self, output_size: Optional[Tuple[int, int]] = None) -> 'RenderPlan':
+        """
+        获取当前背景和样式对应的渲染计划
+
+        样式、字体缩放比例、输出尺寸或背景改变后会自动重新准备
+
+        Args:
+            output_size: 输出图片的像素尺寸 (宽, 高)，为None时为背景尺寸 × scale_factor
+
+        Returns:
+            RenderPlan: 渲染计划
+
+        Raises:
+            ValueError: 尚未加载背景图片
+        """
+        if self.background is None:
+            raise ValueError("请先加载背景图片")
+
+        if output_size is None:
+            output_size = (self.background.width() * self.scale_factor,
+                           self.background.height() * self.scale_factor)
+        key = (
+            self.background.cacheKey(),
+            tuple(sorted(serialize_style_config(self.style_config).items())),
+            self.font_scale,
+            self.scale_factor,
+            output_size
+        )
+        if self._plan is None or self._plan_key != key:
+            # 先释放旧的渲染计划，避免新旧两份缩放后的背景同时占用内存
+            self._plan = None
+            self._plan = RenderPlan(self.background, self.style_config,
+                                    self.font_scale, self.scale_factor, self.fonts_dir, self.timer,
+                                    output_size=output_size, memory_limit=get_memory_budget().limit)
+            self._plan_key = key
+        self._plan.timer = self.timer
+        return self._plan
+
+    def render(self, text: str, reuse_buffer: bool = False) -> QImage:
+        """
+        渲染单条文本
+
+        Args:
+            text: 文本内容
+            reuse_buffer: 为True时直接返回渲染计划的复用缓冲区，
+                下一次渲染前必须用完（例如立即保存）
+
+        Returns:
+            QImage: 渲染结果（背景尺寸 × scale_factor）
+
+        Raises:
+            ValueError: 尚未加载背景图片
+            RuntimeError: 无法创建画笔
+        """
+        image = self.prepare().render(str(text))
+        return image if reuse_buffer else image.copy()
+
+    def render_to_bytes(self, text: str, fmt: str = "JPEG", quality: int = 85) -> bytes:
+        """
+        渲染单条文本并编码为图片字节
+
+        Args:
+            text: 文本内容
+            fmt: 图片格式
+            quality: 压缩质量
+
+        Returns:
+            bytes: 编码后的图片数据
+
+        Raises:
+            RuntimeError: 编码失败
+        """
+        return encode_image(self.render(text, reuse_buffer=True), EncodeOptions(fmt.upper(), quality))
+
+    def export(self, texts: Iterable, export_dir: str,
+               progress_callback: Optional[Callable[[int], None]] = None,
+               cancel_callback: Optional[Callable[[], bool]] = None,
+               start_index: int = 0,
+               indices: Optional[Sequence[int]] = None,
+               on_exported: Optional[Callable[[int], None]] = None,
+               encode_options: Optional[EncodeOptions] = None,
+               encoder_threads: Optional[int] = None) -> int:
+        """
+        批量导出图片
+
+        渲染在当前线程中进行，编码和写入由 EncodePipeline 在后台线程中完成，
+        渲染下一条文本时上一条正在编码。渲染计划和图像缓冲区占用的内存
+        从共享的内存预算中申请：预算不足时先等待其他导出释放，
+        额外的编码缓冲区（和相应的编码线程）只在预算有剩余时分配
+
+        Args:
+            texts: 文本列表
+            export_dir: 导出目录
+            progress_callback: 进度回调，参数为已处理条数
+            cancel_callback: 返回True时中止导出
+            start_index: 第一条文本在完整列表中的索引，用于生成文件名
+            indices: 每条文本在完整列表中的索引（只导出部分文本时使用），
+                为None时从 start_index 开始连续编号
+            on_exported: 每成功导出一张后调用（在写入线程中），参数为文本在完整列表中的索引
+            encode_options: 编码设置（包括输出尺寸），为None时使用 JPEG 质量85
+            encoder_threads: 编码线程数，为None时自动选择
+
+        Returns:
+            int: 成功导出的图片数量
+
+        Raises:
+            ValueError: 尚未加载背景图片
+        """
+        os.makedirs(export_dir, exist_ok=True)
+        options = encode_options or EncodeOptions()
+        if self.background is None:
+            raise ValueError("请先加载背景图片")
+        plan = self.prepare(options.output_size(self.background.width(), self.background.height()))
+        numbered = zip(indices, texts) if indices is not None else enumerate(texts, start_index)
+
+        # 渲染计划和第一个缓冲区必须分配（预算不足时等待），其余缓冲区有剩余预算时才分配
+        budget = get_memory_budget()
+        buffer_size = image_bytes(plan.width, plan.height)
+        reserved = plan.memory_bytes + buffer_size
+        budget.acquire(reserved)
+        threads = encoder_threads or default_encoder_threads()
+        buffer_count = 1
+        while buffer_count < threads + 1 and budget.try_acquire(buffer_size):
+            reserved += buffer_size
+            buffer_count += 1
+        if buffer_count < threads + 1:
+            logger.debug(f"内存预算剩余不足，使用 {buffer_count} 个图像缓冲区"
+                        f"（每个 {format_size(buffer_size)}，预算 {format_size(budget.limit)}）")
+
+        try:
+            return self._export_with(plan, numbered, export_dir, options,
+                                     max(1, min(threads, buffer_count - 1)), buffer_count,
+                                     progress_callback, cancel_callback, on_exported)
+        finally:
+            budget.release(reserved)
+
+    def _export_with(self, plan: 'RenderPlan', numbered: Iterable, export_dir: str,
+                     options: EncodeOptions, encoder_threads: int, buffer_count: int,
+                     progress_callback: Optional[Callable[[int], None]],
+                     cancel_callback: Optional[Callable[[], bool]],
+                     on_exported: Optional[Callable[[int], None]]) -> int:
+        """使用已申请内存的渲染计划和缓冲区数量导出，返回成功导出的图片数量"""
+        with EncodePipeline(plan.width, plan.height, options, encoder_threads=encoder_threads,
+                            buffer_count=buffer_count, on_written=on_exported, timer=self.timer) as pipeline:
+            for done, (i, text) in enumerate(numbered):
+                if cancel_callback and cancel_callback():
+                    logger.info(f"导出已取消，已处理 {done} 条")
+                    break
+
+                if progress_callback:
+                    progress_callback(done)
+
+                image = pipeline.acquire()
+                try:
+                    plan.render(str(text), image)
+                except Exception as e:
+                    pipeline.release(image)
+                    logger.error(f"导出图片 {i+1} 失败: {str(e)}")
+                    continue
+
+                # 编码和写入在后台进行（先写临时文件再改名）
+                pipeline.submit(i, image, os.path.join(export_dir, export_file_name(i, options.extension)))
+
+        return pipeline.written
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文本排版缓存模块
+缓存段落行宽和文档尺寸的测量结果，避免重复排版；
+自动字号在这些测量结果上做二分查找
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from PySide6.QtGui import QFont, QTextLayout, QTextLine, QTextOption
+
+# QTextDocument 的默认文档边距，测量结果包含左右（上下）两侧的边距
+DOCUMENT_MARGIN = 4.0
+
+# 不换行排版时使用的行宽
+UNWRAPPED_WIDTH = 1e7
+
+# 与 QTextDocument 默认相同的换行方式
+_TEXT_OPTION = QTextOption()
+_TEXT_OPTION.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
+
+
+def _line_height(line: QTextLine, line_height: Optional[int]) -> float:
+    """
+    与 QTextDocument 相同的行高：百分比行高以向上取整的行高为基数，
+    按 1/64 像素截断（Qt 内部的定点数精度）
+    """
+    if line_height is None:
+        return line.height()
+    raw = math.ceil(line.ascent() + line.descent() + line.leading())
+    return int(raw * line_height / 100 * 64) / 64
+
+
+@dataclass(frozen=True)
+class TextLayout:
+    """文本排版测量结果"""
+    line_widths: Tuple[float, ...]  # 每个段落（按'\n'分隔）不换行时的宽度
+    line_count: int  # 段落数
+    height: float  # 按换行宽度排版后的文档高度
+    width: float = 0.0  # 按换行宽度排版后的最大行宽
+
+    @property
+    def max_line_width(self) -> float:
+        """最大行宽"""
+        return max(self.line_widths, default=0.0)
+
+
+class TextLayoutCache:
+    """
+    文本排版缓存（LRU淘汰）
+
+    段落行宽以 (段落文本, 字体) 为键，文档尺寸以
+    (文本, 字体, 换行宽度, 行高) 为键，自动字号的查找结果以
+    (文本, 字体, 文本区域, 字号范围, 行高) 为键，可在多个线程中共享
+    """
+
+    def __init__(self, max_blocks: int = 20000, max_documents: int = 2000):
+        """
+        初始化排版缓存
+
+        Args:
+            max_blocks: 最多缓存的段落行宽条数
+            max_documents: 最多缓存的文档尺寸条数（自动字号结果的上限相同）
+        """
+        self.max_blocks = max_blocks
+        self.max_documents = max_documents
+        self._blocks: "OrderedDict[tuple, float]" = OrderedDict()
+        self._documents: "OrderedDict[tuple, Tuple[float, float]]" = OrderedDict()
+        self._fits: "OrderedDict[tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _layout(self, text: str, font: QFont, wrap_width: float, line_height: Optional[int] = None,
+                unwrapped: bool = False) -> Tuple[float, float, Tuple[float, ...]]:
+        """
+        用 QTextLayout 逐段排版，结果与 QTextDocument（默认文档边距和换行方式）一致
+
+        不创建文档、不合并段落格式；每个段落只做一次字形整形，
+        需要段落宽度时先不换行排版一次，再按换行宽度重新排版
+
+        Args:
+            text: 文本
+            font: 字体
+            wrap_width: 换行宽度（含文档边距）
+            line_height: 百分比行高，为None时使用默认行高
+            unwrapped: 是否同时测量每个段落不换行时的宽度
+
+        Returns:
+            Tuple[float, float, Tuple[float, ...]]: (换行后的最大行宽, 文档高度, 每个段落不换行时的宽度)
+        """
+        margins = 2 * DOCUMENT_MARGIN
+        line_width = wrap_width - margins
+        width = 0.0
+        height = 0.0
+        block_widths = []
+        for block in text.split('\n'):
+            layout = QTextLayout(block, font)
+            layout.setTextOption(_TEXT_OPTION)
+            if unwrapped:
+                layout.beginLayout()
+                layout.createLine().setLineWidth(UNWRAPPED_WIDTH)
+                layout.endLayout()
+                block_widths.append(layout.lineAt(0).naturalTextWidth() + margins)
+            layout.beginLayout()
+            while True:
+                line = layout.createLine()
+                if not line.isValid():
+                    break
+                line.setLineWidth(line_width)
+                width = max(width, line.naturalTextWidth())
+                height += _line_height(line, line_height)
+            layout.endLayout()
+        return width + margins, height + margins, tuple(block_widths)
+
+    def _get(self, cache: OrderedDict, key: tuple) -> Optional[Any]:
+        """查找缓存并更新LRU顺序"""
+        with self._lock:
+            value = cache.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            cache.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def _put(self, cache: OrderedDict, key: tuple, value: Any, limit: int):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > limit:
+                cache.popitem(last=False)
+
+    def block_width(self, block: str, font: QFont) -> float:
+        """
+        测量单个段落不换行时的宽度
+
+        Args:
+            block: 段落文本（不含'\n'）
+            font: 字体
+
+        Returns:
+            float: 段落宽度
+        """
+        key = (block, font.key())
+        width = self._get(self._blocks, key)
+        if width is None:
+            width = self._layout(block, font, UNWRAPPED_WIDTH, unwrapped=True)[2][0]
+            self._put(self._blocks, key, width, self.max_blocks)
+        return width
+
+    def line_widths(self, text: str, font: QFont) -> Tuple[float, ...]:
+        """
+        测量文本每个段落不换行时的宽度
+
+        Args:
+            text: 文本
+            font: 字体
+
+        Returns:
+            Tuple[float, ...]: 每个段落的宽度
+        """
+        return tuple(self.block_width(block, font) for block in text.split('\n'))
+
+    def document_size(self, text: str, font: QFont, wrap_width: float,
+                      line_height: Optional[int] = None) -> Tuple[float, float]:
+        """
+        测量文本按指定宽度换行后的文档尺寸
+
+        Args:
+            text: 文本
+            font: 字体
+            wrap_width: 换行宽度
+            line_height: 百分比行高（如150），为None时使用默认行高
+
+        Returns:
+            Tuple[float, float]: (换行后的最大行宽, 文档高度)，
+                有无法断开的长单词时行宽会超过换行宽度
+        """
+        key = (text, font.key(), wrap_width, line_height)
+        size = self._get(self._documents, key)
+        if size is None:
+            size = self._layout(text, font, wrap_width, line_height)[:2]
+            self._put(self._documents, key, size, self.max_documents)
+        return size
+
+    def document_height(self, text: str, font: QFont, wrap_width: float,
+                        line_height: Optional[int] = None) -> float:
+        """
+        测量文本按指定宽度换行后的文档高度
+
+        Args:
+            text: 文本
+            font: 字体
+            wrap_width: 换行宽度
+            line_height: 百分比行高（如150），为None时使用默认行高
+
+        Returns:
+            float: 文档高度
+        """
+        return self.document_size(text, font, wrap_width, line_height)[1]
+
+    def fit_font_size(self, text: str, font: QFont, wrap_width: float, max_height: float,
+                      min_size: int, max_size: int, line_height: Optional[int] = None) -> int:
+        """
+        二分查找能放入 wrap_width × max_height 区域的最大字号
+
+        先按最大字号测量一次，根据超出的比例估计字号，再用两次测量结果修正估计值，
+        从估计值向两侧查找，通常只需要4到5次排版；每次排版的结果都进入文档尺寸缓存
+
+        Args:
+            text: 文本
+            font: 字体（只使用字体族和样式，字号由查找决定）
+            wrap_width: 换行宽度
+            max_height: 文本区域的最大高度
+            min_size: 最小字号（放不下时也不会更小）
+            max_size: 最大字号
+            line_height: 百分比行高，为None时使用默认行高
+
+        Returns:
+            int: 字号（磅）
+        """
+        min_size = max(1, min_size)
+        max_size = max(min_size, max_size)
+        if wrap_width <= 0 or max_height <= 0:
+            return min_size
+
+        probe = QFont(font)
+        probe.setPointSize(max_size)
+        key = (text, probe.key(), wrap_width, max_height, min_size, line_height)
+        size = self._get(self._fits, key)
+        if size is not None:
+            return size
+
+        def measure(point_size: int) -> Tuple[float, float]:
+            probe.setPointSize(point_size)
+            return self.document_size(text, probe, wrap_width, line_height)
+
+        def fits(point_size: int) -> bool:
+            width, height = measure(point_size)
+            return width <= wrap_width and height <= max_height
+
+        width, height = measure(max_size)
+        if width <= wrap_width and height <= max_height:
+            size = max_size
+        else:
+            # 按最大字号超出的比例估计字号：换行后文本面积大致与字号的平方成正比，
+            # 无法断开的长单词的宽度与字号成正比
+            lo, hi = min_size, max_size - 1  # lo 能放下（或已是最小字号），答案在 [lo, hi] 中
+            guess = max(lo, min(hi, int(max_size * self._fit_ratio(width, height, wrap_width, max_height, 2.0))))
+            guess_width, guess_height = measure(guess)
+            if guess_width <= wrap_width and guess_height <= max_height:
+                lo = guess
+            else:
+                hi = guess - 1
+
+            # 用两次测量结果拟合 尺寸 ∝ 字号^k，再从新的估计值向两侧倍增步长确定范围
+            if lo < hi and 0 < guess_height < height:
+                k = max(1.0, math.log(height / guess_height) / math.log(max_size / guess))
+                estimate = max(lo, min(hi, int(guess * self._fit_ratio(guess_width, guess_height,
+                                                                        wrap_width, max_height, k))))
+                step = 1
+                if estimate == lo or fits(estimate):
+                    lo = estimate
+                    while lo < hi:
+                        probe_size = min(hi, lo + step)
+                        if not fits(probe_size):
+                            hi = probe_size - 1
+                            break
+                        lo = probe_size
+                        step *= 2
+                else:
+                    hi = estimate - 1
+                    while lo < hi:
+                        probe_size = max(lo + 1, hi - step + 1)
+                        if fits(probe_size):
+                            lo = probe_size
+                            break
+                        hi = probe_size - 1
+                        step *= 2
+
+            while lo < hi:
+                mid = (lo + hi + 1) // 2
+                if fits(mid):
+                    lo = mid
+                else:
+                    hi = mid - 1
+            size = lo
+
+        self._put(self._fits, key, size, self.max_documents)
+        return size
+
+    def measure(self, text: str, font: QFont, wrap_width: float,
+                line_height: Optional[int] = None) -> TextLayout:
+        """
+        测量文本的行宽、行数和文档高度
+
+        Args:
+            text: 文本
+            font: 字体
+            wrap_width: 换行宽度
+            line_height: 百分比行高，为None时使用默认行高
+
+        Returns:
+            TextLayout: 测量结果
+        """
+        font_key = font.key()
+        key = (text, font_key, wrap_width, line_height)
+        blocks = text.split('\n')
+        widths = [self._get(self._blocks, (block, font_key)) for block in blocks]
+        size = self._get(self._documents, key)
+        if size is None or None in widths:
+            # 未命中缓存时一次排版同时得到段落宽度和换行后的尺寸
+            width, height, block_widths = self._layout(text, font, wrap_width, line_height, unwrapped=True)
+            size = (width, height)
+            widths = list(block_widths)
+            self._put(self._documents, key, size, self.max_documents)
+            for block, block_width in zip(blocks, block_widths):
+                self._put(self._blocks, (block, font_key), block_width, self.max_blocks)
+        return TextLayout(
+            line_widths=tuple(widths),
+            line_count=len(widths),
+            height=size[1],
+            width=size[0]
+        )
+
+    @staticmethod
+    def _fit_ratio(width: float, height: float, wrap_width: float, max_height: float, k: float) -> float:
+        """按 尺寸 ∝ 字号^k 估计放入文本区域需要的字号缩放比例"""
+        ratio = (max_height / height) ** (1.0 / k) if height > 0 else 1.0
+        if width > wrap_width:
+            ratio = min(ratio, wrap_width / width)
+        return ratio
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._blocks.clear()
+            self._documents.clear()
+            self._fits.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_shared_cache: Optional[TextLayoutCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_layout_cache() -> TextLayoutCache:
+    """获取预览和导出共享的排版缓存"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = TextLayoutCache()
+        return _shared_cache
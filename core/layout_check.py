@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+排版检查模块
+导出前只排版不绘制：计算每条文本的文本块位置和尺寸，
+找出超出边距或超出画面（导出后会被裁切）的文本，结果可以保存为CSV
+文本较多时与并行导出一样分片交给多个进程
+"""
+
+import csv
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QSize, Signal
+from PySide6.QtGui import QImageReader
+
+from .image_processor import DEFAULT_STYLE_CONFIG, RenderPlan, TextBox, serialize_style_config
+from .parallel_export import init_worker_app, split_chunks
+
+logger = logging.getLogger(__name__)
+
+# 超出量小于该值（像素）时视为没有超出，避免居中计算的舍入误差
+TOLERANCE = 1.0
+
+# 文本少于该条数时不启动工作进程（启动进程和加载字体的耗时超过排版本身）
+PARALLEL_MIN_ROWS = 20_000
+
+CLIPPED = 'clipped'  # 超出画面，导出后文本会被裁切
+OVERFLOW = 'overflow'  # 超出边距，但仍在画面内
+
+KIND_NAMES = {
+    CLIPPED: "被裁切",
+    OVERFLOW: "超出边距",
+}
+
+
+@dataclass(frozen=True)
+class LayoutIssue:
+    """一条文本的排版问题"""
+
+    index: int  # 文本索引（从0开始）
+    kind: str  # CLIPPED 或 OVERFLOW
+    box: TextBox  # 文本块的字号、位置和尺寸（背景坐标系）
+    excess: float  # 超出最多的一侧超出的像素数
+    text: str
+
+    def to_row(self) -> List:
+        """转换为CSV的一行"""
+        box = self.box
+        return [self.index + 1, KIND_NAMES[self.kind], box.font_size,
+                round(box.x, 1), round(box.y, 1), round(box.width, 1), round(box.height, 1),
+                round(self.excess, 1), self.text]
+
+
+CSV_HEADER = ["序号", "问题", "字号", "左", "上", "宽", "高", "超出像素", "文本"]
+
+
+@dataclass
+class LayoutReport:
+    """一批文本的排版检查结果"""
+
+    width: int  # 背景宽度
+    height: int  # 背景高度
+    total: int = 0
+    issues: List[LayoutIssue] = field(default_factory=list)
+    canceled: bool = False
+
+    @property
+    def clipped(self) -> List[LayoutIssue]:
+        """超出画面的文本"""
+        return [issue for issue in self.issues if issue.kind == CLIPPED]
+
+    @property
+    def overflow(self) -> List[LayoutIssue]:
+        """超出边距但仍在画面内的文本"""
+        return [issue for issue in self.issues if issue.kind == OVERFLOW]
+
+    def summary(self, limit: int = 10) -> str:
+        """
+        生成可读的检查结果
+
+        Args:
+            limit: 最多列出的文本条数
+
+        Returns:
+            str: 检查结果
+        """
+        checked = f"已检查 {self.total} 条文本（已取消）" if self.canceled else f"共 {self.total} 条文本"
+        if not self.issues:
+            return f"{checked}，全部在边距内（背景 {self.width}x{self.height}）"
+
+        lines = [
+            f"{checked}，{len(self.clipped)} 条超出画面（导出后会被裁切），"
+            f"{len(self.overflow)} 条超出边距（背景 {self.width}x{self.height}）："
+        ]
+        for issue in self.issues[:limit]:
+            preview = issue.text.replace('\n', ' ')
+            if len(preview) > 20:
+                preview = preview[:20] + "……"
+            lines.append(f"  第 {issue.index + 1} 条：{KIND_NAMES[issue.kind]} {issue.excess:.0f}px，"
+                         f"字号 {issue.box.font_size}，{preview}")
+        if len(self.issues) > limit:
+            lines.append(f"  ……等 {len(self.issues)} 条")
+        return "\n".join(lines)
+
+    def write_csv(self, path: str):
+        """
+        将有问题的文本保存为CSV（带BOM，可直接用Excel打开）
+
+        Args:
+            path: CSV文件路径
+        """
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for issue in self.issues:
+                writer.writerow(issue.to_row())
+
+
+def background_size(background_path: str) -> QSize:
+    """
+    只读取背景图片的尺寸（不解码像素）
+
+    Raises:
+        ValueError: 无法读取图片尺寸
+    """
+    size = QImageReader(background_path).size()
+    if not size.isValid() or size.isEmpty():
+        raise ValueError(f"无法读取背景图片尺寸: {background_path}")
+    return size
+
+
+def classify(box: TextBox, width: int, height: int, style_config: Dict) -> Tuple[Optional[str], float]:
+    """
+    判断文本块是否超出边距或画面
+
+    Args:
+        box: 文本块排版结果
+        width: 背景宽度
+        height: 背景高度
+        style_config: 样式配置
+
+    Returns:
+        Tuple[Optional[str], float]: (问题类型，没有问题时为None; 超出最多的一侧超出的像素数)
+    """
+    right = box.x + box.width
+    bottom = box.y + box.height
+    clipped = max(-box.x, -box.y, right - width, bottom - height)
+    if clipped > TOLERANCE:
+        return CLIPPED, clipped
+    overflow = max(style_config['margin_left'] - box.x,
+                   style_config['margin_top'] - box.y,
+                   right - (width - style_config['margin_right']),
+                   bottom - (height - style_config['margin_bottom']))
+    if overflow > TOLERANCE:
+        return OVERFLOW, overflow
+    return None, 0.0
+
+
+def check_layout(texts: Sequence, size: QSize, style_config: Dict, font_scale: float = 1.0,
+                 scale_factor: int = 2, fonts_dir: Optional[str] = None,
+                 progress_callback: Optional[Callable[[int], None]] = None,
+                 cancel_callback: Optional[Callable[[], bool]] = None,
+                 workers: int = 1) -> LayoutReport:
+    """
+    检查一批文本的排版（只排版，不绘制、不编码）
+
+    使用与导出相同的渲染计划计算字号和位置，因此结果与导出一致
+
+    Args:
+        texts: 文本列表
+        size: 背景尺寸
+        style_config: 样式配置
+        font_scale: 字体缩放比例（与导出相同）
+        scale_factor: 输出分辨率倍数
+        fonts_dir: 自定义字体目录
+        progress_callback: 进度回调，参数为已检查条数
+        cancel_callback: 返回True时中止检查
+        workers: 工作进程数，文本不少于 PARALLEL_MIN_ROWS 条时才使用多进程
+
+    Returns:
+        LayoutReport: 检查结果（按文本顺序排列）
+    """
+    style = dict(DEFAULT_STYLE_CONFIG)
+    style.update(style_config)
+    if workers > 1 and len(texts) >= PARALLEL_MIN_ROWS:
+        return _check_layout_parallel(texts, size, style, font_scale, scale_factor, fonts_dir,
+                                      workers, progress_callback, cancel_callback)
+
+    plan = RenderPlan(size, style, font_scale, scale_factor, fonts_dir)
+    report = LayoutReport(size.width(), size.height())
+
+    for index, text in enumerate(texts):
+        # 每1000条汇报一次进度、检查一次是否取消
+        if index % 1000 == 0:
+            if cancel_callback and cancel_callback():
+                report.canceled = True
+                break
+            if progress_callback:
+                progress_callback(index)
+
+        issue = _check_text(plan, style, report.width, report.height, index, str(text))
+        report.total += 1
+        if issue is not None:
+            report.issues.append(issue)
+
+    if progress_callback and not report.canceled:
+        progress_callback(report.total)
+    return report
+
+
+def _check_text(plan: RenderPlan, style: Dict, width: int, height: int,
+                index: int, text: str) -> Optional[LayoutIssue]:
+    """检查单条文本，没有问题时返回None"""
+    box = plan.text_box(text)
+    kind, excess = classify(box, width, height, style)
+    return LayoutIssue(index, kind, box, excess, text) if kind is not None else None
+
+
+# 工作进程内的渲染计划和样式（由 _init_worker 创建）
+_plan: Optional[RenderPlan] = None
+_style: Optional[Dict] = None
+
+
+def _init_worker(width: int, height: int, style_config: Dict, font_scale: float,
+                 scale_factor: int, fonts_dir: Optional[str]):
+    """工作进程初始化：创建QGuiApplication、注册字体，准备只排版的渲染计划"""
+    global _plan, _style
+    init_worker_app(style_config, fonts_dir)
+    _style = style_config
+    _plan = RenderPlan(QSize(width, height), style_config, font_scale, scale_factor, fonts_dir)
+
+
+def _check_chunk(start: int, texts: List[str]) -> Tuple[int, List[LayoutIssue]]:
+    """
+    在工作进程中检查一个分片
+
+    Returns:
+        Tuple[int, List[LayoutIssue]]: (分片条数, 有问题的文本)
+    """
+    width, height = _plan.bg_width, _plan.bg_height
+    issues = []
+    for offset, text in enumerate(texts):
+        issue = _check_text(_plan, _style, width, height, start + offset, text)
+        if issue is not None:
+            issues.append(issue)
+    return len(texts), issues
+
+
+def _check_layout_parallel(texts: Sequence, size: QSize, style: Dict, font_scale: float,
+                           scale_factor: int, fonts_dir: Optional[str], workers: int,
+                           progress_callback: Optional[Callable[[int], None]],
+                           cancel_callback: Optional[Callable[[], bool]]) -> LayoutReport:
+    """多进程排版检查：分片方式和提交窗口与并行导出相同"""
+    report = LayoutReport(size.width(), size.height())
+    style = serialize_style_config(style)
+    chunks = iter(split_chunks(len(texts), workers))
+    logger.info(f"并行排版检查：{len(texts)} 条，{workers} 个进程")
+
+    # Qt不支持fork后继续使用，统一使用spawn启动工作进程
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(size.width(), size.height(), style, font_scale, scale_factor, fonts_dir)
+    ) as executor:
+        pending = {}  # future → 分片条数
+
+        def submit_next() -> bool:
+            """提交下一个分片（未提交的分片不会提前展开为字符串列表），没有剩余分片时返回False"""
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            start, end = chunk
+            future = executor.submit(_check_chunk, start, [str(text) for text in texts[start:end]])
+            pending[future] = end - start
+            return True
+
+        while len(pending) < workers * 2 and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.pop(future)
+                count, issues = future.result()
+                report.total += count
+                report.issues.extend(issues)
+
+            if progress_callback:
+                progress_callback(report.total)
+
+            if cancel_callback and cancel_callback():
+                for future in pending:
+                    future.cancel()
+                report.canceled = True
+                break
+
+            while len(pending) < workers * 2 and submit_next():
+                pass
+
+    # 各分片完成的顺序不确定，按文本顺序排列
+    report.issues.sort(key=lambda issue: issue.index)
+    return report
+
+
+class LayoutCheckSignals(QObject):
+    """排版检查信号（在GUI线程创建）"""
+
+    progress = Signal(int, int)  # 已检查条数，总数
+    finished = Signal(object)  # LayoutReport
+    failed = Signal(str)  # 错误信息
+
+
+class LayoutCheckWorker(QRunnable):
+    """后台排版检查任务"""
+
+    def __init__(self, texts: Sequence, background_path: str, style_config: Dict,
+                 font_scale: float = 1.0, fonts_dir: Optional[str] = None, workers: int = 1):
+        """
+        初始化排版检查任务
+
+        Args:
+            texts: 文本列表（在创建时复制）
+            background_path: 背景图片路径（只读取尺寸）
+            style_config: 样式配置（在创建时复制）
+            font_scale: 字体缩放比例（与导出相同）
+            fonts_dir: 自定义字体目录
+            workers: 工作进程数
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = LayoutCheckSignals()
+        self.texts = texts.copy() if hasattr(texts, 'copy') else list(texts)
+        self.background_path = background_path
+        self.style_config = dict(style_config)
+        self.font_scale = font_scale
+        self.fonts_dir = fonts_dir
+        self.workers = workers
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """请求取消检查（可在任意线程调用）"""
+        self._cancel_event.set()
+
+    def run(self):
+        """执行排版检查（在线程池线程中运行）"""
+        total = len(self.texts)
+        try:
+            report = check_layout(
+                self.texts,
+                background_size(self.background_path),
+                self.style_config,
+                font_scale=self.font_scale,
+                fonts_dir=self.fonts_dir,
+                progress_callback=lambda done: self.signals.progress.emit(done, total),
+                cancel_callback=self._cancel_event.is_set,
+                workers=self.workers
+            )
+            logger.info(f"排版检查：{report.total} 条，{len(report.clipped)} 条超出画面，{len(report.overflow)} 条超出边距")
+            self.signals.finished.emit(report)
+        except Exception as e:
+            logger.error(f"排版检查失败: {str(e)}")
+            self.signals.failed.emit(str(e))
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+日志配置模块
+调用日志的线程只把记录放入队列，格式化和写文件由后台监听线程完成；
+各子系统可以单独设置日志级别，日志文件按大小轮转，高频的调试日志会被限流
+"""
+
+import glob
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 设置各子系统日志级别的环境变量，例如 "INFO,ui.style_tab=DEBUG,core=WARNING"
+LOG_LEVEL_ENV = "QUOTE_MAKER_LOG"
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILE_NAME = "quote_maker.log"
+
+# 单个日志文件的最大字节数和保留的轮转文件数
+MAX_LOG_BYTES = 2 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# 日志目录的总大小上限（包括旧版本按启动时间命名的日志文件）
+MAX_LOG_DIR_BYTES = 20 * 1024 * 1024
+
+
+def parse_log_levels(spec: Optional[str], default: int = logging.INFO) -> Dict[str, int]:
+    """
+    解析日志级别配置
+
+    Args:
+        spec: 以逗号分隔的配置，不带名称的项为根日志级别，
+              "名称=级别" 设置该日志记录器（及其子记录器）的级别
+        default: 未配置时根日志的级别
+
+    Returns:
+        Dict[str, int]: 日志记录器名称 → 级别，根日志记录器的名称为空字符串
+
+    Raises:
+        ValueError: 级别名称无效
+    """
+    levels = {'': default}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, level_name = item.rpartition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"无效的日志级别：{level_name}")
+        levels[name.strip()] = level
+    return levels
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    日志限流：同一代码位置的低级别日志在时间窗口内最多输出 burst 条
+
+    被省略的条数会附加在该位置下一条输出的日志后面。WARNING 及以上级别不限流
+    """
+
+    def __init__(self, burst: int = 10, interval: float = 1.0, max_level: int = logging.INFO):
+        """
+        Args:
+            burst: 每个时间窗口内每个代码位置最多输出的条数
+            interval: 时间窗口（秒）
+            max_level: 限流的最高级别
+        """
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.max_level = max_level
+        self._windows: Dict[tuple, list] = {}  # (文件, 行号) → [窗口开始时间, 已输出条数, 已省略条数]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+            elif window[1] < self.burst:
+                window[1] += 1
+                suppressed = 0
+            else:
+                window[2] += 1
+                return False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()}（此前省略 {suppressed} 条相同位置的日志）"
+            record.args = None
+        return True
+
+
+def prune_log_dir(log_dir: str, max_bytes: int = MAX_LOG_DIR_BYTES):
+    """
+    删除最旧的日志文件，使日志目录的总大小不超过上限
+
+    Args:
+        log_dir: 日志目录
+        max_bytes: 总大小上限
+    """
+    files = []
+    for path in glob.glob(os.path.join(log_dir, "*.log*")):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError as e:
+            logger.warning(f"无法删除旧日志文件 {path}: {str(e)}")
+
+
+def setup_logging(log_dir: str, levels: Optional[Dict[str, int]] = None,
+                  console: bool = True) -> logging.handlers.QueueListener:
+    """
+    配置异步日志：根日志记录器只有一个 QueueHandler，由后台线程写入文件和控制台
+
+    Args:
+        log_dir: 日志目录
+        levels: 各日志记录器的级别（见 parse_log_levels），为None时读取环境变量 QUOTE_MAKER_LOG
+        console: 是否同时输出到控制台
+
+    Returns:
+        logging.handlers.QueueListener: 已启动的监听器，程序退出前应调用 stop() 写完剩余日志
+    """
+    config_error = None
+    if levels is None:
+        try:
+            levels = parse_log_levels(os.environ.get(LOG_LEVEL_ENV))
+        except ValueError as e:
+            levels = parse_log_levels(None)
+            config_error = f"环境变量 {LOG_LEVEL_ENV} 无效，使用默认日志级别：{str(e)}"
+
+    os.makedirs(log_dir, exist_ok=True)
+    prune_log_dir(log_dir)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, LOG_FILE_NAME),
+        maxBytes=MAX_LOG_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+
+    # 替换根日志记录器原有的处理器（包括 logging.basicConfig 隐式添加的）
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+        handler.close()
+    root_logger.addHandler(queue_handler)
+
+    for name, level in levels.items():
+        logging.getLogger(name or None).setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    if config_error:
+        logger.warning(config_error)
+    return listener
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内存预算模块
+限制同时进行的导出占用的图像内存（背景、渲染缓冲区、编码缓冲区），
+多个导出同时进行时后开始的导出会等待内存释放，而不是一起耗尽内存
+"""
+
+import logging
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 设置默认内存预算的环境变量，例如 QUOTE_MAKER_MEMORY_BUDGET=4G
+BUDGET_ENV = "QUOTE_MAKER_MEMORY_BUDGET"
+
+# 无法获取物理内存大小时的默认预算
+FALLBACK_LIMIT = 2 * 1024 ** 3
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(text: str) -> int:
+    """
+    解析内存大小，例如 "512M"、"4G"、"1.5G"、"1073741824"
+
+    Args:
+        text: 大小（不区分大小写，可以带 B/iB 后缀）
+
+    Returns:
+        int: 字节数
+
+    Raises:
+        ValueError: 格式错误或不是正数
+    """
+    match = re.fullmatch(r'\s*([0-9]*\.?[0-9]+)\s*([KMGT]?)(I?B)?\s*', str(text).upper())
+    if not match:
+        raise ValueError(f"无法解析内存大小：{text}")
+    size = int(float(match.group(1)) * _UNITS[match.group(2)])
+    if size <= 0:
+        raise ValueError(f"内存大小必须大于0：{text}")
+    return size
+
+
+def format_size(size: int) -> str:
+    """将字节数格式化为可读的大小"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f}{unit}" if unit == 'B' else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def image_bytes(width: int, height: int, bytes_per_pixel: int = 4) -> int:
+    """图像缓冲区占用的字节数（Qt 的扫描线按4字节对齐）"""
+    return ((width * bytes_per_pixel + 3) // 4 * 4) * height
+
+
+def default_limit() -> int:
+    """
+    默认内存预算：环境变量 QUOTE_MAKER_MEMORY_BUDGET，否则为物理内存的四分之一
+
+    Returns:
+        int: 字节数
+    """
+    value = os.environ.get(BUDGET_ENV)
+    if value:
+        try:
+            return parse_size(value)
+        except ValueError as e:
+            logger.warning(f"忽略环境变量 {BUDGET_ENV}：{e}")
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // 4
+    except (AttributeError, ValueError, OSError):
+        return FALLBACK_LIMIT
+
+
+class MemoryBudget:
+    """
+    内存预算（按字节计数的信号量，可在多个线程中共享）
+
+    预算只记录申请方声明的大小，不测量实际内存；预算全部空闲时
+    超出上限的单个申请也会被满足（并记录警告），避免永远等待
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        """
+        初始化内存预算
+
+        Args:
+            limit: 上限（字节），为None时使用 default_limit
+        """
+        self.limit = limit if limit is not None else default_limit()
+        if self.limit <= 0:
+            raise ValueError(f"内存预算必须大于0：{self.limit}")
+        self.used = 0
+        self.peak = 0
+        self._condition = threading.Condition()
+
+    @property
+    def available(self) -> int:
+        """剩余可用的字节数"""
+        with self._condition:
+            return max(0, self.limit - self.used)
+
+    def _grant(self, size: int):
+        """记录已分配的内存（调用时已持有锁）"""
+        if size > self.limit:
+            logger.warning(f"申请的内存 {format_size(size)} 超过预算 {format_size(self.limit)}")
+        self.used += size
+        self.peak = max(self.peak, self.used)
+
+    def try_acquire(self, size: int) -> bool:
+        """
+        不等待地申请内存
+
+        Returns:
+            bool: 是否申请成功
+        """
+        with self._condition:
+            if self.used + size > self.limit and self.used > 0:
+                return False
+            self._grant(size)
+            return True
+
+    def acquire(self, size: int, timeout: Optional[float] = None) -> bool:
+        """
+        申请内存，预算不足时等待其他申请方释放
+
+        Args:
+            size: 字节数
+            timeout: 最长等待秒数，为None时一直等待
+
+        Returns:
+            bool: 是否申请成功（只有超时时为False）
+        """
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.used + size <= self.limit or self.used == 0, timeout):
+                return False
+            self._grant(size)
+            return True
+
+    def release(self, size: int):
+        """释放之前申请的内存"""
+        with self._condition:
+            self.used = max(0, self.used - size)
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[int]:
+        """申请内存，离开 with 语句时释放"""
+        self.acquire(size)
+        try:
+            yield size
+        finally:
+            self.release(size)
+
+
+_budget: Optional[MemoryBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_memory_budget() -> MemoryBudget:
+    """获取进程内所有导出共享的内存预算"""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = MemoryBudget()
+        return _budget
+
+
+def set_memory_budget(limit: int) -> MemoryBudget:
+    """
+    设置进程内共享的内存预算上限（应在开始导出之前调用）
+
+    Args:
+        limit: 上限（字节）
+
+    Returns:
+        MemoryBudget: 新的内存预算
+    """
+    global _budget
+    with _budget_lock:
+        _budget = MemoryBudget(limit)
+        return _budget
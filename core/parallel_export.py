@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+并行导出模块
+将文本列表按连续区间分片，交给多个进程并行渲染
+每个工作进程拥有独立的QGuiApplication、已加载的字体和渲染引擎
+"""
+
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .memory_budget import format_size, get_memory_budget, image_bytes, set_memory_budget
+
+if TYPE_CHECKING:
+    from .image_encoder import EncodeOptions
+    from .stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# 工作进程内的应用对象、渲染引擎、编码设置和阶段计时器（由 _init_worker 创建）
+_app = None
+_processor = None
+_encode_options = None
+_timer = None
+
+
+def default_worker_count() -> int:
+    """默认工作进程数：CPU核心数"""
+    return os.cpu_count() or 1
+
+
+def init_worker_app(style_config: Dict, fonts_dir: Optional[str]):
+    """
+    工作进程通用的初始化：创建offscreen的QGuiApplication并注册样式使用的字体
+
+    Args:
+        style_config: 样式配置
+        fonts_dir: 自定义字体目录
+    """
+    global _app
+
+    # 工作进程没有显示，必须在创建QGuiApplication之前设置
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PySide6.QtGui import QGuiApplication
+    from .font_manager import get_font_manager
+
+    if QGuiApplication.instance() is None:
+        # 保存引用，避免应用对象被回收
+        _app = QGuiApplication([])
+
+    if fonts_dir:
+        font_manager = get_font_manager(fonts_dir)
+        font_manager.register_family(style_config['font_family'])
+        if style_config.get('fallback_family'):
+            font_manager.register_family(style_config['fallback_family'])
+
+
+def _init_worker(background_path: str, style_config: Dict, font_scale: float,
+                 fonts_dir: Optional[str], encode_options: Optional[Dict] = None,
+                 memory_limit: Optional[int] = None):
+    """工作进程初始化：创建offscreen的QGuiApplication、加载字体和背景，设置本进程的内存预算"""
+    global _processor, _encode_options, _timer
+
+    if memory_limit:
+        set_memory_budget(memory_limit)
+
+    init_worker_app(style_config, fonts_dir)
+
+    from .image_encoder import EncodeOptions
+    from .image_processor import ImageProcessor
+    from .stage_timer import StageTimer
+
+    _timer = StageTimer()
+    _processor = ImageProcessor(style_config, font_scale=font_scale, fonts_dir=fonts_dir, timer=_timer)
+    _processor.load_background(background_path)
+    _encode_options = EncodeOptions.from_dict(encode_options)
+
+
+def _render_chunk(indices: List[int], texts: List[str], export_dir: str) -> Tuple[int, List[int], Dict]:
+    """
+    在工作进程中渲染一个分片
+
+    Returns:
+        Tuple[int, List[int], Dict]: (分片条数, 成功导出的文本索引, 自上个分片以来的阶段耗时统计)
+    """
+    exported = []
+    # 每个进程只用一个编码线程，与其他进程的渲染重叠即可，避免线程数超过CPU核心数
+    _processor.export(texts, export_dir, indices=indices, on_exported=exported.append,
+                      encode_options=_encode_options, encoder_threads=1)
+    timings = _timer.to_dict()
+    _timer.reset()
+    return len(texts), exported, timings
+
+
+def split_chunks(count: int, workers: int, chunk_size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    将 count 条文本切分为连续区间
+
+    分片数量为工作进程数的若干倍，既能均衡负载，又能及时汇报进度
+
+    Args:
+        count: 文本条数
+        workers: 工作进程数
+        chunk_size: 每片条数，为None时自动计算
+
+    Returns:
+        List[Tuple[int, int]]: (起始索引, 结束索引) 列表，按顺序排列
+    """
+    if count <= 0:
+        return []
+    if chunk_size is None:
+        chunk_size = max(1, min(256, math.ceil(count / (workers * 8))))
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def worker_memory(background_path: str, encode_options: Optional["EncodeOptions"] = None) -> int:
+    """
+    估计一个工作进程导出时至少占用的图像内存
+
+    包括解码后的背景、缩放到输出尺寸的背景和一个图像缓冲区（不超采样）
+
+    Args:
+        background_path: 背景图片路径（只读取尺寸）
+        encode_options: 编码设置（决定输出尺寸）
+
+    Returns:
+        int: 字节数
+    """
+    from .image_encoder import EncodeOptions
+    from .image_processor import render_memory
+    from .layout_check import background_size
+
+    size = background_size(background_path)
+    width, height = (encode_options or EncodeOptions()).output_size(size.width(), size.height())
+    return image_bytes(size.width(), size.height()) + render_memory(width, height, buffers=1)
+
+
+def export_parallel(texts: Sequence, export_dir: str, background_path: str,
+                    style_config: Dict, font_scale: float = 1.0,
+                    fonts_dir: Optional[str] = None, workers: Optional[int] = None,
+                    progress_callback: Optional[Callable[[int], None]] = None,
+                    cancel_callback: Optional[Callable[[], bool]] = None,
+                    chunk_size: Optional[int] = None,
+                    indices: Optional[Sequence[int]] = None,
+                    on_exported: Optional[Callable[[int], None]] = None,
+                    encode_options: Optional["EncodeOptions"] = None,
+                    timer: Optional["StageTimer"] = None) -> int:
+    """
+    多进程批量导出图片
+
+    文件名只由文本在列表中的索引决定，因此输出与串行导出完全一致。
+    内存预算平均分给各工作进程，预算放不下时减少进程数
+
+    Args:
+        texts: 文本列表
+        export_dir: 导出目录
+        background_path: 背景图片路径
+        style_config: 样式配置（会被序列化后传给工作进程）
+        font_scale: 字体缩放比例
+        fonts_dir: 自定义字体目录，工作进程启动时加载
+        workers: 工作进程数，为None时使用CPU核心数
+        progress_callback: 进度回调，参数为已完成条数
+        cancel_callback: 返回True时中止导出（已开始的分片会完成）
+        chunk_size: 每个分片的条数，为None时自动计算
+        indices: 只导出这些索引对应的文本（增量导出时使用），为None时导出全部
+        on_exported: 每成功导出一张后调用（在调用线程中），参数为文本索引
+        encode_options: 编码设置（EncodeOptions），为None时使用 JPEG 质量85
+        timer: 阶段计时器（StageTimer），合并各工作进程的统计
+
+    Returns:
+        int: 成功导出的图片数量
+    """
+    from .image_processor import serialize_style_config
+    from .stage_timer import StageTimer
+
+    count = len(indices) if indices is not None else len(texts)
+    workers = max(1, min(workers or default_worker_count(), count or 1))
+    os.makedirs(export_dir, exist_ok=True)
+
+    # 每个进程至少需要放下背景和一个缓冲区
+    limit = get_memory_budget().limit
+    required = worker_memory(background_path, encode_options)
+    affordable = max(1, limit // required)
+    if affordable < workers:
+        logger.info(f"内存预算 {format_size(limit)} 不足以支持 {workers} 个进程"
+                    f"（每个至少 {format_size(required)}），减少为 {affordable} 个")
+        workers = affordable
+
+    chunks = split_chunks(count, workers, chunk_size)
+    logger.info(f"并行导出：{count} 条，{workers} 个进程，{len(chunks)} 个分片")
+
+    def chunk_items(start: int, end: int) -> Tuple[List[int], List[str]]:
+        """取出一个分片的文本索引和字符串列表，文本存储本身不必整体展开"""
+        if indices is None:
+            return list(range(start, end)), [str(text) for text in texts[start:end]]
+        chunk_indices = list(indices[start:end])
+        return chunk_indices, [str(texts[i]) for i in chunk_indices]
+
+    # Qt不支持fork后继续使用，统一使用spawn启动工作进程
+    context = multiprocessing.get_context("spawn")
+    completed = 0
+    exported = 0
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(background_path, serialize_style_config(style_config), font_scale, fonts_dir,
+                  encode_options.to_dict() if encode_options else None, limit // workers)
+    ) as executor:
+        # 只让 2×进程数 个分片处于提交状态，完成一个再补充一个，
+        # 未提交的分片不会提前展开为字符串列表
+        remaining = iter(chunks)
+        pending = {}  # future → 分片条数
+
+        def submit_next() -> bool:
+            """提交下一个分片，没有剩余分片时返回False"""
+            nonlocal completed
+            chunk = next(remaining, None)
+            if chunk is None:
+                return False
+            start, end = chunk
+            try:
+                pending[executor.submit(_render_chunk, *chunk_items(start, end), export_dir)] = end - start
+            except Exception as e:
+                # 进程池已损坏时无法再提交，与失败的分片一样计入进度
+                logger.error(f"提交导出分片失败: {str(e)}")
+                completed += end - start
+            return True
+
+        while len(pending) < workers * 2 and submit_next():
+            pass
+
+        while pending:
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                # 失败的分片也计入进度，否则进度永远达不到总数
+                completed += pending.pop(future)
+                try:
+                    _, chunk_exported, timings = future.result()
+                    if timer is not None:
+                        timer.merge(StageTimer.from_dict(timings))
+                    exported += len(chunk_exported)
+                    if on_exported:
+                        for index in chunk_exported:
+                            on_exported(index)
+                except Exception as e:
+                    logger.error(f"导出分片失败: {str(e)}")
+
+            if progress_callback:
+                progress_callback(completed)
+
+            if cancel_callback and cancel_callback():
+                for future in pending:
+                    future.cancel()
+                logger.info(f"并行导出已取消，已完成 {completed} 条")
+                break
+
+            while len(pending) < workers * 2 and submit_next():
+                pass
+
+    return exported
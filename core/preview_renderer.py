@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+预览渲染模块
+将预览画面渲染为图片帧，并在后台预先渲染相邻文本的预览帧
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence
+
+from PySide6.QtCore import QCoreApplication, QObject, QRunnable, QSize, QThreadPool, Signal
+from PySide6.QtGui import (
+    QColor, QFont, QImage, QPainter, QTextBlockFormat,
+    QTextCharFormat, QTextCursor, QTextDocument
+)
+
+from .font_manager import get_font_manager
+from .image_processor import serialize_style_config
+from .layout_cache import get_layout_cache
+from .stage_timer import get_preview_timer
+
+logger = logging.getLogger(__name__)
+
+
+def render_preview_frame(background: QImage, text: str, style_config: Dict) -> QImage:
+    """
+    渲染一帧预览画面（可在任意线程调用）
+
+    Args:
+        background: 已缩放到预览尺寸的背景图片
+        text: 文本内容
+        style_config: 样式配置
+
+    Returns:
+        QImage: 预览帧，尺寸与背景相同
+    """
+    start = time.perf_counter()
+    width = background.width()
+    height = background.height()
+
+    # 创建字体（主字体缺少文本中的字符时使用备用字体）
+    family = get_font_manager().select_family(
+        text, style_config['font_family'], style_config.get('fallback_family')
+    )
+    font = QFont(family, style_config['font_size'])
+
+    # 计算可用区域
+    margin_left = style_config['margin_left']
+    margin_top = style_config['margin_top']
+    margin_right = style_config['margin_right']
+    margin_bottom = style_config['margin_bottom']
+    available_width = width - margin_left - margin_right
+
+    # 自动字号：查找能放入边距内的最大字号
+    if style_config.get('auto_fit'):
+        font.setPointSize(get_layout_cache().fit_font_size(
+            text, font, available_width, height - margin_top - margin_bottom,
+            style_config.get('min_font_size', 12), style_config.get('max_font_size', 72)
+        ))
+
+    # 测量文本（行宽和文档高度来自共享的排版缓存）
+    layout = get_layout_cache().measure(text, font, available_width)
+    max_line_width = layout.max_line_width
+
+    # 计算文本位置（考虑整个图片尺寸）
+    if style_config['center_horizontally']:
+        # 添加额外的左侧偏移以补偿标点符号
+        punctuation_compensation = font.pointSize() * 0.2  # 根据字体大小调整补偿值
+        x = (width - max_line_width) / 2 + punctuation_compensation
+    else:
+        x = margin_left
+
+    if style_config['center_vertically']:
+        y = (height - layout.height) / 2
+    else:
+        y = margin_top
+
+    # 确保文本不会超出边距
+    x = max(margin_left, min(x, width - margin_right - max_line_width))
+    y = max(margin_top, min(y, height - margin_bottom - layout.height))
+
+    # 创建文本文档
+    doc = QTextDocument()
+    doc.setDefaultFont(font)
+    doc.setTextWidth(available_width)
+    doc.setPlainText(text)
+
+    cursor = QTextCursor(doc)
+    cursor.select(QTextCursor.Document)
+    char_format = QTextCharFormat()
+    char_format.setForeground(QColor(style_config['text_color']))
+    cursor.mergeCharFormat(char_format)
+
+    # 设置行间距
+    block_format = QTextBlockFormat()
+    block_format.setLineHeight(float(style_config['line_spacing']), 0)  # 0 表示使用固定行高
+    cursor.mergeBlockFormat(block_format)
+    laid_out = time.perf_counter()
+
+    frame = background.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(frame)
+    try:
+        painter.setRenderHints(QPainter.Antialiasing | QPainter.TextAntialiasing)
+        painter.translate(x, y)
+        doc.drawContents(painter)
+    finally:
+        painter.end()
+
+    timer = get_preview_timer()
+    timer.add('layout', laid_out - start)
+    timer.add('paint', time.perf_counter() - laid_out)
+    return frame
+
+
+class _FrameSignals(QObject):
+    """预渲染信号"""
+
+    frame_ready = Signal(object, int, str, QImage)  # 帧缓存键，文本索引，文本，预览帧
+    frame_failed = Signal(object, int)  # 帧缓存键，文本索引
+
+
+class _FrameJob(QRunnable):
+    """预渲染任务"""
+
+    def __init__(self, prefetcher: 'PreviewPrefetcher', index: int, text: str):
+        super().__init__()
+        self.prefetcher = prefetcher
+        self.key = prefetcher.frame_key
+        self.state = prefetcher.frame_state
+        self.index = index
+        self.text = text
+
+    def run(self):
+        """渲染预览帧（在线程池线程中运行）"""
+        # 样式或背景已经改变，结果不会再被使用
+        if self.key != self.prefetcher.frame_key:
+            return
+        try:
+            image_path, size, style_config = self.state
+            background = self.prefetcher.background_cache.scaled_image(image_path, size)
+            if background is None:
+                self.prefetcher.signals.frame_failed.emit(self.key, self.index)
+                return
+            frame = render_preview_frame(background, self.text, style_config)
+            self.prefetcher.signals.frame_ready.emit(self.key, self.index, self.text, frame)
+        except Exception as e:
+            logger.error(f"预渲染第 {self.index + 1} 条失败：{str(e)}")
+            # 失败时也要通知GUI线程移出等待集合，否则这一条再也不会被预渲染
+            self.prefetcher.signals.frame_failed.emit(self.key, self.index)
+
+
+class PreviewPrefetcher(QObject):
+    """
+    预览帧预渲染器
+
+    为当前文本前后各 N 条在后台渲染预览帧；样式、背景或预览尺寸
+    改变时整个帧缓存失效
+    """
+
+    def __init__(self, background_cache, prefetch_count: int = 3, parent=None):
+        """
+        初始化预渲染器（必须在GUI线程创建）
+
+        Args:
+            background_cache: 背景图片缓存
+            prefetch_count: 当前文本前后各预渲染的条数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.background_cache = background_cache
+        self.prefetch_count = prefetch_count
+        self.signals = _FrameSignals()
+        self.signals.frame_ready.connect(self._on_frame_ready)
+        self.signals.frame_failed.connect(self._on_frame_failed)
+
+        # 使用独立的线程池，不与导出任务争抢线程
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+
+        # 退出前等待正在运行的任务结束，避免任务访问已销毁的信号对象
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+        self.frame_key: Optional[tuple] = None
+        self.frame_state = None
+        self._frames: "OrderedDict[int, tuple]" = OrderedDict()  # 索引 → (文本, 预览帧)
+        self._pending = set()
+
+    def set_state(self, image_path: str, size: QSize, style_config: Dict):
+        """
+        设置当前背景、预览尺寸和样式；与之前不同时清空帧缓存
+
+        Args:
+            image_path: 背景图片路径
+            size: 预览尺寸
+            style_config: 样式配置
+        """
+        style = serialize_style_config(style_config)
+        key = (image_path, size.width(), size.height(), tuple(sorted(style.items())))
+        if key != self.frame_key:
+            self.invalidate()
+            self.frame_key = key
+            self.frame_state = (image_path, QSize(size), style)
+
+    def invalidate(self):
+        """清空帧缓存并放弃尚未开始的预渲染任务"""
+        self._pool.clear()
+        self._frames.clear()
+        self._pending.clear()
+        self.frame_key = None
+        self.frame_state = None
+
+    def shutdown(self):
+        """放弃排队的任务并等待正在运行的任务结束"""
+        self.invalidate()
+        self._pool.waitForDone()
+
+    def frame(self, index: int, text: str) -> Optional[QImage]:
+        """
+        获取已渲染好的预览帧
+
+        Args:
+            index: 文本索引
+            text: 文本内容（用于确认文本列表没有改变）
+
+        Returns:
+            Optional[QImage]: 预览帧，尚未渲染时返回None
+        """
+        entry = self._frames.get(index)
+        if entry is None or entry[0] != text:
+            return None
+        self._frames.move_to_end(index)
+        return entry[1]
+
+    def store(self, index: int, text: str, frame: QImage):
+        """保存预览帧，超出容量时淘汰最久未使用的帧"""
+        self._frames[index] = (text, frame)
+        self._frames.move_to_end(index)
+        while len(self._frames) > self.prefetch_count * 2 + 2:
+            self._frames.popitem(last=False)
+
+    def prefetch(self, index: int, texts: Sequence):
+        """
+        在后台渲染当前文本前后各 N 条的预览帧
+
+        Args:
+            index: 当前文本索引
+            texts: 文本列表
+        """
+        if self.frame_key is None:
+            return
+
+        # 先渲染紧邻的文本：+1, -1, +2, -2 ...
+        for distance in range(1, self.prefetch_count + 1):
+            for target in (index + distance, index - distance):
+                if not 0 <= target < len(texts) or target in self._pending:
+                    continue
+                text = str(texts[target])
+                if self.frame(target, text) is not None:
+                    continue
+                self._pending.add(target)
+                self._pool.start(_FrameJob(self, target, text))
+
+    def _on_frame_ready(self, key, index, text, frame):
+        """保存后台渲染好的预览帧（在GUI线程中执行）"""
+        if key == self.frame_key:
+            self._pending.discard(index)
+            self.store(index, text, frame)
+
+    def _on_frame_failed(self, key, index):
+        """预渲染失败时移出等待集合，下次预渲染时重试（在GUI线程中执行）"""
+        if key == self.frame_key:
+            self._pending.discard(index)
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+渲染阶段计时模块
+按阶段（解码、缩放、排版、绘制、编码、写入）统计耗时分布，
+每次记录只是一次加锁的计数，可以在正式环境中一直开启
+"""
+
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+# 阶段名称及显示名称（按渲染流程的顺序）
+STAGES = {
+    'decode': "解码",
+    'scale': "缩放",
+    'layout': "排版",
+    'paint': "绘制",
+    'encode': "编码",
+    'write': "写入",
+}
+
+# 直方图桶数：第 i 个桶统计耗时在 [2^(i-1), 2^i) 微秒内的次数，最后一个桶约为 4.6 小时以上
+BUCKET_COUNT = 34
+
+
+class StageHistogram:
+    """单个阶段的耗时直方图（按2的幂次分桶，单位微秒）"""
+
+    __slots__ = ('count', 'total', 'min', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0  # 总耗时（秒）
+        self.min = float('inf')
+        self.max = 0.0
+        self.buckets: List[int] = [0] * BUCKET_COUNT
+
+    def add(self, seconds: float):
+        """记录一次耗时（秒）"""
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), BUCKET_COUNT - 1)] += 1
+
+    def merge(self, other: 'StageHistogram'):
+        """合并另一个直方图"""
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for i, n in enumerate(other.buckets):
+            self.buckets[i] += n
+
+    @property
+    def mean(self) -> float:
+        """平均耗时（秒）"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """
+        估算分位数（在所在桶的上下界之间线性插值，并限制在实际最小值和最大值之间）
+
+        Args:
+            p: 分位（0到100）
+
+        Returns:
+            float: 耗时（秒）
+        """
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            if n and seen + n >= rank:
+                lower = (1 << (i - 1)) if i else 0
+                upper = 1 << i
+                value = (lower + (upper - lower) * (rank - seen) / n) / 1e6
+                return min(max(value, self.min), self.max)
+            seen += n
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """转换为可序列化的字典（可用 from_dict 还原后合并）"""
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.mean * 1000,
+            'min_ms': self.min * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+            'p50_ms': self.percentile(50) * 1000,
+            'p95_ms': self.percentile(95) * 1000,
+            'buckets': self.buckets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StageHistogram':
+        """从 to_dict 的结果还原"""
+        histogram = cls()
+        histogram.count = data['count']
+        histogram.total = data['total_ms'] / 1000
+        histogram.min = data['min_ms'] / 1000 if histogram.count else float('inf')
+        histogram.max = data['max_ms'] / 1000
+        buckets = list(data['buckets'])[:BUCKET_COUNT]
+        histogram.buckets = buckets + [0] * (BUCKET_COUNT - len(buckets))
+        return histogram
+
+
+class _StageContext:
+    """计时上下文：with timer.stage('paint'): ..."""
+
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: 'StageTimer', name: str):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.add(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """各阶段耗时统计（线程安全）"""
+
+    def __init__(self):
+        self._histograms: Dict[str, StageHistogram] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        """
+        记录一次阶段耗时
+
+        Args:
+            name: 阶段名称（见 STAGES）
+            seconds: 耗时（秒）
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = StageHistogram()
+            histogram.add(seconds)
+
+    def stage(self, name: str) -> _StageContext:
+        """返回记录一个阶段耗时的上下文管理器"""
+        return _StageContext(self, name)
+
+    def histogram(self, name: str) -> Optional[StageHistogram]:
+        """获取阶段的直方图，没有记录时返回None"""
+        return self._histograms.get(name)
+
+    def merge(self, other: 'StageTimer'):
+        """合并另一个计时器的统计"""
+        with other._lock:
+            items = [(name, histogram) for name, histogram in other._histograms.items()]
+        with self._lock:
+            for name, histogram in items:
+                self._histograms.setdefault(name, StageHistogram()).merge(histogram)
+
+    def reset(self):
+        """清空统计"""
+        with self._lock:
+            self._histograms.clear()
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """转换为可序列化的字典（阶段名称 → 统计），可跨进程传递"""
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in self._ordered_items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict]) -> 'StageTimer':
+        """从 to_dict 的结果还原"""
+        timer = cls()
+        for name, histogram in data.items():
+            timer._histograms[name] = StageHistogram.from_dict(histogram)
+        return timer
+
+    def _ordered_items(self):
+        """按渲染流程的顺序排列的 (阶段名称, 直方图)"""
+        order = list(STAGES)
+        return sorted(self._histograms.items(),
+                      key=lambda item: order.index(item[0]) if item[0] in order else len(order))
+
+    def summary(self) -> str:
+        """
+        生成一行摘要：各阶段的平均耗时
+
+        Returns:
+            str: 例如 "排版 0.4ms  绘制 5.1ms  编码 21.3ms"
+        """
+        with self._lock:
+            parts = [
+                f"{STAGES.get(name, name)} {histogram.mean * 1000:.1f}ms"
+                for name, histogram in self._ordered_items() if histogram.count
+            ]
+        return "  ".join(parts)
+
+    def details(self) -> str:
+        """生成多行详情：各阶段的次数、平均值、P50、P95和最大值"""
+        with self._lock:
+            lines = [
+                f"{STAGES.get(name, name)}：{histogram.count} 次，平均 {histogram.mean * 1000:.2f}ms，"
+                f"P50 {histogram.percentile(50) * 1000:.2f}ms，P95 {histogram.percentile(95) * 1000:.2f}ms，"
+                f"最大 {histogram.max * 1000:.2f}ms"
+                for name, histogram in self._ordered_items() if histogram.count
+            ]
+        return "\n".join(lines)
+
+    def save(self, path: str):
+        """
+        将统计保存为JSON文件
+
+        Args:
+            path: 文件路径
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stages': self.to_dict()}, f, ensure_ascii=False, indent=2)
+
+
+# 预览渲染共享的计时器
+_preview_timer: Optional[StageTimer] = None
+_preview_timer_lock = threading.Lock()
+
+
+def get_preview_timer() -> StageTimer:
+    """获取预览渲染（含预渲染）共享的阶段计时器"""
+    global _preview_timer
+    with _preview_timer_lock:
+        if _preview_timer is None:
+            _preview_timer = StageTimer()
+        return _preview_timer
@@ -8,22 +8,129 @@
 
 import os
 import pandas as pd
+from collections.abc import Sequence
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+from .text_store import TextStore
+
 @dataclass
 class TextContent:
     """文本内容数据类"""
     chinese: str
     english: Optional[str] = None
     
+class TextContentList(Sequence):
+    """
+    文本内容列表视图
+    
+    中英文分别保存在两个 TextStore 列中，访问时才生成 TextContent 对象
+    """
+    
+    __slots__ = ('chinese', 'english')
+    
+    def __init__(self, chinese: Optional[TextStore] = None, english: Optional[TextStore] = None):
+        """
+        初始化文本内容列表
+        
+        Args:
+            chinese: 中文列
+            english: 英文列（没有英文列时为None）
+        """
+        self.chinese = chinese if chinese is not None else TextStore()
+        self.english = english
+        
+    def __len__(self) -> int:
+        return len(self.chinese)
+        
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return TextContent(
+            chinese=self.chinese[index],
+            english=self.english[index] if self.english is not None else None
+        )
+        
+    def append(self, content: TextContent):
+        """追加一条文本内容"""
+        if content.english is not None and self.english is None:
+            self.english = TextStore([None] * len(self.chinese))
+        self.chinese.append(content.chinese)
+        if self.english is not None:
+            self.english.append(content.english)
+            
+    def clear(self):
+        """清空"""
+        self.chinese = TextStore()
+        self.english = None
+    
+def _clean_column(column: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    按列清理文本：转为字符串并去除首尾空白
+    
+    Args:
+        column: 原始列
+        
+    Returns:
+        Tuple[pd.Series, pd.Series]: (清理后的文本, 有效值掩码)
+    """
+    valid = column.notna()
+    cleaned = column.astype(str).str.strip()
+    return cleaned, valid & (cleaned != "")
+    
+def texts_from_dataframe(df: pd.DataFrame) -> TextContentList:
+    """
+    从表格中提取中英文文本（第一列中文，第二列英文，可选）
+    
+    整列向量化处理：中文为空的行被跳过，英文为空时对应位置为None
+    
+    Args:
+        df: Excel表格数据
+        
+    Returns:
+        TextContentList: 文本内容列表
+        
+    Raises:
+        ValueError: 表格为空或没有列
+    """
+    if df.empty:
+        raise ValueError("Excel文件为空")
+        
+    if len(df.columns) == 0:
+        raise ValueError("Excel文件格式错误：没有列")
+        
+    chinese, keep = _clean_column(df.iloc[:, 0])
+    chinese_column = TextStore(chinese[keep].tolist())
+    
+    english_column = None
+    if len(df.columns) >= 2:
+        english, english_valid = _clean_column(df.iloc[:, 1][keep])
+        english_column = TextStore(english.astype(object).where(english_valid, None).tolist())
+        
+    return TextContentList(chinese_column, english_column)
+    
+def read_text_contents(file_path: str) -> TextContentList:
+    """
+    一次读取Excel文件中的全部中英文文本（批量接口）
+    
+    Args:
+        file_path: Excel文件路径
+        
+    Returns:
+        TextContentList: 文本内容列表
+        
+    Raises:
+        ValueError: 文件为空或格式错误
+    """
+    return texts_from_dataframe(pd.read_excel(file_path))
+    
 class TextProcessor:
     """文本处理器"""
     
     def __init__(self):
         """初始化文本处理器"""
         self.file_path: str = ""
-        self.texts: List[TextContent] = []
+        self.texts = TextContentList()
         self.has_english: bool = False
         self.total_count: int = 0
         
@@ -45,42 +152,9 @@ class TextProcessor:
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"文件不存在：{file_path}")
                 
-            # 读取Excel文件
-            df = pd.read_excel(file_path)
-            
-            # 验证文件格式
-            if df.empty:
-                raise ValueError("Excel文件为空")
-                
-            if len(df.columns) == 0:
-                raise ValueError("Excel文件格式错误：没有列")
-                
-            # 获取列名
-            columns = df.columns.tolist()
-            
-            # 检查是否包含英文列
-            self.has_english = len(columns) >= 2
-            
-            # 清空现有数据
-            self.texts.clear()
-            
-            # 处理每一行
-            for _, row in df.iterrows():
-                chinese_text = str(row[columns[0]]).strip()
-                if not chinese_text or pd.isna(chinese_text):
-                    continue
-                    
-                english_text = None
-                if self.has_english:
-                    english_text = str(row[columns[1]]).strip()
-                    if pd.isna(english_text):
-                        english_text = None
-                        
-                self.texts.append(TextContent(
-                    chinese=chinese_text,
-                    english=english_text
-                ))
-            
+            # 读取Excel文件并按列整体处理
+            self.texts = read_text_contents(file_path)
+            self.has_english = self.texts.english is not None
             self.total_count = len(self.texts)
             self.file_path = file_path
             
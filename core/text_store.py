@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+紧凑文本存储模块
+所有文本编码为UTF-8存放在同一个缓冲区中，按偏移量O(1)随机访问
+"""
+
+import os
+import struct
+from array import array
+from itertools import accumulate, islice
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+
+# 文件格式：魔数、条数、缓冲区字节数、是否有空值标记，随后依次为偏移量、空值标记和缓冲区
+_FILE_MAGIC = b'QMTS'
+_FILE_HEADER = struct.Struct('<4sQQ?')
+
+
+class TextItem:
+    """文本项类（按需从 TextStore 中生成的视图对象）"""
+
+    __slots__ = ('text', 'font_family', 'font_size', 'color')
+
+    def __init__(self, text, font_family=None, font_size=None, color=None):
+        self.text = text
+        self.font_family = font_family
+        self.font_size = font_size
+        self.color = color
+
+    def __str__(self):
+        return self.text
+
+
+class _InternedColumn:
+    """字符串列：相同取值只保存一次，每行只占2字节（0表示未设置）"""
+
+    __slots__ = ('_values', '_lookup', '_codes')
+
+    def __init__(self):
+        self._values: List[str] = []
+        self._lookup = {}
+        self._codes = array('H')
+
+    def get(self, index: int) -> Optional[str]:
+        if index >= len(self._codes):
+            return None
+        code = self._codes[index]
+        return self._values[code - 1] if code else None
+
+    def set(self, index: int, value: Optional[str]):
+        if index >= len(self._codes):
+            self._codes.extend([0] * (index + 1 - len(self._codes)))
+        if value is None:
+            self._codes[index] = 0
+            return
+        code = self._lookup.get(value)
+        if code is None:
+            self._values.append(value)
+            code = len(self._values)
+            self._lookup[value] = code
+        self._codes[index] = code
+
+    def copy(self) -> '_InternedColumn':
+        column = _InternedColumn()
+        column._values = list(self._values)
+        column._lookup = dict(self._lookup)
+        column._codes = array('H', self._codes)
+        return column
+
+
+class TextStore:
+    """
+    紧凑文本存储
+
+    文本依次编码进一个 bytearray，offsets 记录每条的起止位置，
+    每条文本的额外开销约为8字节。支持 None（例如缺失的英文列），
+    以及可选的逐行样式列（字体、字号、颜色），只有设置过才会分配
+    """
+
+    __slots__ = ('_buffer', '_offsets', '_nulls', '_font_family', '_font_size', '_color')
+
+    def __init__(self, texts: Optional[Iterable] = None):
+        """
+        初始化文本存储
+
+        Args:
+            texts: 初始文本，可以是字符串、None 或 TextItem
+        """
+        self._buffer = bytearray()
+        self._offsets = array('Q', [0])
+        self._nulls: Optional[bytearray] = None
+        self._font_family: Optional[_InternedColumn] = None
+        self._font_size: Optional[array] = None
+        self._color: Optional[_InternedColumn] = None
+        if texts is not None:
+            self.extend(texts)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("文本索引超出范围")
+        return self._get(index)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        for i in range(len(self)):
+            yield self._get(i)
+
+    def _get(self, index: int) -> Optional[str]:
+        if self._nulls is not None and self._nulls[index]:
+            return None
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+    @property
+    def nbytes(self) -> int:
+        """缓冲区和偏移量占用的字节数"""
+        size = len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+        if self._nulls is not None:
+            size += len(self._nulls)
+        return size
+
+    def append(self, text):
+        """
+        追加一条文本
+
+        Args:
+            text: 字符串、None 或 TextItem（会同时保存其样式）
+        """
+        index = len(self)
+        if isinstance(text, TextItem):
+            self.set_style(index, text.font_family, text.font_size, text.color)
+            text = text.text
+
+        if text is None:
+            if self._nulls is None:
+                self._nulls = bytearray(index)
+            self._nulls.append(1)
+        else:
+            if not isinstance(text, str):
+                raise ValueError(f"不支持的文本类型：{type(text)}")
+            self._buffer += text.encode('utf-8')
+            if self._nulls is not None:
+                self._nulls.append(0)
+        self._offsets.append(len(self._buffer))
+
+    def extend(self, texts: Iterable):
+        """
+        追加多条文本
+
+        只包含字符串和 None 的列表会整批编码写入，其余情况逐条追加
+
+        Args:
+            texts: 文本，可以是字符串、None 或 TextItem
+        """
+        if isinstance(texts, (list, tuple)) and set(map(type, texts)) <= {str, type(None)}:
+            self._extend_strings(texts)
+            return
+        append = self.append
+        for text in texts:
+            append(text)
+
+    def _extend_strings(self, texts: Sequence[Optional[str]]):
+        """整批追加字符串（None 作为空值）"""
+        has_null = None in texts
+        if has_null:
+            if self._nulls is None:
+                self._nulls = bytearray(len(self))
+            self._nulls += bytes(text is None for text in texts)
+            encoded = [b'' if text is None else text.encode('utf-8') for text in texts]
+        else:
+            if self._nulls is not None:
+                self._nulls += bytes(len(texts))
+            encoded = [text.encode('utf-8') for text in texts]
+
+        base = len(self._buffer)
+        self._buffer += b''.join(encoded)
+        self._offsets.extend(islice(accumulate(map(len, encoded), initial=base), 1, None))
+
+    def copy(self) -> 'TextStore':
+        """复制（用于在后台任务中使用文本快照）"""
+        store = TextStore()
+        store._buffer = bytearray(self._buffer)
+        store._offsets = array('Q', self._offsets)
+        store._nulls = bytearray(self._nulls) if self._nulls is not None else None
+        store._font_family = self._font_family.copy() if self._font_family is not None else None
+        store._font_size = array('H', self._font_size) if self._font_size is not None else None
+        store._color = self._color.copy() if self._color is not None else None
+        return store
+
+    def save(self, path: str):
+        """
+        将文本保存到文件（先写临时文件再替换，不保存逐行样式）
+
+        Args:
+            path: 文件路径
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(_FILE_HEADER.pack(_FILE_MAGIC, len(self), len(self._buffer), self._nulls is not None))
+            self._offsets.tofile(f)
+            if self._nulls is not None:
+                f.write(self._nulls)
+            f.write(self._buffer)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TextStore':
+        """
+        从 save 保存的文件中读取文本
+
+        Args:
+            path: 文件路径
+
+        Returns:
+            TextStore: 文本存储
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            ValueError: 文件格式错误
+        """
+        store = cls()
+        with open(path, 'rb') as f:
+            header = f.read(_FILE_HEADER.size)
+            if len(header) != _FILE_HEADER.size:
+                raise ValueError("文本文件格式错误")
+            magic, count, buffer_size, has_nulls = _FILE_HEADER.unpack(header)
+            if magic != _FILE_MAGIC:
+                raise ValueError("文本文件格式错误")
+            try:
+                store._offsets = array('Q')
+                store._offsets.fromfile(f, count + 1)
+            except EOFError:
+                raise ValueError("文本文件不完整")
+            if has_nulls:
+                store._nulls = bytearray(f.read(count))
+            store._buffer = bytearray(f.read(buffer_size))
+        if len(store._buffer) != buffer_size or store._offsets[-1] != buffer_size:
+            raise ValueError("文本文件不完整")
+        return store
+
+    def set_style(self, index: int, font_family: Optional[str] = None,
+                  font_size: Optional[int] = None, color: Optional[str] = None):
+        """
+        设置某一行的样式（未设置的行使用全局样式）
+
+        Args:
+            index: 行索引
+            font_family: 字体
+            font_size: 字号
+            color: 颜色
+        """
+        if font_family is not None or self._font_family is not None:
+            if self._font_family is None:
+                self._font_family = _InternedColumn()
+            self._font_family.set(index, font_family)
+        if font_size is not None or self._font_size is not None:
+            if self._font_size is None:
+                self._font_size = array('H')
+            if index >= len(self._font_size):
+                self._font_size.extend([0] * (index + 1 - len(self._font_size)))
+            self._font_size[index] = font_size or 0
+        if color is not None or self._color is not None:
+            if self._color is None:
+                self._color = _InternedColumn()
+            self._color.set(index, color)
+
+    def get_item(self, index: int) -> TextItem:
+        """获取某一行的文本及样式"""
+        text = self[index]
+        if index < 0:
+            index += len(self)
+        font_size = None
+        if self._font_size is not None and index < len(self._font_size):
+            font_size = self._font_size[index] or None
+        return TextItem(
+            text,
+            font_family=self._font_family.get(index) if self._font_family else None,
+            font_size=font_size,
+            color=self._color.get(index) if self._color else None
+        )
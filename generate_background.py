@@ -2,41 +2,76 @@
 # -*- coding: utf-8 -*-
 
 """
-生成4:3竖版背景图
+生成背景图片（默认为4:3竖版蓝色渐变）
+
+用法：
+    python generate_background.py                                  # data/images/background.jpg
+    python generate_background.py --colors "#ff9a9e" "#fad0c4" "#fbc2eb" --kind radial --noise 0.03
+    python generate_background.py --count 1000 -o outputs/backgrounds/bg.jpg   # 1000张随机配色（形状相同）
+    python generate_background.py --count 100 --vary-shape --kind radial        # 径向中心和噪点也随机
 """
 
-from PIL import Image, ImageDraw
+import argparse
 import os
+import random
+import sys
+import time
+
+from core.background_generator import GradientSpec, random_colors, random_gradient, save_background
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="生成渐变背景图片")
+    parser.add_argument("--width", type=int, default=900, help="宽度（默认900）")
+    parser.add_argument("--height", type=int, default=1200, help="高度（默认1200）")
+    parser.add_argument("--colors", nargs="+", default=["#87ceeb", "#4682b4"],
+                        help="渐变颜色（#rrggbb），按顺序等间距排列")
+    parser.add_argument("--kind", choices=["linear", "radial"], default="linear", help="渐变类型")
+    parser.add_argument("--angle", type=float, default=0.0, help="线性渐变方向（0为从上到下，90为从左到右）")
+    parser.add_argument("--noise", type=float, default=0.0, help="噪点强度（0到1，例如0.03）")
+    parser.add_argument("--noise-scale", type=int, default=1, help="噪点颗粒大小（像素）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--count", type=int, default=1, help="大于1时生成指定数量的随机配色变体")
+    parser.add_argument("--vary-shape", action="store_true",
+                        help="生成多张时渐变方向、径向中心和噪点也随机（每张都要重新计算，较慢）")
+    parser.add_argument("-o", "--output", default=os.path.join("data", "images", "background.jpg"),
+                        help="输出文件（生成多张时在文件名后加编号）")
+    parser.add_argument("--quality", type=int, default=95, help="JPEG 压缩质量")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+
+    try:
+        spec = GradientSpec.from_colors(args.colors, kind=args.kind, angle=args.angle,
+                                        noise=args.noise, noise_scale=args.noise_scale, seed=args.seed)
+        if args.count <= 1:
+            save_background(spec, args.width, args.height, args.output, args.quality)
+            print(f'背景图片已保存到：{args.output}')
+            print(f'尺寸：{args.width}x{args.height}')
+            return 0
+
+        # 随机配色：形状和噪点不变时渐变位置和噪点只计算一次，每张只需查表和编码
+        rng = random.Random(args.seed)
+        root, ext = os.path.splitext(args.output)
+        start = time.perf_counter()
+        for i in range(args.count):
+            if args.vary_shape:
+                variant = random_gradient(rng, kind=args.kind, colors=len(args.colors), noise=args.noise)
+            else:
+                variant = random_colors(spec, rng)
+            save_background(variant, args.width, args.height, f"{root}_{i + 1:04d}{ext}", args.quality)
+        elapsed = time.perf_counter() - start
+        print(f'已生成 {args.count} 张背景图片（{args.width}x{args.height}），'
+              f'平均每张 {elapsed / args.count * 1000:.1f} 毫秒（含编码和写入）')
+        return 0
+
+    except (ValueError, RuntimeError) as e:
+        print(f'生成背景图片失败：{e}', file=sys.stderr)
+        return 1
 
-def create_gradient_background(width, height, color1=(135, 206, 235), color2=(70, 130, 180)):
-    """创建渐变背景"""
-    image = Image.new('RGB', (width, height))
-    draw = ImageDraw.Draw(image)
-    
-    for y in range(height):
-        r = int(color1[0] + (color2[0] - color1[0]) * y / height)
-        g = int(color1[1] + (color2[1] - color1[1]) * y / height)
-        b = int(color1[2] + (color2[2] - color1[2]) * y / height)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-    
-    return image
-
-def main():
-    # 创建data/images目录（如果不存在）
-    os.makedirs('data/images', exist_ok=True)
-    
-    # 设置图片尺寸（4:3竖版）
-    width = 900   # 3
-    height = 1200  # 4
-    
-    # 创建渐变背景
-    image = create_gradient_background(width, height)
-    
-    # 保存图片
-    output_path = 'data/images/background.jpg'
-    image.save(output_path, quality=95)
-    print(f'背景图片已保存到：{output_path}')
-    print(f'尺寸：{width}x{height} (4:3竖版)')
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main())
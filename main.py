@@ -6,14 +6,51 @@ Quote Maker - 图文生成器
 主程序入口
 """
 
+import time
+
+# 启动计时起点（在导入Qt和界面模块之前）
+_START_TIME = time.perf_counter()
+
+# 冷启动时窗口显示的目标时间（毫秒），超出时在日志中警告
+STARTUP_TARGET_MS = 500
+
 import sys
 import logging
 import os
-from datetime import datetime
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QObject, Signal, Slot
+from core.logging_config import setup_logging
 from ui.main_window import MainWindow
 
+
+class StartupTimer:
+    """启动计时：记录启动各阶段完成的时间，启动完成后输出报告"""
+    
+    def __init__(self, start: float):
+        self.start = start
+        self.marks = []  # (阶段名称, 完成时间)
+        
+    def mark(self, name: str):
+        """记录一个阶段完成"""
+        self.marks.append((name, time.perf_counter()))
+        
+    def elapsed_ms(self, name: str) -> float:
+        """某阶段完成时距启动的毫秒数"""
+        for mark_name, t in self.marks:
+            if mark_name == name:
+                return (t - self.start) * 1000
+        raise KeyError(name)
+        
+    def report(self) -> str:
+        """各阶段耗时报告"""
+        parts = []
+        last = self.start
+        for name, t in self.marks:
+            parts.append(f"{name} {(t - last) * 1000:.0f}ms")
+            last = t
+        return f"启动耗时 {(last - self.start) * 1000:.0f}ms（" + "，".join(parts) + "）"
+
+
 class ApplicationMonitor(QObject):
     """应用程序监视器"""
     error_occurred = Signal(str)  # 错误信号
@@ -22,37 +59,23 @@ class ApplicationMonitor(QObject):
     
     def __init__(self):
         super().__init__()
+        self._log_listener = None
         self.setup_logging()
         
     def setup_logging(self):
-        """设置日志"""
-        # 创建logs目录
+        """设置日志（写文件在后台线程中进行，级别可通过环境变量 QUOTE_MAKER_LOG 设置）"""
         log_dir = os.path.join(os.path.dirname(__file__), 'logs')
-        os.makedirs(log_dir, exist_ok=True)
-        
-        # 设置日志文件名（包含时间戳）
-        log_file = os.path.join(log_dir, f'quote_maker_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-        
-        # 配置日志处理器
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        console_handler = logging.StreamHandler()
-        
-        # 设置日志格式
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 配置根日志记录器
-        root_logger = logging.getLogger()
-        root_logger.setLevel(logging.DEBUG)
-        root_logger.addHandler(file_handler)
-        root_logger.addHandler(console_handler)
+        self._log_listener = setup_logging(log_dir)
         
         # 记录启动信息
         logging.info("日志系统初始化完成")
         
+    def shutdown_logging(self):
+        """写完队列中剩余的日志并停止后台日志线程"""
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+        
     @Slot(str)
     def on_error(self, message):
         """处理错误"""
@@ -74,11 +97,15 @@ class ApplicationMonitor(QObject):
 def main():
     """主程序入口"""
     try:
+        timer = StartupTimer(_START_TIME)
+        timer.mark("导入模块")
         logging.info("程序启动...")
         app = QApplication(sys.argv)
+        timer.mark("创建应用")
         
         # 创建应用监视器
         monitor = ApplicationMonitor()
+        timer.mark("初始化日志")
         
         logging.info("创建应用程序实例...")
         # 设置应用信息
@@ -90,6 +117,18 @@ def main():
         logging.info("创建主窗口...")
         # 创建并显示主窗口
         window = MainWindow(monitor)
+        timer.mark("创建主窗口")
+        
+        def on_startup_finished():
+            timer.mark("加载字体")
+            logging.info(timer.report())
+            if timer.elapsed_ms("首次绘制") > STARTUP_TARGET_MS:
+                logging.warning(f"窗口显示用时超过 {STARTUP_TARGET_MS}ms")
+        
+        window.first_painted.connect(lambda: timer.mark("首次绘制"))
+        window.startup_finished.connect(on_startup_finished)
+        # 最后连接，退出时其他对象的清理日志也能写入文件
+        app.aboutToQuit.connect(monitor.shutdown_logging)
         logging.info("显示主窗口...")
         window.show()
         
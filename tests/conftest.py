@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试公共设施
+
+用法（在项目根目录）：
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+# 必须在导入Qt之前设置，无显示环境下也能运行
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """offscreen 平台的 QGuiApplication（整个测试会话共用一个）"""
+    from PySide6.QtGui import QGuiApplication
+
+    return QGuiApplication.instance() or QGuiApplication([])
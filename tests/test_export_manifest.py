@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量导出测试
+清单对比后的跳过、复用、删除，以及输出目录中其他文件不受影响
+（不实际渲染，用内容摘要作为“图片”内容，便于检查每个文件对应哪条文本）；
+中断后从进度日志继续导出
+"""
+
+import os
+
+from PySide6.QtGui import QColor, QImage
+
+from core.export_manifest import (
+    JOURNAL_NAME, MANIFEST_NAME, ExportManifest, export_incremental, item_digest,
+    load_export_job, plan_incremental_export
+)
+from core.image_encoder import MIN_IMAGE_BYTES, PARTIAL_SUFFIX, EncodeOptions, write_file_atomic
+from core.image_processor import DEFAULT_STYLE_CONFIG, export_file_name
+
+FINGERPRINT = "0" * 64
+
+
+def fake_image(text: str) -> bytes:
+    """text 对应的“图片”内容（不小于 MIN_IMAGE_BYTES）"""
+    return item_digest(FINGERPRINT, text).encode('ascii') * 2
+
+
+def read_image(export_dir: str, index: int) -> bytes:
+    with open(os.path.join(export_dir, export_file_name(index)), 'rb') as f:
+        return f.read()
+
+
+def export(texts, export_dir: str):
+    """按增量导出计划“渲染”需要更新的图片，返回计划"""
+    plan = plan_incremental_export(texts, export_dir, FINGERPRINT)
+    for i in plan.render:
+        write_file_atomic(os.path.join(export_dir, plan.file_name(i)), fake_image(texts[i]))
+        plan.mark_exported(i)
+    plan.manifest.save()
+    return plan
+
+
+def assert_exported(texts, export_dir: str):
+    """每条文本对应的图片都存在、内容正确并记录在清单中"""
+    manifest = ExportManifest.load(export_dir)
+    assert set(manifest.items) == {export_file_name(i) for i in range(len(texts))}
+    for i, text in enumerate(texts):
+        assert read_image(export_dir, i) == fake_image(text)
+        assert manifest.items[export_file_name(i)] == item_digest(FINGERPRINT, text)
+
+
+def test_unchanged_items_are_skipped(tmp_path):
+    texts = ["春眠不觉晓", "处处闻啼鸟", "夜来风雨声"]
+    assert export(texts, str(tmp_path)).render == [0, 1, 2]
+    mtimes = [os.stat(tmp_path / export_file_name(i)).st_mtime_ns for i in range(3)]
+
+    plan = export(texts, str(tmp_path))
+    assert plan.render == []
+    assert plan.unchanged == 3
+    assert [os.stat(tmp_path / export_file_name(i)).st_mtime_ns for i in range(3)] == mtimes
+    assert_exported(texts, str(tmp_path))
+
+
+def test_inserted_row_reuses_moved_images(tmp_path):
+    texts = ["a", "b", "c"]
+    export(texts, str(tmp_path))
+
+    # 在开头插入一行：原来的图片都后移一位，第1张的源文件同时需要重新渲染
+    texts = ["new"] + texts
+    plan = export(texts, str(tmp_path))
+    assert plan.render == [0]
+    assert plan.reused == 3
+    assert_exported(texts, str(tmp_path))
+
+
+def test_duplicated_row_does_not_clobber_source(tmp_path):
+    texts = ["a", "b"]
+    export(texts, str(tmp_path))
+
+    # 第2张改为复用第1张，同时它又是第3张的源文件
+    texts = ["a", "a", "b"]
+    plan = export(texts, str(tmp_path))
+    assert plan.render == []
+    assert plan.unchanged == 1
+    assert plan.reused == 2
+    assert_exported(texts, str(tmp_path))
+
+    # 复用的图片是硬链接，重新渲染其中一张不能改掉另一张
+    texts = ["a", "changed", "b"]
+    export(texts, str(tmp_path))
+    assert_exported(texts, str(tmp_path))
+
+
+def test_removed_rows_are_pruned(tmp_path):
+    export(["a", "b", "c"], str(tmp_path))
+
+    plan = export(["a"], str(tmp_path))
+    assert plan.pruned == 2
+    assert not (tmp_path / export_file_name(1)).exists()
+    assert not (tmp_path / export_file_name(2)).exists()
+    assert_exported(["a"], str(tmp_path))
+
+
+def test_foreign_files_survive(tmp_path):
+    foreign = {
+        "movie.mp4.part": b"partial download",
+        "notes.txt": b"notes",
+        os.path.join(".reuse", "mine.txt"): b"mine",
+        os.path.join(".quote_maker_reuse", "mine.txt"): b"mine",
+    }
+    for name, data in foreign.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(data)
+    # 上次中断时留下的本工具的临时文件
+    (tmp_path / (export_file_name(0) + ".part")).write_bytes(b"stale")
+
+    texts = ["a", "b"]
+    export(texts, str(tmp_path))
+    export(["b", "a"], str(tmp_path))  # 交换两行，经过复用的临时目录
+    export(["b"], str(tmp_path))  # 删除一行
+
+    for name, data in foreign.items():
+        assert (tmp_path / name).read_bytes() == data
+    assert not (tmp_path / (export_file_name(0) + ".part")).exists()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".quote_maker_reuse_")]
+    assert_exported(["b"], str(tmp_path))
+
+
+def test_truncated_images_are_rendered_again(tmp_path):
+    texts = ["a", "b", "c"]
+    export(texts, str(tmp_path))
+    (tmp_path / export_file_name(1)).write_bytes(b"")
+    (tmp_path / export_file_name(2)).write_bytes(b"x" * (MIN_IMAGE_BYTES - 1))
+
+    plan = export(texts, str(tmp_path))
+    assert plan.render == [1, 2]
+    assert plan.unchanged == 1
+    assert_exported(texts, str(tmp_path))
+
+
+def test_resume_renders_only_missing_images(qt_app, tmp_path):
+    background_path = str(tmp_path / "background.png")
+    background = QImage(120, 80, QImage.Format_RGB32)
+    background.fill(QColor("#f0e0d0"))
+    assert background.save(background_path)
+
+    export_dir = tmp_path / "export"
+    texts = ["一", "二", "三", "四", "五"]
+    plan = export_incremental(texts, str(export_dir), background_path, dict(DEFAULT_STYLE_CONFIG))
+    assert plan.exported == 5
+    digests = ExportManifest.load(str(export_dir)).items
+
+    # 模拟第3张导出时崩溃：清单中只有第1张，进度日志中有第2张和写了一半的第3张，
+    # 第3张的临时文件还在，之后的图片尚未导出
+    manifest = ExportManifest.load(str(export_dir))
+    manifest.job.completed = False
+    manifest.items = {export_file_name(0): digests[export_file_name(0)]}
+    manifest.save()
+    with open(export_dir / JOURNAL_NAME, 'w', encoding='utf-8') as f:
+        f.write(f"{export_file_name(1)}\t{digests[export_file_name(1)]}\n")
+        f.write(f"{export_file_name(2)}\t{digests[export_file_name(2)][:20]}")
+    for i in range(2, 5):
+        os.remove(export_dir / export_file_name(i))
+    (export_dir / (export_file_name(2) + PARTIAL_SUFFIX)).write_bytes(b"partial")
+    mtimes = [os.stat(export_dir / export_file_name(i)).st_mtime_ns for i in range(2)]
+
+    job, saved_texts = load_export_job(str(export_dir))
+    assert not job.completed
+    assert list(saved_texts) == texts
+
+    plan = export_incremental(
+        saved_texts, str(export_dir), job.background_path, job.style_config,
+        font_scale=job.font_scale, fonts_dir=job.fonts_dir,
+        encode_options=EncodeOptions.from_dict(job.encode_options)
+    )
+    assert plan.render == [2, 3, 4]
+    assert plan.exported == 3
+    assert plan.unchanged == 2
+    assert [os.stat(export_dir / export_file_name(i)).st_mtime_ns for i in range(2)] == mtimes
+
+    manifest = ExportManifest.load(str(export_dir))
+    assert manifest.items == digests
+    assert manifest.job.completed
+    assert not (export_dir / JOURNAL_NAME).exists()
+    assert (export_dir / MANIFEST_NAME).exists()
+    assert not [name for name in os.listdir(export_dir) if name.endswith(PARTIAL_SUFFIX)]
+    for i in range(5):
+        assert os.path.getsize(export_dir / export_file_name(i)) >= MIN_IMAGE_BYTES
@@ -9,11 +9,12 @@ import logging
 import os
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QFileDialog, QFrame, QScrollArea
+    QLabel, QFileDialog, QFrame, QTableView, QHeaderView
 )
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QDragEnterEvent, QDropEvent, QPixmap, QDragLeaveEvent
+from PySide6.QtGui import QDragEnterEvent, QDropEvent, QDragLeaveEvent
 from PySide6.QtGui import QIcon
+from .text_list_model import TextListModel
 
 logger = logging.getLogger(__name__)
 
@@ -47,8 +48,16 @@ class ContentTab(QWidget):
     def __init__(self, data_manager):
         super().__init__()
         self.data_manager = data_manager
+        self._file_name = ""
+        self._file_size = 0
         self.init_ui()
         
+        # 连接数据管理器信号
+        self.data_manager.texts_changed.connect(self.update_text_preview)
+        self.data_manager.current_index_changed.connect(self.on_current_index_changed)
+        self.data_manager.load_progress.connect(self.on_load_progress)
+        self.data_manager.load_finished.connect(self.on_load_finished)
+        
     def init_ui(self):
         """初始化界面"""
         layout = QHBoxLayout(self)
@@ -126,41 +135,60 @@ class ContentTab(QWidget):
         """)
         text_layout.addWidget(self.file_info)
         
-        # 文本预览区域
-        preview_scroll = QScrollArea()
-        preview_scroll.setWidgetResizable(True)
-        preview_scroll.setStyleSheet("""
-            QScrollArea {
-                border: none;
-                background-color: transparent;
-            }
-        """)
-        
-        preview_widget = QWidget()
-        preview_layout = QVBoxLayout(preview_widget)
-        preview_layout.setContentsMargins(0, 16, 0, 0)
+        # 取消加载按钮（仅在加载过程中显示）
+        self.cancel_load_btn = QPushButton("取消加载")
+        self.cancel_load_btn.clicked.connect(self.data_manager.cancel_load)
+        self.cancel_load_btn.hide()
+        text_layout.addWidget(self.cancel_load_btn)
         
+        # 文本预览区域
         preview_label = QLabel("文本预览")
         preview_label.setStyleSheet("""
             font-size: 16px;
             font-weight: bold;
             color: #333333;
+            margin-top: 16px;
             margin-bottom: 8px;
         """)
-        preview_layout.addWidget(preview_label)
+        text_layout.addWidget(preview_label)
         
         self.text_preview = QLabel("暂无文本内容")
-        self.text_preview.setWordWrap(True)
         self.text_preview.setStyleSheet("""
             color: #666666;
             font-size: 14px;
-            line-height: 1.6;
         """)
-        preview_layout.addWidget(self.text_preview)
-        preview_layout.addStretch()
+        text_layout.addWidget(self.text_preview)
         
-        preview_scroll.setWidget(preview_widget)
-        text_layout.addWidget(preview_scroll)
+        # 使用模型/视图只为可见行排版，适合大量文本
+        self.text_model = TextListModel(self.data_manager, self)
+        # QTableView 在固定行高下只计算可见行，百万行也能流畅滚动
+        self.text_list = QTableView()
+        self.text_list.setModel(self.text_model)
+        self.text_list.setShowGrid(False)
+        self.text_list.setWordWrap(False)
+        self.text_list.setSelectionBehavior(QTableView.SelectRows)
+        self.text_list.setSelectionMode(QTableView.SingleSelection)
+        self.text_list.setEditTriggers(QTableView.NoEditTriggers)
+        self.text_list.horizontalHeader().hide()
+        self.text_list.horizontalHeader().setStretchLastSection(True)
+        self.text_list.verticalHeader().hide()
+        self.text_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.text_list.verticalHeader().setDefaultSectionSize(28)
+        self.text_list.setStyleSheet("""
+            QTableView {
+                border: none;
+                background-color: transparent;
+                color: #666666;
+                font-size: 14px;
+            }
+            QTableView::item:selected {
+                background-color: #f0f7ff;
+                color: #4a90e2;
+            }
+        """)
+        self.text_list.clicked.connect(self.on_text_clicked)
+        text_layout.addWidget(self.text_list, stretch=1)
+        self.text_list.hide()
         
         layout.addWidget(text_card, stretch=1)
         
@@ -281,46 +309,63 @@ class ContentTab(QWidget):
             self.load_excel_file(file_path)
     
     def load_excel_file(self, file_path):
-        """加载Excel文件"""
+        """加载Excel文件（在后台流式读取，第一块读完即可预览）"""
         try:
             logger.info(f"开始加载Excel文件: {file_path}")
-            # 使用数据管理器加载Excel文件
-            self.data_manager.load_excel(file_path)
+            # 使用数据管理器在后台加载Excel文件
+            self.data_manager.load_excel_async(file_path)
             
             # 更新文件信息
-            file_name = os.path.basename(file_path)
-            file_size = os.path.getsize(file_path)
+            self._file_name = os.path.basename(file_path)
+            self._file_size = os.path.getsize(file_path)
             self.file_info.setText(
-                f"文件名：{file_name}\n"
-                f"大小：{file_size / 1024:.1f} KB"
+                f"文件名：{self._file_name}\n"
+                f"大小：{self._file_size / 1024:.1f} KB\n"
+                f"正在加载..."
             )
-            
-            # 更新文本预览
-            self.update_text_preview()
-            
-            logger.info(f"Excel文件加载成功")
+            self.cancel_load_btn.show()
             
         except Exception as e:
             logger.error(f"加载Excel文件失败：{str(e)}")
             self.file_info.setText("文件加载失败")
             
+    def on_load_progress(self, loaded, total):
+        """显示Excel加载进度"""
+        self.file_info.setText(
+            f"文件名：{self._file_name}\n"
+            f"大小：{self._file_size / 1024:.1f} KB\n"
+            f"正在加载：{loaded} / 约 {total} 条"
+        )
+        
+    def on_load_finished(self, count, canceled):
+        """处理Excel加载结束"""
+        self.cancel_load_btn.hide()
+        status = "已取消" if canceled else "加载完成"
+        self.file_info.setText(
+            f"文件名：{self._file_name}\n"
+            f"大小：{self._file_size / 1024:.1f} KB\n"
+            f"{status}：共 {count} 条"
+        )
+        logger.info(f"Excel文件加载结束，共 {count} 条")
+            
     def update_text_preview(self):
-        """更新文本预览"""
-        try:
-            texts = self.data_manager.get_texts()
-            if texts:
-                preview_text = "\n\n".join(
-                    f"{i+1}. {text}" for i, text in enumerate(texts)
-                )
-                self.text_preview.setText(preview_text)
-                logger.info(f"更新文本预览，共 {len(texts)} 条")
-            else:
-                self.text_preview.setText("无文本内容")
-                logger.info("文本预览为空")
-                
-        except Exception as e:
-            logger.error(f"更新文本预览失败：{str(e)}")
-            self.text_preview.setText("预览失败")
+        """根据是否有文本切换列表和空提示"""
+        count = self.text_model.rowCount()
+        self.text_list.setVisible(count > 0)
+        self.text_preview.setVisible(count == 0)
+        logger.debug(f"更新文本预览，共 {count} 条")
+            
+    def on_text_clicked(self, index):
+        """点击列表中的文本，切换为当前文本"""
+        if index.isValid():
+            self.data_manager.set_current_index(index.row())
+            
+    def on_current_index_changed(self, index, total):
+        """当前文本改变时同步列表中的选中行"""
+        if 0 <= index < self.text_model.rowCount():
+            model_index = self.text_model.index(index)
+            self.text_list.setCurrentIndex(model_index)
+            self.text_list.scrollTo(model_index)
     
     def select_image(self):
         """选择图片"""
@@ -343,17 +388,8 @@ class ContentTab(QWidget):
             self.data_manager.set_image(file_path)
             
             # 更新预览
-            pixmap = QPixmap(file_path)
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(
-                    self.image_preview.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.image_preview.setPixmap(scaled_pixmap)
-                logger.info("图片加载成功")
-            else:
-                logger.error("无法加载图片")
+            self.update_image_preview()
+            logger.info("图片加载成功")
                 
         except Exception as e:
             logger.error(f"加载图片失败：{str(e)}")
@@ -361,12 +397,18 @@ class ContentTab(QWidget):
     def resizeEvent(self, event):
         """处理窗口大小改变事件"""
         super().resizeEvent(event)
-        # 如果有图片，重新调整大小
-        if self.image_preview.pixmap():
-            pixmap = self.image_preview.pixmap()
-            scaled_pixmap = pixmap.scaled(
-                self.image_preview.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.image_preview.setPixmap(scaled_pixmap) 
\ No newline at end of file
+        # 如果有图片，按新的大小从缓存中取缩放结果
+        if self.data_manager.get_image():
+            self.update_image_preview()
+            
+    def update_image_preview(self):
+        """按预览区域大小显示当前背景图片"""
+        pixmap = self.data_manager.background_cache.scaled_pixmap(
+            self.data_manager.get_image(),
+            self.image_preview.size()
+        )
+        if pixmap is not None:
+            self.image_preview.setPixmap(pixmap)
+            logger.debug("图片预览已更新")
+        else:
+            logger.error("无法加载图片")
@@ -8,7 +8,6 @@
 import os
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QTextBrowser, QPushButton
 from PySide6.QtCore import Qt
-import markdown
 
 class HelpDialog(QDialog):
     """帮助对话框类"""
@@ -73,7 +72,8 @@ class HelpDialog(QDialog):
             with open(docs_path, 'r', encoding='utf-8') as f:
                 md_content = f.read()
             
-            # 转换Markdown为HTML
+            # 转换Markdown为HTML（markdown 只在打开帮助时才导入）
+            import markdown
             html_content = markdown.markdown(
                 md_content,
                 extensions=['tables', 'fenced_code']
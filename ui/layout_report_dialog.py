@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+排版检查结果对话框模块
+"""
+
+import logging
+import os
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableView, QHeaderView, QFileDialog, QMessageBox, QAbstractItemView
+)
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+
+from core.layout_check import KIND_NAMES
+
+logger = logging.getLogger(__name__)
+
+class LayoutIssueModel(QAbstractTableModel):
+    """排版问题表格模型：视图只为可见行取数据，10万条问题也不会卡住界面"""
+
+    HEADERS = ["序号", "问题", "超出", "字号", "文本"]
+    MAX_DISPLAY_LENGTH = 100  # 表格中每行最多显示的字符数
+
+    def __init__(self, issues, parent=None):
+        super().__init__(parent)
+        self.issues = issues
+
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        return 0 if parent.isValid() else len(self.issues)
+
+    def columnCount(self, parent=QModelIndex()):
+        """列数"""
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        """表头"""
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        """返回指定单元格的数据"""
+        if not index.isValid() or not 0 <= index.row() < len(self.issues):
+            return None
+
+        issue = self.issues[index.row()]
+        if role == Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return issue.index + 1
+            if column == 1:
+                return KIND_NAMES[issue.kind]
+            if column == 2:
+                return f"{issue.excess:.0f}px"
+            if column == 3:
+                return issue.box.font_size
+            text = " ".join(issue.text.split("\n"))
+            if len(text) > self.MAX_DISPLAY_LENGTH:
+                text = text[:self.MAX_DISPLAY_LENGTH] + "…"
+            return text
+        if role == Qt.ToolTipRole:
+            return issue.text
+        return None
+
+
+class LayoutReportDialog(QDialog):
+    """排版检查结果对话框：列出超出边距或画面的文本，可保存为CSV"""
+
+    issue_activated = Signal(int)  # 双击某一行（传递文本索引）
+
+    def __init__(self, report, parent=None):
+        super().__init__(parent)
+        self.report = report
+        self.setWindowTitle("排版检查")
+        self.setMinimumSize(720, 480)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(16, 16, 16, 16)
+        layout.setSpacing(12)
+
+        # 只显示汇总行，具体文本在表格中列出
+        summary = QLabel(report.summary(limit=0).split("\n")[0])
+        summary.setWordWrap(True)
+        layout.addWidget(summary)
+
+        self.table = QTableView()
+        self.table.setModel(LayoutIssueModel(report.issues, self))
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setToolTip("双击跳转到该条文本")
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        save_button = QPushButton("保存CSV")
+        save_button.setEnabled(bool(report.issues))
+        save_button.clicked.connect(self.save_csv)
+        close_button = QPushButton("关闭")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(save_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def on_double_clicked(self, index):
+        """双击跳转到对应文本"""
+        self.issue_activated.emit(self.report.issues[index.row()].index)
+
+    def save_csv(self):
+        """将检查结果保存为CSV"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "保存排版检查结果", os.path.join(os.getcwd(), "layout_report.csv"), "CSV 文件 (*.csv)"
+        )
+        if not path:
+            return
+        try:
+            self.report.write_csv(path)
+            logger.info(f"排版检查结果已保存到：{path}")
+        except OSError as e:
+            logger.error(f"保存排版检查结果失败: {str(e)}")
+            QMessageBox.critical(self, "错误", f"保存失败: {str(e)}")
@@ -9,13 +9,12 @@ import logging
 import os
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QStackedWidget, QPushButton, QLabel, QFrame
+    QStackedWidget, QPushButton, QLabel, QFrame, QProgressBar
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QIcon, QFont
 from .content_tab import ContentTab
 from .style_tab import StyleTab
-from .help_dialog import HelpDialog
 from core.data_manager import DataManager
 
 logger = logging.getLogger(__name__)
@@ -23,8 +22,12 @@ logger = logging.getLogger(__name__)
 class MainWindow(QMainWindow):
     """主窗口类"""
     
+    first_painted = Signal()  # 窗口第一次绘制完成
+    startup_finished = Signal()  # 延迟的初始化（字体列表等）完成
+    
     def __init__(self, monitor):
         super().__init__()
+        self._first_paint_done = False
         # 保存监视器引用
         self.monitor = monitor
         # 创建数据管理器
@@ -43,6 +46,7 @@ class MainWindow(QMainWindow):
         
         # 创建状态栏
         self.statusBar().showMessage("就绪")
+        self.init_export_status()
         
         logger.info("主窗口初始化完成")
         
@@ -171,8 +175,81 @@ class MainWindow(QMainWindow):
         self.content_btn.clicked.connect(lambda: self.switch_page(0))
         self.style_btn.clicked.connect(lambda: self.switch_page(1))
         
-        # 加载系统字体
+    def paintEvent(self, event):
+        """第一次绘制后再执行耗时的初始化，使窗口尽快显示"""
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self.first_painted.emit()
+            QTimer.singleShot(0, self.finish_startup)
+        
+    def finish_startup(self):
+        """延迟的初始化：加载字体列表"""
         self.style_tab.load_system_fonts()
+        self.startup_finished.emit()
+        
+    def init_export_status(self):
+        """在状态栏中创建导出进度显示"""
+        self.export_label = QLabel()
+        self.export_progress = QProgressBar()
+        self.export_progress.setFixedWidth(200)
+        self.export_progress.setTextVisible(False)
+        self.export_cancel_btn = QPushButton("取消导出")
+        self.export_cancel_btn.setStyleSheet("padding: 2px 12px; border-radius: 4px;")
+        self.export_cancel_btn.clicked.connect(self.style_tab.cancel_export)
+        
+        # 各阶段平均耗时（导出时显示导出的统计，否则显示预览的统计）
+        self.timing_label = QLabel()
+        self.timing_label.setStyleSheet("color: #888;")
+        self.timing_label.setToolTip("各阶段平均耗时（解码、缩放、排版、绘制、编码、写入），导出的完整统计保存在输出目录的 timings.json 中")
+        self._exporting = False
+        
+        for widget in (self.export_label, self.export_progress, self.export_cancel_btn):
+            self.statusBar().addPermanentWidget(widget)
+            widget.hide()
+        self.statusBar().addPermanentWidget(self.timing_label)
+        
+        self.style_tab.export_started.connect(self.on_export_started)
+        self.style_tab.export_progress.connect(self.on_export_progress)
+        self.style_tab.export_finished.connect(self.on_export_finished)
+        self.style_tab.export_timings.connect(self.on_export_timings)
+        self.style_tab.preview_timings.connect(self.on_preview_timings)
+        
+    def on_export_started(self, total):
+        """处理导出开始"""
+        self.export_progress.setRange(0, total)
+        self.export_progress.setValue(0)
+        self.export_label.setText(f"正在导出 0/{total}")
+        self._exporting = True
+        for widget in (self.export_label, self.export_progress, self.export_cancel_btn):
+            widget.show()
+        
+    def on_export_progress(self, done, total, rate, eta):
+        """显示导出进度、速度和预计剩余时间"""
+        self.export_progress.setValue(done)
+        text = f"正在导出 {done}/{total}  {rate:.1f} 张/秒"
+        if eta >= 0:
+            minutes, seconds = divmod(int(eta), 60)
+            text += f"  剩余 {minutes:02d}:{seconds:02d}"
+        self.export_label.setText(text)
+        
+    def on_export_finished(self, export_dir, exported, canceled):
+        """处理导出结束"""
+        self._exporting = False
+        for widget in (self.export_label, self.export_progress, self.export_cancel_btn):
+            widget.hide()
+        if export_dir:
+            status = "导出已取消" if canceled else "导出完成"
+            self.monitor.info_occurred.emit(f"{status}：{exported} 张图片")
+        
+    def on_export_timings(self, summary):
+        """显示导出各阶段的平均耗时"""
+        self.timing_label.setText(f"导出：{summary}")
+        
+    def on_preview_timings(self, summary):
+        """显示预览各阶段的平均耗时（导出进行中时不覆盖导出的统计）"""
+        if not self._exporting and summary:
+            self.timing_label.setText(f"预览：{summary}")
         
     def switch_page(self, index):
         """切换页面"""
@@ -212,5 +289,6 @@ class MainWindow(QMainWindow):
     def show_help(self):
         """显示帮助对话框"""
         logger.debug("打开帮助对话框")
+        from .help_dialog import HelpDialog
         help_dialog = HelpDialog(self)
         help_dialog.exec_() 
\ No newline at end of file
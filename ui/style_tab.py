@@ -10,13 +10,22 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QSpinBox, QComboBox, QColorDialog,
     QFrame, QGraphicsView, QGraphicsScene, QProgressBar,
-    QProgressDialog, QMessageBox, QFileDialog
+    QMessageBox, QFileDialog, QCheckBox, QProgressDialog
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor, QFont, QFontDatabase, QPixmap, QPainter, QImage, QTextBlockFormat, QTextCursor, QTextDocument, QTextCharFormat
-from datetime import datetime
+from PySide6.QtCore import Qt, Signal, QThreadPool, QTimer
+from PySide6.QtGui import QColor, QFontDatabase, QImageReader, QPixmap, QPainter
 import os
 
+from core.export_manifest import load_export_job
+from core.export_worker import ExportWorker
+from core.font_manager import CoverageCheckWorker, get_font_manager
+from core.image_encoder import EncodeOptions, available_formats
+from core.image_processor import create_export_dir
+from core.layout_check import LayoutCheckWorker
+from core.preview_renderer import PreviewPrefetcher, render_preview_frame
+from core.parallel_export import default_worker_count
+from core.stage_timer import get_preview_timer
+
 logger = logging.getLogger(__name__)
 
 class PreviewCard(QFrame):
@@ -72,6 +81,14 @@ class StyleTab(QWidget):
     """样式设计页面类"""
     
     style_changed = Signal()  # 样式改变信号
+    export_started = Signal(int)  # 导出开始信号（总数）
+    export_progress = Signal(int, int, float, float)  # 导出进度信号（已完成，总数，每秒条数，剩余秒数）
+    export_finished = Signal(str, int, bool)  # 导出结束信号（导出目录，成功条数，是否取消）
+    export_timings = Signal(str)  # 导出各阶段平均耗时摘要
+    preview_timings = Signal(str)  # 预览各阶段平均耗时摘要
+    
+    PREVIEW_INTERVAL_MS = 16  # 预览刷新合并窗口（约一帧）
+    PREFETCH_COUNT = 3  # 当前文本前后各预渲染的条数
     
     def __init__(self, data_manager, monitor):
         super().__init__()
@@ -79,6 +96,7 @@ class StyleTab(QWidget):
         self.monitor = monitor
         self.style_config = {
             'font_family': 'Arial',
+            'fallback_family': '',
             'font_size': 24,
             'text_color': QColor('#000000'),
             'line_spacing': 1.5,
@@ -87,21 +105,53 @@ class StyleTab(QWidget):
             'margin_left': 50,
             'margin_right': 50,
             'center_horizontally': True,
-            'center_vertically': True
+            'center_vertically': True,
+            'auto_fit': False,
+            'min_font_size': 12,
+            'max_font_size': 72
         }
         
         # 添加字体文件夹路径
         self.fonts_dir = os.path.join(os.getcwd(), "fonts")
         os.makedirs(self.fonts_dir, exist_ok=True)
         
-        # 存储已加载的自定义字体ID
-        self.custom_font_ids = set()
+        # 自定义字体索引（字体选中时才注册到字体数据库）
+        self.font_manager = get_font_manager(self.fonts_dir)
+        
+        # 正在进行的后台导出任务
+        self._export_worker = None
+        
+        # 正在进行的排版检查任务
+        self._layout_worker = None
+        self._layout_progress = None
+        
+        # 正在进行的缺字检查任务
+        self._coverage_worker = None
+        self._coverage_progress = None
+        
+        # 增量导出的固定输出目录（清单保存在其中）
+        self.incremental_dir = os.path.join(os.getcwd(), "outputs", "incremental")
+        
+        # 预览刷新合并定时器：连续的样式改变只触发一次渲染
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(self.PREVIEW_INTERVAL_MS)
+        self._preview_timer.timeout.connect(self.update_preview)
+        
+        # 相邻文本预渲染器
+        self.prefetcher = PreviewPrefetcher(
+            self.data_manager.background_cache,
+            prefetch_count=self.PREFETCH_COUNT,
+            parent=self
+        )
+        self.data_manager.texts_changed.connect(self.prefetcher.invalidate)
         
         self.init_ui()
         
         # 连接数据管理器信号
-        self.data_manager.image_changed.connect(self.update_preview)
-        self.data_manager.texts_changed.connect(self.update_preview)
+        self.data_manager.image_changed.connect(self.schedule_preview)
+        self.data_manager.texts_changed.connect(self.schedule_preview)
+        self.data_manager.texts_appended.connect(self.schedule_preview)
         self.data_manager.current_index_changed.connect(self.on_current_index_changed)
         
         logger.info("样式设计页面初始化完成")
@@ -187,6 +237,19 @@ class StyleTab(QWidget):
         upload_btn.clicked.connect(self.upload_font)
         font_layout.addWidget(upload_btn)
         
+        # 备用字体：主字体缺少文本中的字符时使用
+        self.fallback_combo = QComboBox()
+        self.fallback_combo.setToolTip("文本中有字体缺少的字符时，整条文本改用备用字体")
+        self.coverage_btn = QPushButton("检查缺字")
+        self.coverage_btn.setObjectName("font-btn")
+        self.coverage_btn.setToolTip("检查所有文本中当前字体缺少的字符（不渲染图片）")
+        self.coverage_btn.clicked.connect(self.check_coverage)
+        fallback_row = QHBoxLayout()
+        fallback_row.addWidget(QLabel("备用字体:"))
+        fallback_row.addWidget(self.fallback_combo)
+        fallback_row.addWidget(self.coverage_btn)
+        font_layout.addLayout(fallback_row)
+        
         self.size_spin = QSpinBox()
         self.size_spin.setRange(8, 72)
         self.size_spin.setValue(self.style_config['font_size'])
@@ -196,6 +259,23 @@ class StyleTab(QWidget):
         size_row.addWidget(self.size_spin)
         font_layout.addLayout(size_row)
         
+        # 自动字号：每条文本使用能放入边距内的最大字号
+        self.auto_fit_check = QCheckBox("自动字号")
+        self.auto_fit_check.setToolTip("每条文本使用能放入边距内的最大字号（在最小和最大字号之间）")
+        self.min_size_spin = QSpinBox()
+        self.min_size_spin.setRange(8, 200)
+        self.min_size_spin.setValue(self.style_config['min_font_size'])
+        self.max_size_spin = QSpinBox()
+        self.max_size_spin.setRange(8, 200)
+        self.max_size_spin.setValue(self.style_config['max_font_size'])
+        auto_fit_row = QHBoxLayout()
+        auto_fit_row.addWidget(self.auto_fit_check)
+        auto_fit_row.addWidget(QLabel("最小:"))
+        auto_fit_row.addWidget(self.min_size_spin)
+        auto_fit_row.addWidget(QLabel("最大:"))
+        auto_fit_row.addWidget(self.max_size_spin)
+        font_layout.addLayout(auto_fit_row)
+        
         self.color_btn = QPushButton("文字颜色")
         self.color_btn.setObjectName("color-btn")
         font_layout.addWidget(self.color_btn)
@@ -232,11 +312,87 @@ class StyleTab(QWidget):
         center_btn.clicked.connect(self.center_text)
         settings_layout.addWidget(center_btn)
         
+        # 并行导出进程数
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, default_worker_count())
+        self.workers_spin.setValue(1)
+        self.workers_spin.setToolTip("大于1时使用多进程并行导出")
+        workers_row = QHBoxLayout()
+        workers_row.addWidget(QLabel("导出进程数:"))
+        workers_row.addWidget(self.workers_spin)
+        settings_layout.addLayout(workers_row)
+        
+        # 导出格式和压缩质量
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(available_formats())
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(0, 100)
+        self.quality_spin.setValue(EncodeOptions().quality)
+        self.format_combo.currentTextChanged.connect(self.on_format_changed)
+        self.on_format_changed(self.format_combo.currentText())
+        self.optimize_check = QCheckBox("优化")
+        self.optimize_check.setToolTip("JPEG 生成优化的编码表，PNG 使用最高压缩级别（文件更小，导出更慢）")
+        format_row = QHBoxLayout()
+        format_row.addWidget(QLabel("导出格式:"))
+        format_row.addWidget(self.format_combo)
+        format_row.addWidget(QLabel("质量:"))
+        format_row.addWidget(self.quality_spin)
+        format_row.addWidget(self.optimize_check)
+        settings_layout.addLayout(format_row)
+        
+        # 导出尺寸：宽高为0（自动）时按DPI换算，DPI也为0时为背景的2倍
+        self.output_width_spin = QSpinBox()
+        self.output_width_spin.setRange(0, 20000)
+        self.output_width_spin.setSpecialValueText("自动")
+        self.output_width_spin.setSuffix("px")
+        self.output_width_spin.setToolTip("输出宽度，只设置宽度时按背景比例计算高度")
+        self.output_height_spin = QSpinBox()
+        self.output_height_spin.setRange(0, 20000)
+        self.output_height_spin.setSpecialValueText("自动")
+        self.output_height_spin.setSuffix("px")
+        self.output_height_spin.setToolTip("输出高度，只设置高度时按背景比例计算宽度")
+        self.dpi_spin = QSpinBox()
+        self.dpi_spin.setRange(0, 1200)
+        self.dpi_spin.setSpecialValueText("自动")
+        self.dpi_spin.setToolTip("背景每像素按1磅（72 DPI）换算输出尺寸，并写入图片文件；自动为144 DPI（背景的2倍）")
+        size_row = QHBoxLayout()
+        size_row.addWidget(QLabel("导出尺寸:"))
+        size_row.addWidget(self.output_width_spin)
+        size_row.addWidget(QLabel("×"))
+        size_row.addWidget(self.output_height_spin)
+        size_row.addWidget(QLabel("DPI:"))
+        size_row.addWidget(self.dpi_spin)
+        settings_layout.addLayout(size_row)
+        
+        # 增量导出：固定输出目录，只重新导出有变化的图片
+        self.incremental_check = QCheckBox("增量导出")
+        self.incremental_check.setToolTip(f"只导出有变化的图片，输出目录：{self.incremental_dir}")
+        self.incremental_dir_btn = QPushButton("选择目录")
+        self.incremental_dir_btn.setEnabled(False)
+        self.incremental_dir_btn.clicked.connect(self.choose_incremental_dir)
+        self.incremental_check.toggled.connect(self.incremental_dir_btn.setEnabled)
+        incremental_row = QHBoxLayout()
+        incremental_row.addWidget(self.incremental_check)
+        incremental_row.addWidget(self.incremental_dir_btn)
+        settings_layout.addLayout(incremental_row)
+        
         # 添加批量导出按钮
-        export_btn = QPushButton("批量导出")
-        export_btn.setObjectName("center-btn")  # 使用相同的样式
-        export_btn.clicked.connect(self.export_all)
-        settings_layout.addWidget(export_btn)
+        self.export_btn = QPushButton("批量导出")
+        self.export_btn.setObjectName("center-btn")  # 使用相同的样式
+        self.export_btn.clicked.connect(self.export_all)
+        settings_layout.addWidget(self.export_btn)
+        
+        # 继续中断的导出
+        self.resume_btn = QPushButton("继续导出")
+        self.resume_btn.setToolTip("选择之前中断的导出目录，只导出尚未完成的图片")
+        self.resume_btn.clicked.connect(self.resume_export)
+        settings_layout.addWidget(self.resume_btn)
+        
+        # 排版检查：只排版不绘制，找出超出边距或画面的文本
+        self.layout_check_btn = QPushButton("检查排版")
+        self.layout_check_btn.setToolTip("导出前检查所有文本是否超出边距或画面（不渲染图片）")
+        self.layout_check_btn.clicked.connect(self.check_layout)
+        settings_layout.addWidget(self.layout_check_btn)
         
         settings_layout.addStretch()
         
@@ -248,7 +404,11 @@ class StyleTab(QWidget):
         
         # 连接信号
         self.font_combo.currentTextChanged.connect(self.on_style_changed)
+        self.fallback_combo.currentIndexChanged.connect(self.on_style_changed)
         self.size_spin.valueChanged.connect(self.on_style_changed)
+        self.auto_fit_check.toggled.connect(self.on_style_changed)
+        self.min_size_spin.valueChanged.connect(self.on_style_changed)
+        self.max_size_spin.valueChanged.connect(self.on_style_changed)
         self.color_btn.clicked.connect(self.select_color)
         
         for spin in self.margin_spins.values():
@@ -258,31 +418,19 @@ class StyleTab(QWidget):
         self.preview_card.prev_btn.clicked.connect(self.on_prev_clicked)
         self.preview_card.next_btn.clicked.connect(self.on_next_clicked)
         
-        # 加载系统字体
-        self.load_system_fonts()
+        # 字体列表在主窗口首次绘制后才加载（load_system_fonts），先只放入默认字体
+        self.font_combo.addItem(self.style_config['font_family'])
+        self.fallback_combo.addItem("（无）")
         
         # 初始化字体设置
         self.on_style_changed()
         
     def load_system_fonts(self):
-        """加载系统字体和自定义字体"""
-        # 清除之前加载的自定义字体
-        for font_id in self.custom_font_ids:
-            QFontDatabase.removeApplicationFont(font_id)
-        self.custom_font_ids.clear()
-        
-        # 加载自定义字体
-        custom_fonts = []
-        if os.path.exists(self.fonts_dir):
-            for file in os.listdir(self.fonts_dir):
-                if file.lower().endswith(('.ttf', '.otf')):
-                    font_path = os.path.join(self.fonts_dir, file)
-                    font_id = QFontDatabase.addApplicationFont(font_path)
-                    if font_id != -1:
-                        self.custom_font_ids.add(font_id)
-                        font_families = QFontDatabase.applicationFontFamilies(font_id)
-                        custom_fonts.extend(font_families)
-                        logger.info(f"已加载自定义字体: {font_families}")
+        """加载系统字体和自定义字体（自定义字体来自字体索引，只重新解析有变化的字体文件）"""
+        self.font_manager.scan()
+        self.font_manager.unregister_stale()
+        custom_fonts = self.font_manager.families()
+        logger.info(f"自定义字体: {len(custom_fonts)} 个字体族")
         
         # 获取系统字体
         system_fonts = QFontDatabase.families()
@@ -302,13 +450,36 @@ class StyleTab(QWidget):
             default_font = self.style_config['font_family']
             if default_font in all_fonts:
                 self.font_combo.setCurrentText(default_font)
+        
+        # 更新备用字体下拉框（第一项表示不使用备用字体）
+        fallback_font = self.style_config['fallback_family']
+        self.fallback_combo.blockSignals(True)
+        self.fallback_combo.clear()
+        self.fallback_combo.addItem("（无）")
+        self.fallback_combo.addItems(all_fonts)
+        if fallback_font in all_fonts:
+            self.fallback_combo.setCurrentText(fallback_font)
+        self.fallback_combo.blockSignals(False)
                 
     def on_style_changed(self):
         """处理样式改变"""
-        logger.info("样式发生改变")
+        logger.debug("样式发生改变")
+        # 自定义字体在第一次选中时注册
+        self.font_manager.register_family(self.font_combo.currentText())
+        fallback_font = self.fallback_combo.currentText() if self.fallback_combo.currentIndex() > 0 else ''
+        if fallback_font:
+            self.font_manager.register_family(fallback_font)
         self.style_config['font_family'] = self.font_combo.currentText()
+        self.style_config['fallback_family'] = fallback_font
         self.style_config['font_size'] = self.size_spin.value()
-        self.update_preview()
+        auto_fit = self.auto_fit_check.isChecked()
+        self.style_config['auto_fit'] = auto_fit
+        self.style_config['min_font_size'] = min(self.min_size_spin.value(), self.max_size_spin.value())
+        self.style_config['max_font_size'] = self.max_size_spin.value()
+        self.size_spin.setEnabled(not auto_fit)
+        self.min_size_spin.setEnabled(auto_fit)
+        self.max_size_spin.setEnabled(auto_fit)
+        self.schedule_preview()
         self.style_changed.emit()
         
     def on_margin_changed(self):
@@ -319,10 +490,10 @@ class StyleTab(QWidget):
             'left': self.margin_spins['left'].value(),
             'right': self.margin_spins['right'].value()
         }
-        logger.info(f"边距改变: {margins}")
+        logger.debug(f"边距改变: {margins}")
         for pos, value in margins.items():
             self.style_config[f'margin_{pos}'] = value
-        self.update_preview()
+        self.schedule_preview()
         self.style_changed.emit()
         
     def select_color(self):
@@ -340,7 +511,7 @@ class StyleTab(QWidget):
                 f"background-color: {color.name()};"
                 f"color: {'white' if color.lightness() < 128 else 'black'};"
             )
-            self.update_preview()
+            self.schedule_preview()
             self.style_changed.emit()
             
     def center_text(self):
@@ -359,24 +530,33 @@ class StyleTab(QWidget):
                 self.margin_spins[pos].setValue(default_margin)
         
         # 更新预览
-        self.update_preview()
+        self.schedule_preview()
         self.style_changed.emit()
         self.monitor.info_occurred.emit("文本已居中")
         logger.info("完成居中操作")
         
     def on_prev_clicked(self):
         """处理上一个按钮点击"""
-        logger.info('点击了"上一个"按钮')
+        logger.debug('点击了"上一个"按钮')
         if self.data_manager.get_texts():
             self.data_manager.prev_text()
-            self.update_preview()
+            self.schedule_preview()
         
     def on_next_clicked(self):
         """处理下一个按钮点击"""
-        logger.info('点击了"下一个"按钮')
+        logger.debug('点击了"下一个"按钮')
         if self.data_manager.get_texts():
             self.data_manager.next_text()
-            self.update_preview()
+            self.schedule_preview()
+
+    def schedule_preview(self):
+        """
+        请求刷新预览
+
+        一个刷新周期内的多次请求合并为一次渲染，渲染时读取最新的样式和文本
+        """
+        if not self._preview_timer.isActive():
+            self._preview_timer.start()
 
     def update_preview(self):
         """更新预览"""
@@ -390,109 +570,38 @@ class StyleTab(QWidget):
                 self.preview_card.view.setScene(self.preview_card.scene)
                 return
             
-            # 加载图片
-            pixmap = QPixmap(image_path)
-            if pixmap.isNull():
-                logger.error("无法加载图片")
-                return
-            
-            # 创建新场景
-            self.preview_card.scene.clear()
-            
-            # 调整视图大小以适应图片
+            # 帧缓存对应当前背景、视图尺寸和样式，任一改变都会失效
             view_size = self.preview_card.view.size()
-            scaled_pixmap = pixmap.scaled(
-                view_size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
+            self.prefetcher.set_state(image_path, view_size, self.style_config)
             
-            # 设置场景大小并添加图片
-            scene_rect = self.preview_card.scene.addPixmap(scaled_pixmap).boundingRect()
+            # 优先使用预渲染好的帧，否则立即渲染
+            current_index = self.data_manager._current_index
+            frame = self.prefetcher.frame(current_index, text)
+            if frame is None:
+                # 从缓存获取适应视图大小的背景（同一背景不会重复解码和缩放）
+                background = self.data_manager.background_cache.scaled_image(image_path, view_size)
+                if background is None:
+                    logger.error("无法加载图片")
+                    return
+                frame = render_preview_frame(background, text, self.style_config)
+                self.prefetcher.store(current_index, text, frame)
+            
+            # 创建新场景并添加预览帧
+            self.preview_card.scene.clear()
+            scene_rect = self.preview_card.scene.addPixmap(QPixmap.fromImage(frame)).boundingRect()
             self.preview_card.scene.setSceneRect(scene_rect)
             
-            # 创建字体
-            font = QFont(
-                self.style_config['font_family'],
-                self.style_config['font_size']
-            )
-            
-            # 计算可用区域
-            margin_left = self.style_config['margin_left']
-            margin_top = self.style_config['margin_top']
-            margin_right = self.style_config['margin_right']
-            margin_bottom = self.style_config['margin_bottom']
-            
-            available_width = scaled_pixmap.width() - margin_left - margin_right
-            available_height = scaled_pixmap.height() - margin_top - margin_bottom
-            
-            # 创建文本文档
-            doc = QTextDocument()
-            doc.setDefaultFont(font)
-            doc.setTextWidth(available_width)
-            doc.setPlainText(text)
-            
-            # 计算每行最大宽度
-            max_line_width = 0
-            for block in text.split('\n'):
-                # 创建临时文档来测量实际行宽
-                temp_doc = QTextDocument()
-                temp_doc.setDefaultFont(font)
-                temp_doc.setPlainText(block)
-                line_width = temp_doc.idealWidth()
-                max_line_width = max(max_line_width, line_width)
-            
-            # 计算文本位置（考虑整个图片尺寸）
-            if self.style_config['center_horizontally']:
-                # 添加额外的左侧偏移以补偿标点符号
-                punctuation_compensation = font.pointSize() * 0.2  # 根据字体大小调整补偿值
-                x = (scaled_pixmap.width() - max_line_width) / 2 + punctuation_compensation
-            else:
-                x = margin_left
-            
-            if self.style_config['center_vertically']:
-                y = (scaled_pixmap.height() - doc.size().height()) / 2
-            else:
-                y = margin_top
-            
-            # 确保文本不会超出边距
-            x = max(margin_left, min(x, scaled_pixmap.width() - margin_right - max_line_width))
-            y = max(margin_top, min(y, scaled_pixmap.height() - margin_bottom - doc.size().height()))
-            
-            # 添加主文本
-            text_item = self.preview_card.scene.addText(text, font)
-            text_item.setDefaultTextColor(self.style_config['text_color'])
-            text_item.setTextWidth(available_width)
-            text_item.setPos(x, y)
-            text_item.setZValue(1)
-            
-            # 设置行间距
-            doc = text_item.document()
-            block_format = QTextBlockFormat()
-            
-            # 设置行间距
-            line_height = float(self.style_config['line_spacing'])
-            block_format.setLineHeight(line_height, 0)  # 0 表示使用固定行高
-            
-            # 应用格式到所有文本块
-            cursor = QTextCursor(doc)
-            cursor.select(QTextCursor.Document)
-            cursor.mergeBlockFormat(block_format)
-            
-            # 强制文档重新布局
-            doc.setDefaultTextOption(text_item.document().defaultTextOption())
-            doc.documentLayout().documentSizeChanged.emit(doc.size())
-            
             # 更新视图
             self.preview_card.view.fitInView(
                 self.preview_card.scene.sceneRect(),
                 Qt.KeepAspectRatio
             )
             
-            # 更新导航按钮状态
+            # 在后台预渲染相邻的文本
             texts = self.data_manager.get_texts()
-            current_index = self.data_manager._current_index
+            self.prefetcher.prefetch(current_index, texts)
             
+            # 更新导航按钮状态
             if texts:
                 self.preview_card.prev_btn.setEnabled(current_index > 0)
                 self.preview_card.next_btn.setEnabled(current_index < len(texts) - 1)
@@ -502,6 +611,7 @@ class StyleTab(QWidget):
                 self.preview_card.next_btn.setEnabled(False)
                 logger.debug("无文本，禁用导航按钮")
             
+            self.preview_timings.emit(get_preview_timer().summary())
             logger.debug("预览更新成功")
             
         except Exception as e:
@@ -512,27 +622,22 @@ class StyleTab(QWidget):
         """处理窗口大小改变事件"""
         super().resizeEvent(event)
         # 更新预览以适应新大小
-        self.update_preview() 
+        self.schedule_preview() 
 
     def on_current_index_changed(self, index, total):
         """处理当前文本索引改变事件"""
-        self.update_preview()
+        self.schedule_preview()
         # 更新导航按钮状态
         self.preview_card.prev_btn.setEnabled(index > 0)
         self.preview_card.next_btn.setEnabled(index < total - 1) 
 
     def export_all(self):
-        """批量导出所有图片"""
+        """批量导出所有图片（在后台线程中执行，不阻塞界面）"""
         try:
-            # 创建输出目录
-            output_dir = os.path.join(os.getcwd(), "outputs")
-            os.makedirs(output_dir, exist_ok=True)
+            if self._export_worker is not None:
+                QMessageBox.information(self, "提示", "正在导出，请等待当前导出完成")
+                return
             
-            # 为本次导出创建新的时间戳子文件夹
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_dir = os.path.join(output_dir, f"export_{timestamp}")
-            os.makedirs(export_dir, exist_ok=True)
-
             # 获取所有文本
             texts = self.data_manager.get_texts()
             if not texts:
@@ -545,151 +650,148 @@ class StyleTab(QWidget):
                 QMessageBox.warning(self, "警告", "请先选择背景图片")
                 return
 
-            # 创建进度对话框
-            progress = QProgressDialog("正在导出图片...", "取消", 0, len(texts), self)
-            progress.setWindowModality(Qt.WindowModal)
-            
-            # 保存当前索引
-            current_index = self.data_manager._current_index
-            
-            # 加载原始背景图片以获取其尺寸
-            original_bg = QPixmap(image_path)
-            if original_bg.isNull():
+            # 只读取图片尺寸，解码在后台线程中进行
+            bg_size = QImageReader(image_path).size()
+            if not bg_size.isValid() or bg_size.height() == 0:
                 raise Exception("无法加载背景图片")
-            
-            # 使用原始图片的尺寸，并应用缩放因子
-            scale_factor = 2  # 2倍分辨率，确保清晰度
-            width = original_bg.width() * scale_factor
-            height = original_bg.height() * scale_factor
+
+            incremental = self.incremental_check.isChecked()
+            if incremental:
+                # 增量导出始终写入同一个目录
+                export_dir = self.incremental_dir
+                os.makedirs(export_dir, exist_ok=True)
+            else:
+                # 创建输出目录，并为本次导出创建新的时间戳子文件夹
+                output_dir = os.path.join(os.getcwd(), "outputs")
+                os.makedirs(output_dir, exist_ok=True)
+                export_dir = create_export_dir(output_dir)
             
             # 计算字体大小缩放比例
-            preview_scale = self.preview_card.view.size().height() / original_bg.height()
-            font_scale = 1 / preview_scale  # 反向计算实际需要的字体大小
+            font_scale = self.export_font_scale(bg_size)
+
+            # 创建后台导出任务（复制当前样式，导出期间可以继续编辑）
+            worker = ExportWorker(
+                texts,
+                export_dir,
+                image_path,
+                self.style_config,
+                font_scale=font_scale,
+                fonts_dir=self.fonts_dir,
+                workers=self.workers_spin.value(),
+                encode_options=self.encode_options()
+            )
+            self.start_export(worker)
             
-            for i, text in enumerate(texts):
-                if progress.wasCanceled():
-                    break
-                    
-                # 更新进度
-                progress.setValue(i)
-                
-                try:
-                    # 创建高分辨率图像
-                    image = QImage(width, height, QImage.Format_ARGB32)
-                    image.fill(Qt.white)
-                    
-                    # 创建画笔
-                    painter = QPainter()
-                    if not painter.begin(image):
-                        raise Exception("无法创建画笔")
-                        
-                    painter.setRenderHints(
-                        QPainter.Antialiasing |
-                        QPainter.TextAntialiasing |
-                        QPainter.SmoothPixmapTransform
-                    )
-                    
-                    # 缩放以适应高分辨率
-                    painter.scale(scale_factor, scale_factor)
-                    
-                    # 绘制背景图片（使用原始尺寸）
-                    scaled_bg = original_bg.scaled(
-                        original_bg.width(),
-                        original_bg.height(),
-                        Qt.KeepAspectRatio,
-                        Qt.SmoothTransformation
-                    )
-                    painter.drawPixmap(0, 0, scaled_bg)
-                    
-                    # 创建文本文档
-                    doc = QTextDocument()
-                    
-                    # 根据预览比例调整字体大小
-                    font = QFont(self.style_config['font_family'])
-                    adjusted_size = int(self.style_config['font_size'] * font_scale)
-                    font.setPointSize(adjusted_size)
-                    doc.setDefaultFont(font)
-                    
-                    # 设置文本宽度（使用原始图片尺寸计算）
-                    available_width = original_bg.width() - 2 * self.style_config['margin_left']
-                    doc.setTextWidth(available_width)
-                    
-                    # 设置文本
-                    doc.setPlainText(str(text))
-                    
-                    # 应用文本颜色
-                    cursor = QTextCursor(doc)
-                    cursor.select(QTextCursor.Document)
-                    format = QTextCharFormat()
-                    format.setForeground(self.style_config['text_color'])
-                    cursor.mergeCharFormat(format)
-                    
-                    # 应用行间距
-                    block_format = QTextBlockFormat()
-                    spacing = float(self.style_config['line_spacing'])
-                    block_format.setLineHeight(int(spacing * 100), 1)  # 使用百分比行高
-                    cursor.mergeBlockFormat(block_format)
-                    
-                    # 计算每行最大宽度
-                    max_line_width = 0
-                    line_count = 0
-                    for block in doc.toPlainText().split('\n'):
-                        # 创建临时文档来测量实际行宽
-                        temp_doc = QTextDocument()
-                        temp_doc.setDefaultFont(font)
-                        temp_doc.setPlainText(block)
-                        line_width = temp_doc.idealWidth()
-                        max_line_width = max(max_line_width, line_width)
-                        line_count += 1
-                    
-                    # 使用最大行宽来计算居中位置
-                    if self.style_config['center_horizontally']:
-                        # 添加较小的左侧偏移以补偿标点符号
-                        punctuation_compensation = font.pointSize() * 0.1  # 减小补偿值
-                        x = (original_bg.width() - max_line_width) / 2 + punctuation_compensation
-                    else:
-                        x = self.style_config['margin_left']
-                    
-                    # 优化垂直居中计算
-                    text_height = doc.size().height()
-                    line_height = text_height / line_count if line_count > 0 else text_height
-                    
-                    if self.style_config['center_vertically']:
-                        # 考虑行数和行高来计算垂直居中位置
-                        total_spacing = (line_count - 1) * line_height * (spacing - 1)
-                        y = (original_bg.height() - text_height - total_spacing) / 2
-                    else:
-                        y = self.style_config['margin_top']
-                    
-                    # 绘制文本
-                    painter.save()
-                    painter.translate(x, y)
-                    doc.drawContents(painter)
-                    painter.restore()
-                    
-                    # 确保正确结束绘制
-                    painter.end()
-                    
-                    # 保存图片
-                    output_path = os.path.join(export_dir, f"导出图片_{i+1}.jpg")
-                    success = image.save(output_path, "JPEG", quality=85)
-                    
-                    if not success:
-                        raise Exception(f"保存图片 {i+1} 失败")
-                    
-                except Exception as e:
-                    logger.error(f"导出图片 {i+1} 失败: {str(e)}")
-                    continue
+        except Exception as e:
+            logger.error(f"导出失败: {str(e)}")
+            QMessageBox.critical(self, "错误", f"导出失败: {str(e)}") 
+
+    def export_font_scale(self, bg_size):
+        """导出时的字体缩放比例：背景高度 / 预览高度"""
+        preview_scale = self.preview_card.view.size().height() / bg_size.height()
+        return 1 / preview_scale  # 反向计算实际需要的字体大小
+
+    def encode_options(self):
+        """当前选择的导出编码设置"""
+        return EncodeOptions(
+            self.format_combo.currentText(),
+            self.quality_spin.value(),
+            self.optimize_check.isChecked(),
+            width=self.output_width_spin.value(),
+            height=self.output_height_spin.value(),
+            dpi=self.dpi_spin.value()
+        )
+
+    def on_format_changed(self, fmt):
+        """切换导出格式（PNG 为无损格式，质量只影响压缩级别）"""
+        self.quality_spin.setToolTip(
+            "PNG 为无损压缩，质量越低压缩级别越高" if fmt == 'PNG' else "压缩质量，越高文件越大"
+        )
+
+    def resume_export(self):
+        """继续之前中断的导出（使用导出目录中保存的文本和样式）"""
+        try:
+            if self._export_worker is not None:
+                QMessageBox.information(self, "提示", "正在导出，请等待当前导出完成")
+                return
             
-            # 恢复之前的索引
-            self.data_manager._current_index = current_index
+            output_dir = os.path.join(os.getcwd(), "outputs")
+            export_dir = QFileDialog.getExistingDirectory(self, "选择要继续的导出目录", output_dir)
+            if not export_dir:
+                return
             
-            progress.setValue(len(texts))
-            QMessageBox.information(self, "完成", f"图片已导出到:\n{export_dir}")
+            job, texts = load_export_job(export_dir)
+            if job.completed:
+                QMessageBox.information(self, "提示", "该目录中的导出已经全部完成")
+                return
+            if not os.path.exists(job.background_path):
+                raise FileNotFoundError(f"找不到背景图片文件: {job.background_path}")
+            
+            worker = ExportWorker(
+                texts,
+                export_dir,
+                job.background_path,
+                job.style_config,
+                font_scale=job.font_scale,
+                fonts_dir=job.fonts_dir,
+                workers=self.workers_spin.value(),
+                encode_options=EncodeOptions.from_dict(job.encode_options)
+            )
+            self.start_export(worker)
             
         except Exception as e:
-            logger.error(f"导出失败: {str(e)}")
-            QMessageBox.critical(self, "错误", f"导出失败: {str(e)}") 
+            logger.error(f"继续导出失败: {str(e)}")
+            QMessageBox.critical(self, "错误", f"继续导出失败: {str(e)}")
+
+    def start_export(self, worker):
+        """连接导出任务的信号并在线程池中启动"""
+        worker.signals.progress.connect(self.export_progress)
+        worker.signals.timings.connect(self.export_timings)
+        worker.signals.finished.connect(self.on_export_finished)
+        worker.signals.failed.connect(self.on_export_failed)
+        self._export_worker = worker
+        self.export_btn.setEnabled(False)
+        self.resume_btn.setEnabled(False)
+        
+        total = len(worker.texts)
+        logger.info(f"开始导出 {total} 张图片到: {worker.export_dir}")
+        self.export_started.emit(total)
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel_export(self):
+        """取消正在进行的导出"""
+        if self._export_worker is not None:
+            logger.info("请求取消导出")
+            self._export_worker.cancel()
+
+    def choose_incremental_dir(self):
+        """选择增量导出目录"""
+        directory = QFileDialog.getExistingDirectory(self, "选择增量导出目录", self.incremental_dir)
+        if directory:
+            self.incremental_dir = directory
+            self.incremental_check.setToolTip(f"只导出有变化的图片，输出目录：{directory}")
+            logger.info(f"增量导出目录：{directory}")
+
+    def on_export_finished(self, export_dir, exported, canceled):
+        """处理导出完成"""
+        skipped = self._export_worker.skipped if self._export_worker is not None else 0
+        self._export_worker = None
+        self.export_btn.setEnabled(True)
+        self.resume_btn.setEnabled(True)
+        self.export_finished.emit(export_dir, exported, canceled)
+        skipped_note = f"\n（{skipped} 张已存在且内容相同，已跳过）" if skipped else ""
+        if canceled:
+            QMessageBox.information(self, "已取消", f"导出已取消，已导出 {exported} 张图片到:\n{export_dir}{skipped_note}")
+        else:
+            QMessageBox.information(self, "完成", f"图片已导出到:\n{export_dir}{skipped_note}")
+
+    def on_export_failed(self, message):
+        """处理导出失败"""
+        self._export_worker = None
+        self.export_btn.setEnabled(True)
+        self.resume_btn.setEnabled(True)
+        self.export_finished.emit("", 0, True)
+        QMessageBox.critical(self, "错误", f"导出失败: {message}")
 
     def refresh_fonts(self):
         """刷新字体列表"""
@@ -697,6 +799,108 @@ class StyleTab(QWidget):
         self.load_system_fonts()
         self.monitor.info_occurred.emit("字体列表已刷新")
         
+    def check_layout(self):
+        """在后台检查所有文本的排版（与导出使用相同的字号和位置计算）"""
+        if self._layout_worker is not None:
+            return
+        texts = self.data_manager.get_texts()
+        if not texts:
+            QMessageBox.warning(self, "警告", "没有可检查的内容")
+            return
+        image_path = self.data_manager.get_image()
+        if not image_path:
+            QMessageBox.warning(self, "警告", "请先选择背景图片")
+            return
+        bg_size = QImageReader(image_path).size()
+        if not bg_size.isValid() or bg_size.height() == 0:
+            QMessageBox.critical(self, "错误", "无法读取背景图片尺寸")
+            return
+        
+        worker = LayoutCheckWorker(texts, image_path, self.style_config,
+                                   font_scale=self.export_font_scale(bg_size), fonts_dir=self.fonts_dir,
+                                   workers=default_worker_count())
+        progress = QProgressDialog("正在检查排版…", "取消", 0, len(texts), self)
+        progress.setWindowTitle("排版检查")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.cancel)
+        worker.signals.progress.connect(lambda done, total: progress.setValue(done))
+        worker.signals.finished.connect(self.on_layout_checked)
+        worker.signals.failed.connect(self.on_layout_check_failed)
+        self._layout_worker = worker
+        self._layout_progress = progress
+        self.layout_check_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+        
+    def _finish_layout_check(self):
+        """排版检查结束后恢复界面"""
+        self._layout_worker = None
+        if self._layout_progress is not None:
+            self._layout_progress.reset()
+            self._layout_progress = None
+        self.layout_check_btn.setEnabled(True)
+        
+    def on_layout_checked(self, report):
+        """显示排版检查结果"""
+        self._finish_layout_check()
+        if not report.issues:
+            QMessageBox.information(self, "排版检查", report.summary())
+            return
+        from .layout_report_dialog import LayoutReportDialog
+        dialog = LayoutReportDialog(report, self)
+        dialog.issue_activated.connect(self.data_manager.set_current_index)
+        dialog.show()
+        
+    def on_layout_check_failed(self, message):
+        """处理排版检查失败"""
+        self._finish_layout_check()
+        QMessageBox.critical(self, "错误", f"排版检查失败: {message}")
+        
+    def check_coverage(self):
+        """在后台检查所有文本中当前字体缺少的字符"""
+        if self._coverage_worker is not None:
+            return
+        texts = self.data_manager.get_texts()
+        if not texts:
+            QMessageBox.warning(self, "警告", "没有可检查的内容")
+            return
+        
+        worker = CoverageCheckWorker(texts, self.style_config['font_family'],
+                                     self.style_config['fallback_family'], fonts_dir=self.fonts_dir)
+        progress = QProgressDialog("正在检查缺字…", "取消", 0, len(texts), self)
+        progress.setWindowTitle("缺字检查")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(worker.cancel)
+        worker.signals.progress.connect(lambda done, total: progress.setValue(done))
+        worker.signals.finished.connect(self.on_coverage_checked)
+        worker.signals.failed.connect(self.on_coverage_check_failed)
+        self._coverage_worker = worker
+        self._coverage_progress = progress
+        self.coverage_btn.setEnabled(False)
+        QThreadPool.globalInstance().start(worker)
+        
+    def _finish_coverage_check(self):
+        """缺字检查结束后恢复界面"""
+        self._coverage_worker = None
+        if self._coverage_progress is not None:
+            self._coverage_progress.reset()
+            self._coverage_progress = None
+        self.coverage_btn.setEnabled(True)
+        
+    def on_coverage_checked(self, report):
+        """显示缺字检查结果"""
+        self._finish_coverage_check()
+        if report.unresolved or (report.missing and not report.fallback_family):
+            QMessageBox.warning(self, "缺字检查", report.summary())
+        else:
+            QMessageBox.information(self, "缺字检查", report.summary())
+        
+    def on_coverage_check_failed(self, message):
+        """处理缺字检查失败"""
+        self._finish_coverage_check()
+        QMessageBox.critical(self, "错误", f"缺字检查失败: {message}")
+        
     def upload_font(self):
         """上传字体文件"""
         logger.info("打开字体文件选择对话框")
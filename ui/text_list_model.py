@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+文本列表模型模块
+"""
+
+import logging
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+logger = logging.getLogger(__name__)
+
+class TextListModel(QAbstractListModel):
+    """文本列表模型：直接读取数据管理器中的文本，视图只为可见行取数据"""
+
+    MAX_DISPLAY_LENGTH = 200  # 列表中每行最多显示的字符数
+
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        # 模型自己记录行数，保证行数变化始终在 begin/end 通知之间发生
+        self._row_count = len(self.data_manager.get_texts())
+
+        self.data_manager.texts_changed.connect(self.on_texts_changed)
+        self.data_manager.texts_appended.connect(self.on_texts_appended)
+
+    def rowCount(self, parent=QModelIndex()):
+        """行数"""
+        if parent.isValid():
+            return 0
+        return self._row_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        """返回指定行的数据"""
+        if not index.isValid() or not 0 <= index.row() < self._row_count:
+            return None
+
+        row = index.row()
+        if role == Qt.DisplayRole:
+            text = str(self.data_manager.get_texts()[row])
+            # 列表中单行显示，换行用空格代替
+            text = " ".join(text.split("\n"))
+            if len(text) > self.MAX_DISPLAY_LENGTH:
+                text = text[:self.MAX_DISPLAY_LENGTH] + "…"
+            return f"{row + 1}. {text}"
+        if role == Qt.ToolTipRole:
+            return str(self.data_manager.get_texts()[row])
+        return None
+
+    def on_texts_changed(self, texts):
+        """文本列表被替换时重置模型"""
+        self.beginResetModel()
+        self._row_count = len(texts)
+        self.endResetModel()
+        logger.debug(f"文本列表模型重置，共 {self._row_count} 行")
+
+    def on_texts_appended(self, start, count):
+        """文本追加时只通知新增的行"""
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + count - 1)
+        self._row_count += count
+        self.endInsertRows()